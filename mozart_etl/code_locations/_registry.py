@@ -0,0 +1,154 @@
+"""Compiled per-tenant registry: tenant.yaml, dbt selection and manifest slice in one file.
+
+``scripts/sync_tenants.py --registry`` writes one JSON file per tenant next to the
+dbt manifest (``target/registry/{tenant_id}.json``). A code location loads it
+instead of parsing tenant.yaml, scanning the models directory and parsing the
+full multi-tenant manifest. The registry records the size, mtime and sha256 of
+tenant.yaml and manifest.json; when either changed it is stale and the caller
+falls back to the source files.
+
+Env vars (``${VAR:default}``) are stored unresolved and resolved at load time,
+so no secrets or environment-specific values end up in the artifact. tenant.yaml
+is kept as text and parsed on load, so YAML-only values (dates) read the same as
+from the source file.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_VERSION = 2
+REGISTRY_DIRNAME = "registry"
+
+
+def registry_path(manifest_path: Path, tenant_id: str) -> Path:
+    return manifest_path.parent / REGISTRY_DIRNAME / f"{tenant_id}.json"
+
+
+def scan_tenant_models(models_dir: Path) -> list[str]:
+    """Sorted dbt model names found under a tenant's models directory."""
+    if not models_dir.exists():
+        return []
+    return sorted(
+        sql_file.stem for sql_file in models_dir.rglob("*.sql") if not sql_file.stem.startswith("_")
+    )
+
+
+def slice_manifest(manifest: dict, model_names: list[str]) -> dict:
+    """Reduce a dbt manifest to the given models, their sources and their tests.
+
+    Keeps the structure ``@dbt_assets`` needs for selection and asset specs;
+    macros and docs are dropped.
+    """
+    names = set(model_names)
+    parent_map = manifest["parent_map"]
+    keep = {
+        unique_id
+        for unique_id, node in manifest["nodes"].items()
+        if node["resource_type"] == "model" and node["name"] in names
+    }
+    keep |= {parent for unique_id in keep for parent in parent_map.get(unique_id, [])}
+    keep |= {
+        unique_id
+        for unique_id, node in manifest["nodes"].items()
+        if node["resource_type"] == "test"
+        and parent_map.get(unique_id)
+        and set(parent_map[unique_id]) <= keep
+    }
+
+    def _filter_map(graph: dict) -> dict:
+        return {
+            unique_id: [other for other in others if other in keep]
+            for unique_id, others in graph.items()
+            if unique_id in keep
+        }
+
+    sliced = {key: {} for key in manifest if isinstance(manifest[key], dict)}
+    sliced.update(
+        metadata=manifest["metadata"],
+        nodes={k: v for k, v in manifest["nodes"].items() if k in keep},
+        sources={k: v for k, v in manifest["sources"].items() if k in keep},
+        groups=manifest.get("groups", {}),
+        parent_map=_filter_map(parent_map),
+        child_map=_filter_map(manifest["child_map"]),
+    )
+    return sliced
+
+
+def _fingerprint(path: Path) -> dict:
+    stat = path.stat()
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+
+def _is_current(path: Path, recorded: dict) -> bool:
+    """Unchanged size and mtime are trusted; otherwise compare content hashes."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return False
+    if stat.st_size == recorded["size"] and stat.st_mtime_ns == recorded["mtime_ns"]:
+        return True
+    return _fingerprint(path)["sha256"] == recorded["sha256"]
+
+
+def compile_tenant_registry(tenant_config_path: Path, manifest_path: Path) -> Path:
+    """Write the registry of one tenant and return its path."""
+    config_yaml = tenant_config_path.read_text(encoding="utf-8")
+    dbt_select = scan_tenant_models(tenant_config_path.parent / "models")
+    manifest = slice_manifest(json.loads(manifest_path.read_text()), dbt_select)
+
+    registry = {
+        "version": REGISTRY_VERSION,
+        "sources": {
+            "tenant_config": _fingerprint(tenant_config_path),
+            "manifest": _fingerprint(manifest_path),
+        },
+        "config_yaml": config_yaml,
+        "dbt_select": dbt_select,
+        "manifest": manifest,
+    }
+    path = registry_path(manifest_path, tenant_config_path.parent.name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(registry), encoding="utf-8")
+    tmp_path.replace(path)
+    return path
+
+
+def load_tenant_registry(tenant_config_path: Path, manifest_path: Path) -> dict | None:
+    """Load a tenant's registry, or None when it is missing or stale.
+
+    The returned dict has the parsed tenant.yaml under ``config``.
+    """
+    path = registry_path(manifest_path, tenant_config_path.parent.name)
+    if not path.exists():
+        logger.info("[registry] No compiled registry at %s", path)
+        return None
+    try:
+        registry = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning("[registry] Unreadable registry %s: %s", path, e)
+        return None
+    if registry.get("version") != REGISTRY_VERSION:
+        logger.info("[registry] Registry %s has an old format version", path)
+        return None
+    sources = registry["sources"]
+    if not (
+        _is_current(tenant_config_path, sources["tenant_config"])
+        and _is_current(manifest_path, sources["manifest"])
+    ):
+        logger.warning(
+            "[registry] Stale registry %s (tenant.yaml or manifest changed), "
+            "run `make dbt-parse` to recompile",
+            path,
+        )
+        return None
+    registry["config"] = yaml.safe_load(registry.pop("config_yaml"))
+    return registry
@@ -5,10 +5,13 @@ import os
 import re
 import shutil
 import sys
+from functools import cache
 from pathlib import Path
 
 import yaml
 
+from mozart_etl.lib.governor import ConcurrencyGovernorResource, parse_pool_limits
+from mozart_etl.lib.iceberg import IcebergCatalogResource
 from mozart_etl.lib.storage.minio import S3Resource
 from mozart_etl.lib.trino import TrinoResource
 
@@ -30,6 +33,9 @@ def get_shared_resources() -> dict:
         region=os.getenv("AWS_REGION", "us-east-1"),
         bucket=os.getenv("S3_BUCKET_NAME", "warehouse"),
         verify_ssl=os.getenv("S3_VERIFY_SSL", "true").lower() == "true",
+        spill_dir=os.getenv("MOZART_SPILL_DIR", ""),
+        multipart_part_size_mb=int(os.getenv("S3_MULTIPART_PART_SIZE_MB", "16")),
+        upload_concurrency=int(os.getenv("S3_UPLOAD_CONCURRENCY", "4")),
     )
 
     trino = TrinoResource(
@@ -39,12 +45,38 @@ def get_shared_resources() -> dict:
         schema_name=os.getenv("TRINO_SCHEMA", "default"),
         user=os.getenv("TRINO_USER", "trino"),
         http_scheme=os.getenv("TRINO_HTTP_SCHEME", "http"),
+        pool_size=int(os.getenv("TRINO_POOL_SIZE", "4")),
+        max_concurrent_queries=int(os.getenv("TRINO_MAX_CONCURRENT_QUERIES", "4")),
+        slow_query_seconds=float(os.getenv("TRINO_SLOW_QUERY_SECONDS", "60")),
+        slow_query_log=os.getenv("TRINO_SLOW_QUERY_LOG", ""),
+    )
+
+    # Only used by tenants with iceberg.load_engine: pyiceberg
+    iceberg = IcebergCatalogResource(
+        catalog_type=os.getenv("ICEBERG_CATALOG_TYPE", "rest"),
+        uri=os.getenv("ICEBERG_REST_URI", "http://localhost:8181"),
+        warehouse=os.getenv("ICEBERG_WAREHOUSE", ""),
+        s3_endpoint=os.getenv("S3_ENDPOINT_URL", ""),
+        s3_access_key=os.getenv("AWS_ACCESS_KEY_ID", ""),
+        s3_secret_key=os.getenv("AWS_SECRET_ACCESS_KEY", ""),
+        s3_region=os.getenv("AWS_REGION", "us-east-1"),
+    )
+
+    # Cross-tenant slot pools per Trino cluster / source host (shared SQLite lock table)
+    governor = ConcurrencyGovernorResource(
+        enabled=os.getenv("GOVERNOR_ENABLED", "true").lower() == "true",
+        db_path=os.getenv("GOVERNOR_DB_PATH", ""),
+        trino_limit=int(os.getenv("GOVERNOR_TRINO_LIMIT", "4")),
+        source_limit=int(os.getenv("GOVERNOR_SOURCE_LIMIT", "4")),
+        pool_limits=parse_pool_limits(os.getenv("GOVERNOR_POOL_LIMITS", "")),
     )
 
     return {
         "s3": s3,
         "minio": s3,
         "trino": trino,
+        "iceberg": iceberg,
+        "governor": governor,
     }
 
 
@@ -85,7 +117,15 @@ def load_tenant_config(config_path: Path) -> tuple[dict, list[dict]]:
     logger.info("[shared] Loading tenant config: %s", config_path)
     with open(config_path) as f:
         raw = yaml.safe_load(f)
+    return resolve_tenant_config(raw)
 
+
+def resolve_tenant_config(raw: dict) -> tuple[dict, list[dict]]:
+    """Resolve env vars in a parsed tenant.yaml (or a compiled registry's copy of it).
+
+    Returns:
+        (tenant_dict, tables_list)
+    """
     tenant = _resolve_config(raw["tenant"])
     tables = raw.get("tables", [])
     table_names = [t["name"] for t in tables]
@@ -96,6 +136,40 @@ def load_tenant_config(config_path: Path) -> tuple[dict, list[dict]]:
     return tenant, tables
 
 
+def tenant_dbt_vars(tenant: dict, tables: list[dict]) -> dict:
+    """``--vars`` a tenant's dbt project is parsed and built with.
+
+    Only tenant.yaml settings go here: the vars are part of dbt's partial
+    parse state, so anything that changes per run (the consumed raw
+    watermarks) is passed through the environment instead.
+    """
+    dbt_vars = {"tenant_id": tenant["id"], **tenant.get("params", {})}
+    # Raw table layouts, exposed to models through the raw_table_properties macro
+    table_layouts = {
+        table["name"]: {
+            "partitioning": table.get("partitioning") or [],
+            "sorted_by": table.get("sorted_by") or [],
+        }
+        for table in tables
+        if table.get("partitioning") or table.get("sorted_by")
+    }
+    if table_layouts:
+        dbt_vars["table_layouts"] = table_layouts
+    # Incremental raw tables, driving the raw_incremental_config / filter macros
+    raw_tables = {
+        table["name"]: {
+            "primary_key": table.get("primary_key") or [],
+            "incremental_column": table["incremental_column"],
+        }
+        for table in tables
+        if table.get("mode") == "incremental" and table.get("incremental_column")
+    }
+    if raw_tables:
+        dbt_vars["raw_tables"] = raw_tables
+    return dbt_vars
+
+
+@cache
 def find_dbt_executable() -> str:
     """Find the dbt executable, checking the venv Scripts dir on Windows.
 
@@ -1,25 +1,71 @@
 """Factory to build per-tenant Dagster Definitions from tenant-specific YAML."""
 
+import asyncio
+import contextlib
+import datetime
+import itertools
 import json
 import logging
+import os
+from collections.abc import Callable, Iterator
 from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import dagster as dg
-import pyarrow as pa
 from dagster import Output
 from dagster_dbt import DagsterDbtTranslatorSettings, DbtCliResource, DbtProject, dbt_assets
 
+from mozart_etl.code_locations._registry import (
+    load_tenant_registry,
+    scan_tenant_models,
+    slice_manifest,
+)
 from mozart_etl.code_locations._shared import (
     find_dbt_executable,
     get_shared_resources,
     load_tenant_config,
+    resolve_tenant_config,
+    tenant_dbt_vars,
+)
+from mozart_etl.lib.dbt.translator import (
+    DEFAULT_BATCH_TIMEOUT,
+    TransformDagsterDbtTranslator,
+    batched_on_cron,
+)
+from mozart_etl.lib.fingerprint import (
+    fingerprint_metadata,
+    format_fingerprint,
+    last_fingerprint,
+    resolve_fingerprint_config,
+)
+from mozart_etl.lib.governor import ConcurrencyGovernorResource, source_pool, trino_pool
+from mozart_etl.lib.iceberg import (
+    DEFAULT_COMMIT_ROWS,
+    IcebergCatalogResource,
+    trino_table_properties,
 )
-from mozart_etl.lib.dbt.translator import TransformDagsterDbtTranslator
-from mozart_etl.lib.extract.connectors import create_connector
+from mozart_etl.lib.maintenance import maintain_table, resolve_maintenance_config
+from mozart_etl.lib.memory import MemoryMonitor, plan_memory
+from mozart_etl.lib.schedule import DEFAULT_CRON, resolve_tenant_cron
 from mozart_etl.lib.storage.minio import S3Resource
-from mozart_etl.lib.trino import TrinoResource
-from mozart_etl.utils.environment_helpers import get_dbt_target
+from mozart_etl.lib.storage.parquet import iceberg_table_properties, resolve_parquet_layout
+from mozart_etl.lib.telemetry import StageTracer, span
+from mozart_etl.lib.trino import QueryStatsCollector, TrinoResource, collect_query_stats
+from mozart_etl.lib.watermark import (
+    CONSUMED_WATERMARKS_METADATA_KEY,
+    RAW_WATERMARKS_ENV,
+    WatermarkStore,
+    WatermarkTracker,
+    is_full_refresh,
+)
+from mozart_etl.utils.environment_helpers import get_dbt_project_mode, get_dbt_target
+from mozart_etl.utils.units import parse_duration, parse_size
+
+# Data-plane libraries (pyarrow, DB drivers) are imported inside asset bodies,
+# so loading definitions does not pay for them
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
@@ -27,13 +73,22 @@ TRANSFORM_DBT_DIR = Path(__file__).joinpath(
     "..", "..", "..", "mozart_etl_dbt_transform"
 ).resolve()
 
-CODE_LOCATIONS_DIR = Path(__file__).parent
+# Generated per-tenant dbt projects (DBT_PROJECT_MODE=per_tenant)
+TENANT_DBT_PROJECTS_DIR = TRANSFORM_DBT_DIR / "tenants"
 
 PREVIEW_MAX_ROWS = 5
 
+# hive_bridge: S3 Parquet + Trino Hive external table; pyiceberg: direct catalog commit
+LOAD_ENGINES = ("hive_bridge", "pyiceberg")
+
+# batched: one dbt build per schedule tick (batched_on_cron); eager: per upstream update
+DBT_AUTOMATION_MODES = ("batched", "eager")
+
 
 def _pyarrow_to_trino_type(pa_type) -> str:
     """Map a PyArrow type to a Trino SQL type string."""
+    import pyarrow as pa
+
     if pa.types.is_boolean(pa_type):
         return "BOOLEAN"
     if pa.types.is_int8(pa_type) or pa.types.is_int16(pa_type):
@@ -66,36 +121,226 @@ def _build_column_defs(arrow_schema) -> str:
     return ",\n".join(cols)
 
 
-def _build_arrow_preview(arrow_table: pa.Table) -> dict:
+def _sql_literal(value) -> str:
+    """Render a Python value as a Trino SQL literal."""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+@contextlib.contextmanager
+def _environ(values: dict[str, str]) -> Iterator[None]:
+    """Set environment variables for the duration of the block (e.g. for a dbt subprocess)."""
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _extract_data_version(fingerprint: str | None, watermark: str | None) -> dg.DataVersion | None:
+    """The source fingerprint if one was taken, else the incremental watermark.
+
+    Without either, Dagster assigns a new data version to every materialization.
+    """
+    if fingerprint:
+        return dg.DataVersion(fingerprint)
+    return WatermarkStore.to_data_version(watermark)
+
+
+def _soft_delete_predicate(soft_delete: dict | None, alias: str) -> str | None:
+    """NULL-safe SQL condition that is true for soft-deleted source rows."""
+    if not soft_delete:
+        return None
+    column = soft_delete["column"]
+    value = _sql_literal(soft_delete.get("value", True))
+    return f'COALESCE({alias}."{column}" = {value}, FALSE)'
+
+
+def _build_merge_sql(
+    target: str,
+    source: str,
+    columns: list[str],
+    primary_key: list[str],
+    soft_delete: dict | None = None,
+) -> str:
+    """Build a Trino MERGE that upserts ``source`` into ``target`` by primary key.
+
+    With ``soft_delete`` ({column, value}) matched rows flagged as deleted are
+    removed from the target and new deleted rows are not inserted.
+    """
+    on_clause = " AND ".join(f't."{col}" = s."{col}"' for col in primary_key)
+    update_cols = [col for col in columns if col not in primary_key]
+    insert_cols = ", ".join(f'"{col}"' for col in columns)
+    insert_vals = ", ".join(f's."{col}"' for col in columns)
+    deleted = _soft_delete_predicate(soft_delete, "s")
+
+    clauses = []
+    if deleted:
+        clauses.append(f"WHEN MATCHED AND {deleted} THEN DELETE")
+    if update_cols:
+        set_clause = ", ".join(f'"{col}" = s."{col}"' for col in update_cols)
+        clauses.append(f"WHEN MATCHED THEN UPDATE SET {set_clause}")
+    not_matched = f"WHEN NOT MATCHED AND NOT {deleted}" if deleted else "WHEN NOT MATCHED"
+    clauses.append(f"{not_matched} THEN INSERT ({insert_cols}) VALUES ({insert_vals})")
+
+    return (
+        f"MERGE INTO {target} t\n"
+        f"USING {source} s\n"
+        f"ON ({on_clause})\n" + "\n".join(clauses)
+    )
+
+
+def _load_via_hive_bridge(
+    context: dg.AssetExecutionContext,
+    trino: TrinoResource,
+    tenant_id: str,
+    raw_schema: str,
+    table_name: str,
+    s3_path: str,
+    arrow_schema: "pa.Schema",
+    load_mode: str,
+    primary_key: list[str],
+    soft_delete: dict | None,
+    table_properties: str = "format = 'PARQUET'",
+):
+    """Load staged S3 Parquet into the raw Iceberg table through Trino.
+
+    Iceberg doesn't support external_location, so we:
+      a) Create a temporary Hive external table pointing to S3 Parquet
+      b) CTAS, INSERT INTO or MERGE into Iceberg from the Hive table
+      c) Drop the temporary Hive table
+    """
+    s3_dir = s3_path.replace("s3://", "s3a://").rsplit("/", 1)[0] + "/"
+    col_defs = _build_column_defs(arrow_schema)
+
+    hive_schema = f"hive.{raw_schema}"
+    hive_bridge = f"hive.{raw_schema}.__bridge_{table_name}"
+    full_table = f"iceberg.{raw_schema}.{table_name}"
+
+    # All steps run as one script on a single pooled Trino session
+    # a) Hive external table → read S3 Parquet
+    context.log.info("[%s]   3a) Creating Hive bridge: %s → %s", tenant_id, hive_bridge, s3_dir)
+    statements = [
+        f"CREATE SCHEMA IF NOT EXISTS {hive_schema}",
+        f"DROP TABLE IF EXISTS {hive_bridge}",
+        f"""
+        CREATE TABLE {hive_bridge} (
+{col_defs}
+        ) WITH (
+            external_location = '{s3_dir}',
+            format = 'PARQUET'
+        )
+    """,
+    ]
+
+    # b) Iceberg table from Hive bridge
+    statements.append(f"CREATE SCHEMA IF NOT EXISTS iceberg.{raw_schema}")
+
+    if load_mode == "replace":
+        context.log.info("[%s]   3b) Full replace → %s", tenant_id, full_table)
+        statements.append(f"DROP TABLE IF EXISTS {full_table}")
+        statements.append(f"""
+            CREATE TABLE {full_table}
+            WITH ({table_properties})
+            AS SELECT * FROM {hive_bridge}
+        """)
+    else:
+        context.log.info("[%s]   3b) Incremental %s → %s", tenant_id, load_mode, full_table)
+        # First run: create table; subsequent: apply the delta only
+        statements.append(f"""
+            CREATE TABLE IF NOT EXISTS {full_table}
+            WITH ({table_properties})
+            AS SELECT * FROM {hive_bridge} WHERE 1=0
+        """)
+        if load_mode == "merge":
+            # Upsert the delta by primary key; only data files holding
+            # changed keys are rewritten
+            statements.append(_build_merge_sql(
+                target=full_table,
+                source=hive_bridge,
+                columns=arrow_schema.names,
+                primary_key=primary_key,
+                soft_delete=soft_delete,
+            ))
+        else:
+            if load_mode == "reload":
+                # No watermark yet (first run or full refresh): replace contents
+                statements.append(f"DELETE FROM {full_table}")
+            deleted = _soft_delete_predicate(soft_delete, "s")
+            where = f" WHERE NOT {deleted}" if deleted else ""
+            statements.append(
+                f"INSERT INTO {full_table} SELECT * FROM {hive_bridge} s{where}"
+            )
+
+    # c) Cleanup temporary Hive bridge table
+    statements.append(f"DROP TABLE IF EXISTS {hive_bridge}")
+    trino.execute_script(statements)
+    context.log.info("[%s]   3c) Hive bridge cleaned up", tenant_id)
+
+
+def _build_arrow_preview(arrow_table: "pa.Table") -> dict:
     """Build column schema + sample rows metadata from a PyArrow Table."""
     columns = [
         dg.TableColumn(name=field.name, type=str(field.type))
         for field in arrow_table.schema
     ]
     sample = arrow_table.slice(0, min(PREVIEW_MAX_ROWS, arrow_table.num_rows))
-    df = sample.to_pandas()
+    rows = list(zip(*(column.to_pylist() for column in sample.columns)))
     return {
         "dagster/column_schema": dg.TableSchema(columns=columns),
-        "preview": dg.MetadataValue.md(df.to_markdown(index=False)),
+        **_preview_markdown(arrow_table.column_names, rows),
     }
 
 
-def _build_trino_preview(trino: TrinoResource, relation_name: str) -> dict:
-    """Query Trino for sample rows and return markdown preview metadata."""
-    try:
-        columns, rows = trino.query_preview(relation_name, limit=PREVIEW_MAX_ROWS)
-        if not rows:
-            return {}
-        header = "| " + " | ".join(columns) + " |"
-        separator = "| " + " | ".join(["---"] * len(columns)) + " |"
-        body = "\n".join(
-            "| " + " | ".join(str(v) for v in row) + " |"
-            for row in rows
-        )
-        return {"preview": dg.MetadataValue.md(f"{header}\n{separator}\n{body}")}
-    except Exception as e:
-        logger.warning("Failed to build Trino preview for %s: %s", relation_name, e)
+def _markdown_cell(value) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def _preview_markdown(columns: list[str], rows: list) -> dict:
+    """Render sample rows (Arrow or Trino) as markdown preview metadata."""
+    if not rows:
+        return {}
+    header = "| " + " | ".join(columns) + " |"
+    separator = "| " + " | ".join(["---"] * len(columns)) + " |"
+    body = "\n".join(
+        "| " + " | ".join(_markdown_cell(v) for v in row) + " |"
+        for row in rows
+    )
+    return {"preview": dg.MetadataValue.md(f"{header}\n{separator}\n{body}")}
+
+
+def _build_trino_previews(trino: TrinoResource, relation_names: list[str]) -> dict[str, dict]:
+    """Preview several relations concurrently, keyed by relation name.
+
+    Each relation's metadata includes the preview query's Trino stats.
+    """
+    if not relation_names:
         return {}
+    stats: dict[str, list[dict]] = {}
+    results = asyncio.run(
+        trino.query_previews(relation_names, limit=PREVIEW_MAX_ROWS, stats=stats)
+    )
+    previews = {}
+    for relation_name, result in results.items():
+        collector = QueryStatsCollector()
+        for query in stats.get(relation_name, []):
+            collector.add(query)
+        if isinstance(result, BaseException):
+            logger.warning("Failed to build Trino preview for %s: %s", relation_name, result)
+            previews[relation_name] = collector.metadata()
+        else:
+            previews[relation_name] = {**_preview_markdown(*result), **collector.metadata()}
+    return previews
 
 
 @cache
@@ -115,19 +360,63 @@ def _get_transform_dbt_project() -> DbtProject:
     return project
 
 
-def _get_tenant_dbt_select(tenant_id: str) -> str:
-    """Build dbt select string by scanning tenant's models directory.
+@cache
+def _get_tenant_dbt_project(tenant_id: str) -> DbtProject:
+    """The dbt project a tenant parses and builds with.
 
-    Returns space-separated model names for @dbt_assets(select=...).
+    In ``per_tenant`` mode this is the tenant's generated project under
+    ``tenants/{tenant_id}`` (see ``scripts/sync_tenants.py``), whose manifest
+    and partial parse state cover only that tenant's models.
     """
-    models_dir = CODE_LOCATIONS_DIR / tenant_id / "models"
-    if not models_dir.exists():
-        return ""
-    model_names = []
-    for sql_file in models_dir.rglob("*.sql"):
-        if not sql_file.stem.startswith("_"):
-            model_names.append(sql_file.stem)
-    return " ".join(sorted(model_names))
+    if get_dbt_project_mode() != "per_tenant":
+        return _get_transform_dbt_project()
+    return DbtProject(
+        project_dir=TENANT_DBT_PROJECTS_DIR / tenant_id,
+        target=get_dbt_target(),
+        profiles_dir=TRANSFORM_DBT_DIR,
+    )
+
+
+def _read_manifest(manifest_path: Path) -> dict:
+    return json.loads(manifest_path.read_text())
+
+
+def _load_tenant_inputs(
+    tenant_config_path: Path, read_manifest: Callable[[Path], dict] = _read_manifest
+) -> tuple[dict, list[dict], list[str], dict | None]:
+    """Tenant config, dbt model names and the tenant's manifest slice.
+
+    Read from the compiled registry (``scripts/sync_tenants.py --registry``)
+    when it is current; otherwise from tenant.yaml, the models directory and
+    the full manifest (parsed with ``read_manifest``).
+    """
+    manifest_path = _get_tenant_dbt_project(tenant_config_path.parent.name).manifest_path
+    registry = load_tenant_registry(tenant_config_path, manifest_path)
+    if registry is not None:
+        tenant, tables = resolve_tenant_config(registry["config"])
+        logger.info("[%s] Loaded compiled registry", tenant["id"])
+        return tenant, tables, registry["dbt_select"], registry["manifest"]
+
+    tenant, tables = load_tenant_config(tenant_config_path)
+    model_names = scan_tenant_models(tenant_config_path.parent / "models")
+    manifest = None
+    if model_names and manifest_path.exists():
+        manifest = slice_manifest(read_manifest(manifest_path), model_names)
+    return tenant, tables, model_names, manifest
+
+
+def _get_resources(dbt_project: DbtProject) -> dict:
+    """Shared resources plus the dbt CLI resource for ``dbt_project``."""
+    resources = get_shared_resources()
+    # DbtCliResource with explicit dbt executable path (Docker wrapper script)
+    dbt_path = find_dbt_executable()
+    logger.info("[shared] Using dbt executable: %s", dbt_path)
+    resources["dbt"] = DbtCliResource(
+        project_dir=dbt_project.project_dir,
+        profiles_dir=dbt_project.profiles_dir,
+        dbt_executable=dbt_path,
+    )
+    return resources
 
 
 def create_tenant_defs(tenant_config_path: Path) -> dg.Definitions:
@@ -136,31 +425,77 @@ def create_tenant_defs(tenant_config_path: Path) -> dg.Definitions:
     Each tenant has its own tenant.yaml containing both connection info
     and table definitions. This ensures zero cross-tenant coupling.
     """
-    tenant, tables = load_tenant_config(tenant_config_path)
+    tenant_id = tenant_config_path.parent.name
+    return dg.Definitions(
+        **_create_tenant_parts(tenant_config_path),
+        resources=_get_resources(_get_tenant_dbt_project(tenant_id)),
+    )
+
+
+def create_multi_tenant_defs(tenant_config_paths: list[Path]) -> dg.Definitions:
+    """Build one Definitions holding every tenant (consolidated code location).
+
+    Tenants stay isolated by asset key prefix, group and job names, while the
+    process shares one resource set and parses the dbt manifest at most once
+    (only for tenants without a current compiled registry). Requires the
+    shared dbt project mode.
+    """
+    if get_dbt_project_mode() != "shared":
+        raise ValueError("The consolidated code location requires DBT_PROJECT_MODE=shared")
+    read_manifest = cache(_read_manifest)
+    parts: dict[str, list] = {"assets": [], "jobs": [], "schedules": [], "sensors": []}
+    for tenant_config_path in tenant_config_paths:
+        for key, defs in _create_tenant_parts(tenant_config_path, read_manifest).items():
+            parts[key].extend(defs)
+    read_manifest.cache_clear()
+    logger.info(
+        "[shared] Consolidated definitions ready: %d tenants, %d assets",
+        len(tenant_config_paths), len(parts["assets"]),
+    )
+    return dg.Definitions(**parts, resources=_get_resources(_get_transform_dbt_project()))
+
+
+def _create_tenant_parts(
+    tenant_config_path: Path, read_manifest: Callable[[Path], dict] = _read_manifest
+) -> dict[str, list]:
+    """A tenant's assets, jobs and schedules (everything but resources)."""
+    tenant, tables, model_names, manifest = _load_tenant_inputs(
+        tenant_config_path, read_manifest
+    )
     tenant_id = tenant["id"]
     logger.info("[%s] Loading tenant definitions from %s", tenant_id, tenant_config_path)
 
+    # Staggered / SLA-planned start (config/schedule_plan.yaml, else tenant id hash)
+    cron = resolve_tenant_cron(tenant)
+    if cron != tenant.get("schedule", DEFAULT_CRON):
+        logger.info(
+            "[%s] Schedule %s planned as %s", tenant_id, tenant.get("schedule", DEFAULT_CRON), cron
+        )
+    tenant = {**tenant, "schedule": cron}
+
     assets: list = []
     for table in tables:
         assets.append(_create_extract_asset(tenant, table))
     logger.info("[%s] Registered %d extract assets", tenant_id, len(assets))
 
-    dbt_transform = _create_dbt_transform_assets(tenant, tables)
+    sensors = []
+    dbt_transform = _create_dbt_transform_assets(tenant, tables, model_names, manifest)
     if dbt_transform is not None:
         assets.append(dbt_transform)
         logger.info("[%s] Registered dbt transform assets", tenant_id)
+        if _get_dbt_automation(tenant, tables) is not None:
+            # batched_on_cron is not serializable, so it is evaluated in the code server
+            sensors.append(
+                dg.AutomationConditionSensorDefinition(
+                    name=f"{tenant_id}_dbt_automation",
+                    target=dg.AssetSelection.assets(dbt_transform),
+                    use_user_code_server=True,
+                    default_status=dg.DefaultSensorStatus.RUNNING,
+                )
+            )
     else:
         logger.info("[%s] No dbt models found, skipping transform assets", tenant_id)
 
-    resources = get_shared_resources()
-    # DbtCliResource with explicit dbt executable path (Docker wrapper script)
-    dbt_path = find_dbt_executable()
-    logger.info("[%s] Using dbt executable: %s", tenant_id, dbt_path)
-    resources["dbt"] = DbtCliResource(
-        project_dir=TRANSFORM_DBT_DIR,
-        dbt_executable=dbt_path,
-    )
-
     job = dg.define_asset_job(
         name=f"{tenant_id}_pipeline",
         selection=dg.AssetSelection.groups(tenant_id),
@@ -170,24 +505,35 @@ def create_tenant_defs(tenant_config_path: Path) -> dg.Definitions:
     schedule = dg.ScheduleDefinition(
         name=f"{tenant_id}_schedule",
         job=job,
-        cron_schedule=tenant.get("schedule", "0 */2 * * *"),
+        cron_schedule=tenant.get("schedule", DEFAULT_CRON),
     )
+    jobs = [job]
+    schedules = [schedule]
+
+    maintenance = _create_maintenance_defs(tenant, tables, model_names, manifest)
+    if maintenance is not None:
+        maintenance_asset, maintenance_job, maintenance_schedule = maintenance
+        assets.append(maintenance_asset)
+        jobs.append(maintenance_job)
+        schedules.append(maintenance_schedule)
+        logger.info(
+            "[%s] Registered Iceberg maintenance (schedule=%s)",
+            tenant_id, maintenance_schedule.cron_schedule,
+        )
 
     logger.info(
         "[%s] Definitions ready: %d assets, schedule=%s",
-        tenant_id, len(assets), tenant.get("schedule", "0 */2 * * *"),
-    )
-    return dg.Definitions(
-        assets=assets,
-        jobs=[job],
-        schedules=[schedule],
-        resources=resources,
+        tenant_id, len(assets), tenant.get("schedule", DEFAULT_CRON),
     )
+    return {"assets": assets, "jobs": jobs, "schedules": schedules, "sensors": sensors}
 
 
 def _create_extract_asset(tenant: dict, table: dict) -> dg.AssetsDefinition:
-    """Create an asset that extracts data from source DB to S3 Parquet
-    and loads it into a raw Iceberg table.
+    """Create an asset that extracts data from the source DB into a raw Iceberg table.
+
+    The load goes through S3 Parquet and a Trino Hive bridge table by default,
+    or commits Arrow batches directly via PyIceberg when the tenant sets
+    ``iceberg.load_engine: pyiceberg``.
     """
     tenant_id = tenant["id"]
     table_name = table["name"]
@@ -195,6 +541,34 @@ def _create_extract_asset(tenant: dict, table: dict) -> dg.AssetsDefinition:
     storage_config = tenant["storage"]
     iceberg_schema = tenant.get("iceberg", {}).get("schema", tenant_id)
     raw_schema = f"{iceberg_schema}_raw"
+    incremental_column = table.get("incremental_column")
+    is_incremental = table.get("mode") == "incremental" and bool(incremental_column)
+    load_strategy = table.get("load", "append")
+    primary_key = table.get("primary_key") or []
+    soft_delete = table.get("soft_delete")
+    if load_strategy not in ("append", "merge"):
+        raise ValueError(
+            f"[{tenant_id}] {table_name}: unsupported load '{load_strategy}' (append | merge)"
+        )
+    if load_strategy == "merge" and not primary_key:
+        raise ValueError(f"[{tenant_id}] {table_name}: load 'merge' requires primary_key")
+    parquet_layout = resolve_parquet_layout(
+        table.get("parquet"), primary_key, table.get("tenant_filter")
+    )
+    # Partition spec / sort order of the raw Iceberg table (applied on creation)
+    partitioning = table.get("partitioning") or []
+    sorted_by = table.get("sorted_by") or []
+    table_properties = trino_table_properties(partitioning, sorted_by)
+    load_engine = tenant.get("iceberg", {}).get("load_engine", "hive_bridge")
+    if load_engine not in LOAD_ENGINES:
+        raise ValueError(
+            f"[{tenant_id}] unsupported iceberg.load_engine '{load_engine}' "
+            f"({' | '.join(LOAD_ENGINES)})"
+        )
+    # Buffer budget of one extract; the table's setting overrides the tenant's
+    memory_budget = table.get("memory_budget", tenant.get("memory_budget"))
+    memory_budget = parse_size(memory_budget) if memory_budget is not None else None
+    fingerprint_methods, fingerprint_column = resolve_fingerprint_config(table)
 
     @dg.asset(
         key=dg.AssetKey([tenant_id, "input", table_name]),
@@ -206,191 +580,516 @@ def _create_extract_asset(tenant: dict, table: dict) -> dg.AssetsDefinition:
             "pipeline": "input",
         },
         automation_condition=dg.AutomationCondition.on_cron(
-            tenant.get("schedule", "0 */2 * * *")
+            tenant.get("schedule", DEFAULT_CRON)
         ),
     )
-    def _extract(context: dg.AssetExecutionContext, s3: S3Resource, trino: TrinoResource):
-        context.log.info(
-            "[%s] Step 1/3: Extracting '%s' from %s://%s:%s/%s",
-            tenant_id, table_name, source_config["type"],
-            source_config["host"], source_config["port"], source_config["database"],
+    def _extract(
+        context: dg.AssetExecutionContext,
+        s3: S3Resource,
+        trino: TrinoResource,
+        iceberg: IcebergCatalogResource,
+        governor: ConcurrencyGovernorResource,
+    ):
+        tracer = StageTracer(
+            f"extract {tenant_id}.{table_name}",
+            {"tenant": tenant_id, "table": table_name, "run_id": context.run_id},
         )
+        labels = {"tenant": tenant_id, "asset": f"{tenant_id}.{table_name}"}
+        monitor = MemoryMonitor(memory_budget)
+        with (
+            tracer.activate(),
+            collect_query_stats(**labels) as query_stats,
+            monitor.watch(),
+        ):
+            context.log.info(
+                "[%s] Step 1/3: Extracting '%s' from %s://%s:%s/%s",
+                tenant_id, table_name, source_config["type"],
+                source_config["host"], source_config["port"], source_config["database"],
+            )
 
-        # 1) RDB → S3 Parquet
-        connector = create_connector(source_config)
-        try:
-            filters = None
-            tenant_filter_col = table.get("tenant_filter")
-            tenant_params = tenant.get("params", {})
-            if tenant_filter_col and tenant_filter_col in tenant_params:
-                filters = {tenant_filter_col: tenant_params[tenant_filter_col]}
+            # Incremental tables resume from the watermark of the last materialization
+            last_value = None
+            if is_incremental:
+                if is_full_refresh(context):
+                    context.log.info("[%s] Full refresh requested, ignoring watermark", tenant_id)
+                else:
+                    last_value = WatermarkStore(context.instance).get(tenant_id, table_name)
                 context.log.info(
-                    "[%s] Applying filter: %s = %s",
-                    tenant_id, tenant_filter_col, tenant_params[tenant_filter_col],
+                    "[%s] Incremental extract: %s > %s",
+                    tenant_id, incremental_column, last_value or "(none, full load)",
                 )
-
-            arrow_table = connector.extract_table(
-                schema=table["source_schema"],
-                table=table["source_table"],
-                columns=table.get("columns"),
-                incremental_column=table.get("incremental_column"),
-                filters=filters,
-            )
-            context.log.info(
-                "[%s] Extracted %d rows, %d columns from %s.%s",
-                tenant_id, arrow_table.num_rows, arrow_table.num_columns,
-                table["source_schema"], table["source_table"],
+            tracker = (
+                WatermarkTracker(incremental_column, start=last_value) if is_incremental else None
             )
 
-            context.log.info(
-                "[%s] Step 2/3: Writing Parquet to S3 (prefix=%s/%s)",
-                tenant_id, storage_config["prefix"], table_name,
-            )
-            s3_path = s3.write_parquet(
-                table=arrow_table,
-                prefix=storage_config["prefix"],
-                table_name=table_name,
-            )
-            context.log.info("[%s] Parquet written to %s", tenant_id, s3_path)
-        finally:
-            connector.close()
-
-        # 2) S3 Parquet → Iceberg raw table (via Hive bridge)
-        #    Iceberg doesn't support external_location, so we:
-        #    a) Create a temporary Hive external table pointing to S3 Parquet
-        #    b) CTAS or INSERT INTO Iceberg from the Hive table
-        #    c) Drop the temporary Hive table
-        context.log.info(
-            "[%s] Step 3/3: Loading into Iceberg via Hive bridge (mode=%s)",
-            tenant_id, table.get("mode", "full"),
-        )
-        s3_dir = s3_path.replace("s3://", "s3a://").rsplit("/", 1)[0] + "/"
-        col_defs = _build_column_defs(arrow_table.schema)
-
-        hive_schema = f"hive.{raw_schema}"
-        hive_bridge = f"hive.{raw_schema}.__bridge_{table_name}"
-        full_table = f"iceberg.{raw_schema}.{table_name}"
-
-        # 2a) Hive external table → read S3 Parquet
-        context.log.info("[%s]   2a) Creating Hive bridge: %s → %s", tenant_id, hive_bridge, s3_dir)
-        trino.execute_ddl(f"CREATE SCHEMA IF NOT EXISTS {hive_schema}")
-        trino.execute_ddl(f"DROP TABLE IF EXISTS {hive_bridge}")
-        trino.execute_ddl(f"""
-            CREATE TABLE {hive_bridge} (
-{col_defs}
-            ) WITH (
-                external_location = '{s3_dir}',
-                format = 'PARQUET'
-            )
-        """)
+            if not is_incremental:
+                load_mode = "replace"
+            elif last_value is None:
+                load_mode = "reload"
+            else:
+                load_mode = load_strategy
 
-        # 2b) Iceberg table from Hive bridge
-        trino.execute_ddl(f"CREATE SCHEMA IF NOT EXISTS iceberg.{raw_schema}")
-
-        if table.get("mode") == "incremental":
-            context.log.info("[%s]   2b) Incremental load → %s", tenant_id, full_table)
-            # First run: create table; subsequent: append
-            trino.execute_ddl(f"""
-                CREATE TABLE IF NOT EXISTS {full_table}
-                WITH (format = 'PARQUET')
-                AS SELECT * FROM {hive_bridge} WHERE 1=0
-            """)
-            trino.execute_ddl(f"DELETE FROM {full_table}")
-            trino.execute_ddl(f"INSERT INTO {full_table} SELECT * FROM {hive_bridge}")
-        else:
-            context.log.info("[%s]   2b) Full replace → %s", tenant_id, full_table)
-            trino.execute_ddl(f"DROP TABLE IF EXISTS {full_table}")
-            trino.execute_ddl(f"""
-                CREATE TABLE {full_table}
-                WITH (format = 'PARQUET')
-                AS SELECT * FROM {hive_bridge}
-            """)
-
-        # 2c) Cleanup temporary Hive bridge table
-        trino.execute_ddl(f"DROP TABLE IF EXISTS {hive_bridge}")
-        context.log.info("[%s]   2c) Hive bridge cleaned up", tenant_id)
+            full_table = f"iceberg.{raw_schema}.{table_name}"
+            load_meta: dict = {}
 
-        context.log.info(
-            "[%s] Done: %d rows → %s → %s",
-            tenant_id, arrow_table.num_rows, s3_path, full_table,
-        )
-        preview_meta = _build_arrow_preview(arrow_table)
-        return dg.MaterializeResult(
-            metadata={
-                "num_rows": dg.MetadataValue.int(arrow_table.num_rows),
-                "s3_path": dg.MetadataValue.text(s3_path),
-                "iceberg_table": dg.MetadataValue.text(full_table),
-                "tenant": dg.MetadataValue.text(tenant_id),
-                **preview_meta,
-            }
-        )
+            import pyarrow as pa
+
+            from mozart_etl.lib.extract.connectors import create_connector
+            from mozart_etl.lib.extract.connectors.base import DEFAULT_BATCH_SIZE
+
+            # 1) RDB → S3 Parquet (hive_bridge) or straight into Iceberg (pyiceberg)
+            # Parallel slices count against the source host's pool
+            holder = f"{context.run_id}:{tenant_id}.{table_name}"
+            parallelism = int(table.get("parallelism", 1))
+            batch_size = int(table.get("batch_size", DEFAULT_BATCH_SIZE))
+            source_slot = governor.slot(source_pool(source_config), holder, parallelism)
+            with source_slot as source_wait:
+                connector = create_connector(source_config)
+                try:
+                    filters = None
+                    tenant_filter_col = table.get("tenant_filter")
+                    tenant_params = tenant.get("params", {})
+                    if tenant_filter_col and tenant_filter_col in tenant_params:
+                        filters = {tenant_filter_col: tenant_params[tenant_filter_col]}
+                        context.log.info(
+                            "[%s] Applying filter: %s = %s",
+                            tenant_id, tenant_filter_col, tenant_params[tenant_filter_col],
+                        )
+
+                    # Change detection: skip extract and load when the source probe matches
+                    fingerprint = None
+                    if fingerprint_methods:
+                        values = connector.fingerprint(
+                            table["source_schema"], table["source_table"],
+                            fingerprint_methods, fingerprint_column, filters,
+                        )
+                        fingerprint = format_fingerprint(values) if values is not None else None
+                    if (
+                        fingerprint is not None
+                        and not is_full_refresh(context)
+                        and fingerprint == last_fingerprint(context.instance, context.asset_key)
+                    ):
+                        context.log.info(
+                            "[%s] Source unchanged (%s), skipping extract and load",
+                            tenant_id, fingerprint,
+                        )
+                        # Same data version as the last load, so dbt automation ignores it
+                        return dg.MaterializeResult(
+                            metadata={
+                                "num_rows": dg.MetadataValue.int(0),
+                                "load_mode": dg.MetadataValue.text("skipped"),
+                                "skip_reason": dg.MetadataValue.text("unchanged"),
+                                "tenant": dg.MetadataValue.text(tenant_id),
+                                **fingerprint_metadata(fingerprint),
+                                **WatermarkStore.to_metadata(last_value, last_value),
+                                **tracer.metadata(),
+                                **query_stats.metadata(),
+                                **monitor.metadata(),
+                            },
+                            data_version=dg.DataVersion(fingerprint),
+                        )
+
+                    batches = connector.iter_batches(
+                        schema=table["source_schema"],
+                        table=table["source_table"],
+                        columns=table.get("columns"),
+                        incremental_column=incremental_column,
+                        last_value=last_value,
+                        filters=filters,
+                        batch_size=batch_size,
+                        parallelism=parallelism,
+                        split_by=(
+                            table.get("split_by") or next(iter(table.get("primary_key", [])), None)
+                        ),
+                        split_method=table.get("split_method", "range"),
+                    )
+                    # The first batch fixes the schema and provides the preview rows;
+                    # the rest of the stream is written without being materialized.
+                    first_batch = next(batches)
+                    arrow_schema = first_batch.schema
+                    preview_table = pa.Table.from_batches([first_batch]).slice(0, PREVIEW_MAX_ROWS)
+                    num_rows = num_bytes = 0
+
+                    if last_value is not None and first_batch.num_rows == 0:
+                        context.log.info(
+                            "[%s] No rows changed since %s, skipping load", tenant_id, last_value
+                        )
+                        return dg.MaterializeResult(
+                            metadata={
+                                "num_rows": dg.MetadataValue.int(0),
+                                "load_mode": dg.MetadataValue.text("skipped"),
+                                "tenant": dg.MetadataValue.text(tenant_id),
+                                **WatermarkStore.to_metadata(last_value, last_value),
+                                **fingerprint_metadata(fingerprint),
+                                **tracer.metadata(),
+                                **query_stats.metadata(),
+                                **monitor.metadata(),
+                            },
+                            data_version=_extract_data_version(fingerprint, last_value),
+                        )
+
+                    # Size the write buffers from the first batch's bytes per row
+                    plan = plan_memory(
+                        budget=memory_budget,
+                        bytes_per_row=first_batch.nbytes / max(first_batch.num_rows, 1),
+                        batch_size=batch_size,
+                        parallelism=parallelism,
+                        native=connector.native_export,
+                        load_engine=load_engine,
+                        row_group_size=parquet_layout["row_group_size"],
+                        sorted_row_groups=bool(parquet_layout["sort_by"]),
+                        commit_rows=DEFAULT_COMMIT_ROWS,
+                        upload_buffer=s3.upload_buffer_bytes(),
+                    )
+                    if plan.mode == "chunked":
+                        context.log.info(
+                            "[%s] Projected %.0f MB exceeds memory_budget, chunked mode "
+                            "(row_group_size=%d, commit_rows=%d, spill=%s)",
+                            tenant_id, plan.projected / (1 << 20),
+                            plan.row_group_size, plan.commit_rows, plan.spill,
+                        )
+
+                    def _counted_batches():
+                        nonlocal num_rows, num_bytes
+                        for batch in itertools.chain([first_batch], batches):
+                            num_rows += batch.num_rows
+                            num_bytes += batch.nbytes
+                            if tracker is not None:
+                                tracker.observe(batch)
+                            yield batch
+
+                    if load_engine == "pyiceberg":
+                        context.log.info(
+                            "[%s] Step 2/3: Writing Arrow batches to Iceberg %s (load=%s)",
+                            tenant_id, full_table, load_mode,
+                        )
+                        commit = iceberg.write_batches(
+                            namespace=raw_schema,
+                            table_name=table_name,
+                            batches=_counted_batches(),
+                            schema=arrow_schema,
+                            mode=load_mode,
+                            primary_key=primary_key,
+                            soft_delete=soft_delete,
+                            commit_rows=plan.commit_rows,
+                            properties=iceberg_table_properties(parquet_layout),
+                            partitioning=partitioning,
+                            sorted_by=sorted_by,
+                        )
+                        if commit["snapshot_id"] is not None:
+                            load_meta["snapshot_id"] = dg.MetadataValue.text(
+                                str(commit["snapshot_id"])
+                            )
+                    else:
+                        context.log.info(
+                            "[%s] Step 2/3: Streaming Parquet to S3 (prefix=%s/%s)",
+                            tenant_id, storage_config["prefix"], table_name,
+                        )
+                        written = s3.write_parquet_batches(
+                            batches=_counted_batches(),
+                            schema=arrow_schema,
+                            prefix=storage_config["prefix"],
+                            table_name=table_name,
+                            layout={**parquet_layout, "row_group_size": plan.row_group_size},
+                            spill=plan.spill,
+                        )
+                        s3_path = written["s3_path"]
+                        load_meta.update({
+                            "s3_path": dg.MetadataValue.text(s3_path),
+                            "parquet_files": dg.MetadataValue.int(written["files"]),
+                            "parquet_bytes": dg.MetadataValue.int(written["bytes_written"]),
+                            "compression_ratio": dg.MetadataValue.float(
+                                written["compression_ratio"]
+                            ),
+                            "compression": dg.MetadataValue.text(parquet_layout["compression"]),
+                            "s3_upload_parts": dg.MetadataValue.int(written["parts"]),
+                            "s3_upload_bytes_per_second": dg.MetadataValue.float(
+                                written["upload_bytes_per_second"]
+                            ),
+                        })
+                    context.log.info(
+                        "[%s] Extracted %d rows, %d columns from %s.%s",
+                        tenant_id, num_rows, len(arrow_schema),
+                        table["source_schema"], table["source_table"],
+                    )
+                finally:
+                    connector.close()
+
+            load_meta["source_queue_wait_seconds"] = dg.MetadataValue.float(source_wait)
+            if load_engine == "hive_bridge":
+                context.log.info(
+                    "[%s] Step 3/3: Loading into Iceberg via Hive bridge (mode=%s, load=%s)",
+                    tenant_id, table.get("mode", "full"), load_mode,
+                )
+                with governor.slot(trino_pool(trino.host, trino.port), holder) as trino_wait:
+                    _load_via_hive_bridge(
+                        context, trino, tenant_id, raw_schema, table_name, s3_path, arrow_schema,
+                        load_mode, primary_key, soft_delete, table_properties,
+                    )
+                load_meta["trino_queue_wait_seconds"] = dg.MetadataValue.float(trino_wait)
+            else:
+                context.log.info("[%s] Step 3/3: Committed directly, no Hive bridge", tenant_id)
+
+            context.log.info("[%s] Done: %d rows → %s", tenant_id, num_rows, full_table)
+            with span("preview"):
+                preview_meta = _build_arrow_preview(preview_table)
+            return dg.MaterializeResult(
+                metadata={
+                    "num_rows": dg.MetadataValue.int(num_rows),
+                    **load_meta,
+                    "iceberg_table": dg.MetadataValue.text(full_table),
+                    "load_mode": dg.MetadataValue.text(load_mode),
+                    "load_engine": dg.MetadataValue.text(load_engine),
+                    "tenant": dg.MetadataValue.text(tenant_id),
+                    **(
+                        WatermarkStore.to_metadata(tracker.watermark, last_value) if tracker else {}
+                    ),
+                    **fingerprint_metadata(fingerprint),
+                    **tracer.metadata(rows=num_rows, bytes=num_bytes),
+                    **query_stats.metadata(),
+                    **plan.metadata(),
+                    **monitor.metadata(),
+                    **preview_meta,
+                },
+                data_version=_extract_data_version(
+                    fingerprint, tracker.watermark if tracker else None
+                ),
+            )
 
     _extract.__name__ = f"input_{tenant_id}_{table_name}"
     _extract.__qualname__ = f"input_{tenant_id}_{table_name}"
     return _extract
 
 
+def _get_dbt_automation(tenant: dict, tables: list[dict]) -> dg.AutomationCondition | None:
+    """The tenant's dbt model automation condition (None keeps eager_on_data_change()).
+
+    ``automation.dbt: batched`` (default) waits for the schedule tick's
+    extracts to land, or ``automation.batch_timeout`` (default 30m) after the
+    tick, and then runs one build for every affected model.
+    """
+    automation = tenant.get("automation", {})
+    mode = automation.get("dbt", "batched")
+    if mode not in DBT_AUTOMATION_MODES:
+        raise ValueError(
+            f"[{tenant['id']}] unsupported automation.dbt '{mode}' "
+            f"({' | '.join(DBT_AUTOMATION_MODES)})"
+        )
+    if mode == "eager" or not tables:
+        return None
+    timeout = automation.get("batch_timeout")
+    return batched_on_cron(
+        [dg.AssetKey([tenant["id"], "input", table["name"]]) for table in tables],
+        tenant.get("schedule", DEFAULT_CRON),
+        timeout=(
+            datetime.timedelta(seconds=parse_duration(timeout))
+            if timeout
+            else DEFAULT_BATCH_TIMEOUT
+        ),
+    )
+
+
 def _create_dbt_transform_assets(
-    tenant: dict, tables: list[dict]
+    tenant: dict, tables: list[dict], model_names: list[str], manifest_data: dict | None
 ) -> dg.AssetsDefinition | None:
     """Create dbt staging + mart assets for a tenant.
 
-    Scans the tenant's models/ directory to discover dbt model files,
-    then uses @dbt_assets to register them with Dagster.
+    Registers the tenant's dbt models (``model_names``, from its models/
+    directory) with @dbt_assets over the tenant's manifest slice.
     """
     tenant_id = tenant["id"]
-    dbt_project = _get_transform_dbt_project()
+    dbt_project = _get_tenant_dbt_project(tenant_id)
 
-    select_str = _get_tenant_dbt_select(tenant_id)
+    select_str = " ".join(model_names)
     if not select_str:
         return None
+    if manifest_data is None:
+        raise FileNotFoundError(
+            f"dbt manifest not found at {dbt_project.manifest_path}, run `make dbt-parse`"
+        )
 
     translator = TransformDagsterDbtTranslator(
         tenant_id=tenant_id,
         settings=DagsterDbtTranslatorSettings(enable_code_references=False),
+        automation_condition=_get_dbt_automation(tenant, tables),
     )
 
-    manifest_data = json.loads(dbt_project.manifest_path.read_text())
+    dbt_vars = tenant_dbt_vars(tenant, tables)
+    raw_tables = dbt_vars.get("raw_tables", {})
 
     @dbt_assets(
-        manifest=dbt_project.manifest_path,
+        manifest=manifest_data,
+        # Unique op name so tenants can share a code location
+        name=f"dbt_transform_{tenant_id}",
         select=select_str,
         dagster_dbt_translator=translator,
         project=dbt_project,
     )
     def tenant_dbt_transform(
-        context: dg.AssetExecutionContext, dbt: DbtCliResource, trino: TrinoResource
+        context: dg.AssetExecutionContext,
+        dbt: DbtCliResource,
+        trino: TrinoResource,
+        governor: ConcurrencyGovernorResource,
     ):
-        dbt_vars = {"tenant_id": tenant_id, **tenant.get("params", {})}
+        # Incremental models read raw rows newer than what their last run
+        # consumed, and record the current extract watermarks for the next run
+        store = WatermarkStore(context.instance)
+        full_refresh = is_full_refresh(context)
+        current_watermarks = {
+            name: watermark
+            for name in raw_tables
+            if (watermark := store.get(tenant_id, name)) is not None
+        }
+        consumed_watermarks = {}
+        if raw_tables and not full_refresh:
+            consumed_watermarks = store.get_consumed(context.selected_asset_keys)
+
         context.log.info("[%s] dbt build starting (select=%s)", tenant_id, select_str)
         context.log.info("[%s] dbt vars: %s", tenant_id, json.dumps(dbt_vars))
-
-        invocation = dbt.cli(
-            ["build", "--vars", json.dumps(dbt_vars)],
-            context=context,
+        context.log.info(
+            "[%s] Raw watermarks consumed: %s", tenant_id, json.dumps(consumed_watermarks)
         )
+
+        args = ["build", "--vars", json.dumps(dbt_vars)]
+        if full_refresh:
+            context.log.info("[%s] Full refresh requested, rebuilding all models", tenant_id)
+            args.append("--full-refresh")
         model_count = 0
-        for event in invocation.stream().fetch_row_counts().fetch_column_metadata():
-            if isinstance(event, Output) and "unique_id" in event.metadata:
-                unique_id = event.metadata["unique_id"].text
-                model_count += 1
-                node = manifest_data["nodes"].get(unique_id)
-                if node:
-                    materialized = node["config"]["materialized"]
-                    relation_name = node.get("relation_name", "N/A")
-                    context.log.info(
-                        "[%s] Model %d completed: %s (%s) → %s",
-                        tenant_id, model_count, node["name"], materialized, relation_name,
-                    )
-                    if materialized != "view" and relation_name:
-                        sample_meta = _build_trino_preview(trino, relation_name)
-                        if sample_meta:
-                            event = event.with_metadata(
-                                {**event.metadata, **sample_meta}
-                            )
-            yield event
+        # Table model outputs wait for their previews, which all run
+        # concurrently once the build is done
+        pending: list[tuple[Output, str]] = []
+        holder = f"{context.run_id}:{tenant_id}.dbt"
+        with governor.slot(trino_pool(trino.host, trino.port), holder) as trino_wait:
+            # Kept out of --vars so every build matches the tenant's partial parse state
+            with _environ({RAW_WATERMARKS_ENV: json.dumps(consumed_watermarks)}):
+                invocation = dbt.cli(args, context=context)
+            consumed_meta = {
+                CONSUMED_WATERMARKS_METADATA_KEY: dg.MetadataValue.json(current_watermarks),
+                "trino_queue_wait_seconds": dg.MetadataValue.float(trino_wait),
+            }
+            for event in invocation.stream().fetch_row_counts().fetch_column_metadata():
+                if isinstance(event, Output) and "unique_id" in event.metadata:
+                    unique_id = event.metadata["unique_id"].text
+                    model_count += 1
+                    node = manifest_data["nodes"].get(unique_id)
+                    if node:
+                        materialized = node["config"]["materialized"]
+                        relation_name = node.get("relation_name", "N/A")
+                        context.log.info(
+                            "[%s] Model %d completed: %s (%s) → %s",
+                            tenant_id, model_count, node["name"], materialized, relation_name,
+                        )
+                        event = event.with_metadata({**event.metadata, **consumed_meta})
+                        if materialized != "view" and relation_name:
+                            pending.append((event, relation_name))
+                            continue
+                yield event
         context.log.info("[%s] dbt build finished: %d models processed", tenant_id, model_count)
 
+        with collect_query_stats(tenant=tenant_id, asset=f"{tenant_id}.dbt"):
+            previews = _build_trino_previews(trino, [relation for _, relation in pending])
+        for event, relation_name in pending:
+            sample_meta = previews.get(relation_name)
+            if sample_meta:
+                event = event.with_metadata({**event.metadata, **sample_meta})
+            yield event
+
     tenant_dbt_transform.__name__ = f"dbt_transform_{tenant_id}"
     tenant_dbt_transform.__qualname__ = f"dbt_transform_{tenant_id}"
     return tenant_dbt_transform
+
+
+def _get_tenant_dbt_relations(model_names: list[str], manifest: dict | None) -> list[str]:
+    """Relation names of the tenant's dbt models materialized as tables."""
+    select = set(model_names)
+    if not select or manifest is None:
+        return []
+    nodes = manifest["nodes"].values()
+    return sorted(
+        node["relation_name"]
+        for node in nodes
+        if node["resource_type"] == "model"
+        and node["name"] in select
+        and node["config"]["materialized"] != "view"
+        and node.get("relation_name")
+    )
+
+
+def _create_maintenance_defs(
+    tenant: dict, tables: list[dict], model_names: list[str], manifest: dict | None
+) -> tuple[dg.AssetsDefinition, dg.JobDefinition, dg.ScheduleDefinition] | None:
+    """Create the off-peak Iceberg maintenance asset, job and schedule for a tenant.
+
+    Covers the raw tables and the tenant's dbt table models. Each table is
+    compacted / expired only when its thresholds are crossed (see
+    :func:`maintain_table`). Set ``maintenance: {enabled: false}`` to opt out.
+    """
+    tenant_id = tenant["id"]
+    config = resolve_maintenance_config(tenant.get("maintenance"))
+    if not config["enabled"]:
+        return None
+
+    raw_schema = f"{tenant.get('iceberg', {}).get('schema', tenant_id)}_raw"
+    targets = [f"iceberg.{raw_schema}.{table['name']}" for table in tables]
+    targets += _get_tenant_dbt_relations(model_names, manifest)
+
+    @dg.asset(
+        key=dg.AssetKey([tenant_id, "maintenance", "iceberg"]),
+        group_name=f"{tenant_id}_maintenance",
+        tags={
+            "dagster/kind/trino": "",
+            "dagster/kind/iceberg": "",
+            "tenant": tenant_id,
+            "pipeline": "maintenance",
+        },
+    )
+    def _maintenance(context: dg.AssetExecutionContext, trino: TrinoResource):
+        context.log.info("[%s] Iceberg maintenance on %d table(s)", tenant_id, len(targets))
+        results = []
+        with collect_query_stats(tenant=tenant_id, asset=f"{tenant_id}.maintenance") as stats:
+            for target in targets:
+                try:
+                    results.append(maintain_table(trino, target, config))
+                except Exception as e:
+                    # Tables not created yet (first run) or transient failures
+                    context.log.warning(
+                        "[%s] Maintenance skipped for %s: %s", tenant_id, target, e
+                    )
+
+        header = "| table | actions | files | bytes | snapshots |\n| --- | --- | --- | --- | --- |"
+        rows = "\n".join(
+            f"| {r['table']} | {', '.join(r['actions']) or '-'} "
+            f"| {r['files_before']} → {r['files_after']} "
+            f"| {r['bytes_before']} → {r['bytes_after']} "
+            f"| {r['snapshots_before']} → {r['snapshots_after']} |"
+            for r in results
+        )
+        return dg.MaterializeResult(
+            metadata={
+                "tables_checked": dg.MetadataValue.int(len(results)),
+                "tables_maintained": dg.MetadataValue.int(sum(1 for r in results if r["actions"])),
+                "files_rewritten": dg.MetadataValue.int(sum(r["files_rewritten"] for r in results)),
+                "bytes_rewritten": dg.MetadataValue.int(sum(r["bytes_rewritten"] for r in results)),
+                "snapshots_expired": dg.MetadataValue.int(
+                    sum(r["snapshots_before"] - r["snapshots_after"] for r in results)
+                ),
+                "tenant": dg.MetadataValue.text(tenant_id),
+                "summary": dg.MetadataValue.md(f"{header}\n{rows}"),
+                **stats.metadata(),
+            }
+        )
+
+    _maintenance.__name__ = f"maintenance_{tenant_id}"
+    _maintenance.__qualname__ = f"maintenance_{tenant_id}"
+
+    job = dg.define_asset_job(
+        name=f"{tenant_id}_maintenance",
+        selection=dg.AssetSelection.assets(_maintenance),
+        tags={"tenant": tenant_id, "pipeline": "maintenance"},
+    )
+    schedule = dg.ScheduleDefinition(
+        name=f"{tenant_id}_maintenance_schedule",
+        job=job,
+        cron_schedule=config["schedule"],
+    )
+    return _maintenance, job, schedule
@@ -1,7 +1,7 @@
 {{ config(
-    materialized='table',
     schema=var('tenant_id', 'project_01'),
-    alias='mart_item_master'
+    alias='mart_item_master',
+    **raw_incremental_config('cfg_item_master', unique_key=['item_id'])
 ) }}
 
 -- 제품 표준 스키마: mart_item_master
@@ -14,3 +14,5 @@ SELECT
     create_datetime           AS created_at,
     update_datetime           AS updated_at
 FROM {{ ref('project_01__stg_cfg_item_master') }}
+WHERE 1 = 1
+    {{ this_incremental_filter('update_datetime', 'updated_at') }}
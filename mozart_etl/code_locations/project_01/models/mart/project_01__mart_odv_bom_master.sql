@@ -1,7 +1,8 @@
 {{ config(
-    materialized='table',
     schema=var('tenant_id', 'project_01'),
-    alias='mart_odv_bom_master'
+    alias='mart_odv_bom_master',
+    properties=raw_table_properties('cfg_bom_master'),
+    **raw_incremental_config('cfg_bom_master')
 ) }}
 
 /*
@@ -29,3 +30,5 @@ SELECT
     prop02,
     prop03
 FROM {{ ref('project_01__stg_cfg_to_odv_bom_master') }}
+WHERE 1 = 1
+    {{ this_incremental_filter('update_datetime') }}
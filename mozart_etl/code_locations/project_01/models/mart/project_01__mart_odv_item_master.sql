@@ -1,7 +1,8 @@
 {{ config(
-    materialized='table',
     schema=var('tenant_id', 'project_01'),
-    alias='mart_odv_item_master'
+    alias='mart_odv_item_master',
+    properties=raw_table_properties('cfg_item_master'),
+    **raw_incremental_config('cfg_item_master')
 ) }}
 
 /*
@@ -30,3 +31,5 @@ SELECT
     update_datetime,
     update_user_id
 FROM {{ ref('project_01__stg_cfg_to_odv_item_master') }}
+WHERE 1 = 1
+    {{ this_incremental_filter('update_datetime') }}
@@ -1,9 +1,104 @@
-from collections.abc import Mapping
+import datetime
+import functools
+import operator
+from collections.abc import Mapping, Sequence
 from typing import Any, Optional
 
 import dagster as dg
 from dagster_dbt import DagsterDbtTranslator
 
+from mozart_etl.utils.cron import latest_cron_tick
+
+DEFAULT_BATCH_TIMEOUT = datetime.timedelta(minutes=30)
+
+
+class CronTickElapsedCondition(dg.AutomationCondition):
+    """True once ``timeout`` has passed since the latest tick of ``cron_schedule``.
+
+    Not serializable, so assets using it need an automation sensor evaluated
+    in the code server (``use_user_code_server=True``).
+    """
+
+    def __init__(self, cron_schedule: str, cron_timezone: str, timeout: datetime.timedelta):
+        self.cron_schedule = cron_schedule
+        self.cron_timezone = cron_timezone
+        self.timeout = timeout
+
+    @property
+    def name(self) -> str:
+        return f"cron_tick_elapsed({self.cron_schedule}, {self.cron_timezone}, {self.timeout})"
+
+    @property
+    def description(self) -> str:
+        return f"{self.timeout} passed since the latest tick of {self.cron_schedule}"
+
+    @property
+    def requires_cursor(self) -> bool:
+        return False
+
+    def evaluate(self, context: dg.AutomationContext) -> dg.AutomationResult:
+        latest_tick = latest_cron_tick(
+            self.cron_schedule, context.evaluation_time.timestamp(), self.cron_timezone
+        )
+        elapsed = context.evaluation_time.timestamp() - latest_tick.timestamp()
+        if elapsed >= self.timeout.total_seconds():
+            return dg.AutomationResult(context=context, true_subset=context.candidate_subset)
+        return dg.AutomationResult(context=context, true_subset=context.get_empty_subset())
+
+
+def eager_on_data_change() -> dg.AutomationCondition:
+    """``eager()`` that ignores dependency updates which kept their data version.
+
+    Extract assets skipped as unchanged (see :mod:`mozart_etl.lib.fingerprint`)
+    record a materialization with the previous data version; any other
+    materialization gets a new one.
+    """
+    return dg.AutomationCondition.eager().replace(
+        "newly_updated_without_root",
+        (
+            dg.AutomationCondition.data_version_changed()
+            & ~dg.AutomationCondition.executed_with_root_target()
+        ).with_label("data_version_changed_without_root"),
+    ).with_label("eager_on_data_change")
+
+
+def batched_on_cron(
+    input_keys: Sequence[dg.AssetKey],
+    cron_schedule: str,
+    cron_timezone: str = "UTC",
+    timeout: datetime.timedelta = DEFAULT_BATCH_TIMEOUT,
+) -> dg.AutomationCondition:
+    """Materialize once per cron tick, after all of the tenant's inputs have landed.
+
+    ``input_keys`` are the tenant's extract assets. The condition stays false
+    until every one of them has updated since the latest tick, or until
+    ``timeout`` after the tick if at least one has (a failed or slow extract no
+    longer holds back the rest). Every model whose upstream updated then
+    becomes true in the same evaluation, so the dbt multi-asset is launched as
+    a single run instead of once per finished extract. An extract skipped as
+    unchanged counts as landed but does not make its models true.
+    """
+    tick = dg.AutomationCondition.cron_tick_passed(cron_schedule, cron_timezone)
+    landed = dg.AutomationCondition.newly_updated().since(tick)
+    all_landed = functools.reduce(
+        operator.and_, (dg.AutomationCondition.asset_matches(k, landed) for k in input_keys)
+    )
+    any_landed = functools.reduce(
+        operator.or_, (dg.AutomationCondition.asset_matches(k, landed) for k in input_keys)
+    )
+    timed_out = any_landed & CronTickElapsedCondition(cron_schedule, cron_timezone, timeout)
+    dep_changed = (
+        dg.AutomationCondition.data_version_changed()
+        | dg.AutomationCondition.will_be_requested()
+    ).since(tick)
+    return (
+        dg.AutomationCondition.in_latest_time_window()
+        & tick.since_last_handled()
+        & (all_landed | timed_out)
+        & dg.AutomationCondition.any_deps_match(dep_changed)
+        & ~dg.AutomationCondition.in_progress()
+    ).with_label(f"batched_on_cron({cron_schedule}, {cron_timezone}, {timeout})")
+
 
 class TransformDagsterDbtTranslator(DagsterDbtTranslator):
     """Per-tenant dbt translator for staging + mart layers.
@@ -18,9 +113,15 @@ class TransformDagsterDbtTranslator(DagsterDbtTranslator):
     - asset key name: {layer}_{entity}                (e.g. stg_cfg_item_master)
     """
 
-    def __init__(self, tenant_id: str, settings=None):
+    def __init__(
+        self,
+        tenant_id: str,
+        settings=None,
+        automation_condition: Optional[dg.AutomationCondition] = None,
+    ):
         self._tenant_id = tenant_id
         self._prefix = f"{tenant_id}__"
+        self._automation_condition = automation_condition
         super().__init__(settings=settings)
 
     def _strip_prefix(self, name: str) -> str:
@@ -52,4 +153,6 @@ class TransformDagsterDbtTranslator(DagsterDbtTranslator):
     def get_automation_condition(
         self, dbt_resource_props: Mapping[str, Any]
     ) -> Optional[dg.AutomationCondition]:
-        return dg.AutomationCondition.eager()
+        # The default re-runs a model for every upstream data change; tenants pass
+        # batched_on_cron() to get one build per schedule tick
+        return self._automation_condition or eager_on_data_change()
@@ -0,0 +1,96 @@
+"""Arrow conversion helpers shared by the extraction paths."""
+
+from collections.abc import Sequence
+
+import pyarrow as pa
+
+
+def conform_array(arr: pa.Array, target: pa.DataType) -> pa.Array:
+    """Cast ``arr`` to ``target``.
+
+    The cast is safe: a decimal with more scale or integer digits than the
+    target raises instead of being rounded or truncated.
+    """
+    if arr.type == target:
+        return arr
+    if pa.types.is_decimal128(target) and (
+        pa.types.is_decimal(arr.type) or pa.types.is_string(arr.type)
+    ):
+        # Rescaling straight into decimal128 can overflow without an error;
+        # in decimal256 it cannot, and the final cast checks the precision
+        arr = arr.cast(pa.decimal256(76, target.scale))
+    return arr.cast(target)
+
+
+def conform_batch(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Cast every column of ``batch`` to ``schema``."""
+    if batch.schema.equals(schema):
+        return batch
+    arrays = [conform_array(col, field.type) for col, field in zip(batch.columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# Decimal type for columns without a usable declared precision / scale
+DEFAULT_DECIMAL_TYPE = pa.decimal128(38, 18)
+
+
+def decimal_type(precision: int | None, scale: int | None) -> pa.DataType:
+    """Arrow decimal for a column's declared scale, widened to 38 digits.
+
+    Undeclared or out-of-range precision / scale (unconstrained NUMERIC,
+    Oracle NUMBER) falls back to :data:`DEFAULT_DECIMAL_TYPE`.
+    """
+    if precision and scale is not None and 0 <= scale <= min(precision, 38):
+        return pa.decimal128(38, scale)
+    return DEFAULT_DECIMAL_TYPE
+
+
+def _normalize_inferred_type(arr: pa.Array, column: Sequence | None) -> pa.Array:
+    """Fix types inferred from a single batch so later batches still fit.
+
+    All-NULL columns become strings (matching the empty-table behaviour).
+    Decimals take their type from the DBAPI ``column`` description rather
+    than the batch's values; a value that does not fit raises.
+    """
+    if pa.types.is_null(arr.type):
+        return arr.cast(pa.string())
+    if pa.types.is_decimal(arr.type):
+        precision, scale = (column[4], column[5]) if column is not None else (None, None)
+        return conform_array(arr, decimal_type(precision, scale))
+    return arr
+
+
+def rows_to_record_batch(
+    rows: Sequence[Sequence],
+    column_names: list[str],
+    schema: pa.Schema | None = None,
+    description: Sequence[Sequence] | None = None,
+) -> pa.RecordBatch:
+    """Convert a list of DBAPI rows into a RecordBatch.
+
+    When ``schema`` is given the columns are coerced to it, so every batch of a
+    stream ends up with identical types. ``description`` (the DBAPI
+    ``cursor.description``) supplies decimal precision and scale for the first
+    batch.
+    """
+    arrays = []
+    for i, values in enumerate(zip(*rows)):
+        if schema is None:
+            column = description[i] if description else None
+            arrays.append(_normalize_inferred_type(pa.array(values), column))
+            continue
+        target = schema.field(i).type
+        try:
+            arrays.append(pa.array(values, type=target))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(conform_array(pa.array(values), target))
+
+    if schema is not None:
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    return pa.RecordBatch.from_arrays(arrays, names=column_names)
+
+
+def empty_record_batch(column_names: list[str]) -> pa.RecordBatch:
+    """Return an empty batch with string columns for a query without rows."""
+    arrays = [pa.array([], type=pa.string()) for _ in column_names]
+    return pa.RecordBatch.from_arrays(arrays, names=column_names)
@@ -1,11 +1,23 @@
+import logging
+
 from mozart_etl.lib.extract.connectors.base import BaseConnector
 from mozart_etl.lib.extract.connectors.mysql import MySQLConnector
 from mozart_etl.lib.extract.connectors.oracle import OracleConnector
 from mozart_etl.lib.extract.connectors.postgresql import PostgreSQLConnector
 
+logger = logging.getLogger(__name__)
+
+BULK_EXPORT_MODES = ("auto", "native", "generic")
+
 
 def create_connector(source_config: dict) -> BaseConnector:
-    """Factory function to create the appropriate connector based on source type."""
+    """Factory function to create the appropriate connector based on source type.
+
+    ``bulk_export`` in the source config selects the extraction path:
+    ``auto`` (default) uses the connector's native bulk-export API when the
+    installed driver supports it, ``native`` requires it, and ``generic``
+    always uses the SQLAlchemy row fetch.
+    """
     connectors = {
         "postgresql": PostgreSQLConnector,
         "oracle": OracleConnector,
@@ -20,4 +32,24 @@ def create_connector(source_config: dict) -> BaseConnector:
             f"Supported types: {list(connectors.keys())}"
         )
 
-    return connector_cls(source_config)
+    bulk_export = source_config.get("bulk_export", "auto")
+    if bulk_export not in BULK_EXPORT_MODES:
+        raise ValueError(
+            f"Unsupported bulk_export mode: {bulk_export}. "
+            f"Supported modes: {list(BULK_EXPORT_MODES)}"
+        )
+
+    connector = connector_cls(source_config)
+    if bulk_export != "generic":
+        supported = connector.supports_native_export()
+        if bulk_export == "native" and not supported:
+            raise ValueError(
+                f"Native bulk export is not available for source type: {source_type}"
+            )
+        connector.native_export = supported
+
+    logger.info(
+        "[connector] %s source using %s extraction path",
+        source_type, "native" if connector.native_export else "generic",
+    )
+    return connector
@@ -1,9 +1,28 @@
+import contextlib
+import logging
+import re
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
 
 import pyarrow as pa
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+from mozart_etl.lib.extract.arrow import empty_record_batch, rows_to_record_batch
+from mozart_etl.lib.extract.parallel import iter_parallel_batches
+from mozart_etl.lib.telemetry import span, timed_batches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50_000
+
+_BIND_PARAM = re.compile(r"(?<!:):(\w+)")
+
+
+def to_pyformat(query: str) -> str:
+    """Convert SQLAlchemy ``:name`` binds to DBAPI ``%(name)s`` pyformat binds."""
+    return _BIND_PARAM.sub(r"%(\1)s", query.replace("%", "%%"))
+
 
 class BaseConnector(ABC):
     """Abstract base class for database connectors.
@@ -15,18 +34,118 @@ class BaseConnector(ABC):
     def __init__(self, config: dict):
         self.config = config
         self._engine: Engine | None = None
+        # Set by create_connector when the source can use its native bulk-export path
+        self.native_export = False
+        # Fixed connection pool size (no overflow); None keeps SQLAlchemy defaults
+        self.pool_size: int | None = None
 
     @abstractmethod
     def get_connection_url(self) -> str:
         """Return the SQLAlchemy connection URL for this database type."""
         ...
 
+    def get_engine_options(self) -> dict:
+        """Extra keyword arguments for ``create_engine`` (driver tuning)."""
+        return {}
+
     def get_engine(self) -> Engine:
         if self._engine is None:
-            self._engine = create_engine(self.get_connection_url())
+            options = self.get_engine_options()
+            if self.pool_size is not None:
+                options.update(pool_size=self.pool_size, max_overflow=0)
+            self._engine = create_engine(self.get_connection_url(), **options)
         return self._engine
 
-    def extract_table(
+    def configure_pool(self, pool_size: int):
+        """Bound the engine to ``pool_size`` connections, recreating it if needed."""
+        if self.pool_size != pool_size:
+            self.close()
+            self.pool_size = pool_size
+
+    def hash_bucket_expression(self, column: str, buckets: int) -> str:
+        """SQL expression mapping ``column`` to a bucket in ``[0, buckets)``.
+
+        Used by hash-split parallel extraction.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support hash splits")
+
+    @contextlib.contextmanager
+    def export_snapshot(self) -> Iterator[str | None]:
+        """Hold a snapshot that parallel readers can share, yielding its id.
+
+        Sources without shared snapshots yield None, and each slice then reads
+        its own (possibly slightly different) view of the table.
+        """
+        yield None
+
+    def snapshot_setup_statements(self, snapshot: str) -> list[str]:
+        """Statements a reader runs first to join an exported snapshot."""
+        return []
+
+    def supports_native_export(self) -> bool:
+        """Whether this connector implements a bulk-export fast path."""
+        return False
+
+    def modification_counter(self, schema: str, table: str) -> int | None:
+        """Rows inserted, updated or deleted in the table as tracked by the source's statistics.
+
+        Used by the ``n_mod`` fingerprint; None if the source keeps no such counter
+        or has no entry for the table, in which case the table is always extracted.
+        """
+        return None
+
+    def fingerprint(
+        self,
+        schema: str,
+        table: str,
+        methods: Sequence[str],
+        column: str | None = None,
+        filters: dict[str, str] | None = None,
+    ) -> dict[str, str] | None:
+        """Probe the table for change detection, one value per method.
+
+        ``count`` and ``max`` (of ``column``) run as one aggregate query with
+        the extract's ``filters``; ``n_mod`` reads :meth:`modification_counter`
+        (table-wide). Returns None when a value is unavailable, so the caller
+        extracts instead of comparing an incomplete fingerprint.
+        """
+        values: dict[str, str] = {}
+        aggregates = {"count": "COUNT(*)", "max": f"MAX({column})"}
+        selected = [method for method in methods if method in aggregates]
+        with span("source.fingerprint"):
+            if selected:
+                query, params = self.build_query(
+                    schema, table, columns=[aggregates[m] for m in selected], filters=filters
+                )
+                with self.get_engine().connect() as conn:
+                    row = conn.execute(text(query), params).one()
+                values.update({method: str(value) for method, value in zip(selected, row)})
+            if "n_mod" in methods:
+                counter = self.modification_counter(schema, table)
+                if counter is None:
+                    logger.warning(
+                        "[%s] No modification counter for %s.%s", type(self).__name__, schema, table
+                    )
+                    return None
+                values["n_mod"] = str(counter)
+        return values
+
+    def iter_native_batches(
+        self,
+        query: str,
+        params: dict,
+        batch_size: int,
+        setup: Sequence[str] = (),
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream ``query`` through the driver's bulk-export API.
+
+        Connectors that return True from :meth:`supports_native_export`
+        override this to skip the per-row DBAPI → Python object conversion.
+        ``setup`` statements run first on the same connection.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no native export path")
+
+    def build_query(
         self,
         schema: str,
         table: str,
@@ -35,23 +154,15 @@ class BaseConnector(ABC):
         last_value: str | None = None,
         filters: dict[str, str] | None = None,
         limit: int | None = None,
-    ) -> pa.Table:
-        """Extract a table from the source database into a PyArrow Table.
+        predicate: str | None = None,
+    ) -> tuple[str, dict]:
+        """Build the SELECT statement and bind parameters for an extraction.
 
-        Args:
-            schema: Source schema name.
-            table: Source table name.
-            columns: Specific columns to select (None = all).
-            incremental_column: Column to use for incremental loading.
-            last_value: Last known value for incremental loading.
-            filters: Key-value pairs for WHERE clause filtering (e.g. {"project_id": "..."}).
-            limit: Optional row limit (for testing).
+        ``predicate`` is an extra raw SQL condition (e.g. a parallel slice).
 
         Returns:
-            PyArrow Table with the extracted data.
+            (query, params) tuple using SQLAlchemy ``:name`` bind style.
         """
-        engine = self.get_engine()
-
         # Build SELECT clause
         qualified_table = f"{schema}.{table}" if schema else table
         select_cols = ", ".join(columns) if columns else "*"
@@ -72,25 +183,182 @@ class BaseConnector(ABC):
             conditions.append(f"{incremental_column} > :last_value")
             params["last_value"] = last_value
 
+        if predicate:
+            conditions.append(f"({predicate})")
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
         if limit:
             query += f" LIMIT {limit}"
 
-        with engine.connect() as conn:
-            result = conn.execute(text(query), params)
+        return query, params
+
+    def iter_batches(
+        self,
+        schema: str,
+        table: str,
+        columns: list[str] | None = None,
+        incremental_column: str | None = None,
+        last_value: str | None = None,
+        filters: dict[str, str] | None = None,
+        limit: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        parallelism: int = 1,
+        split_by: str | None = None,
+        split_method: str = "range",
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream a table from the source database as PyArrow RecordBatches.
+
+        Rows are read through the connector's native bulk-export path when
+        ``native_export`` is enabled, otherwise through a server-side cursor
+        ``batch_size`` rows at a time, so memory use depends on the batch size
+        rather than the table size. Every batch shares the schema of the first one. At least one
+        batch is always yielded (empty if the query returns no rows) so the
+        consumer can rely on the schema being known.
+
+        Args are the same as :meth:`extract_table`, plus:
+            batch_size: Number of rows per RecordBatch.
+            parallelism: Number of concurrent slices (1 = single query).
+            split_by: Column used to split the query into slices.
+            split_method: ``range`` (numeric min/max ranges) or ``hash`` (hash modulo).
+        """
+        if parallelism > 1 and split_by:
+            yield from iter_parallel_batches(
+                self,
+                schema=schema,
+                table=table,
+                columns=columns,
+                incremental_column=incremental_column,
+                last_value=last_value,
+                filters=filters,
+                batch_size=batch_size,
+                parallelism=parallelism,
+                split_by=split_by,
+                split_method=split_method,
+            )
+            return
+
+        query, params = self.build_query(
+            schema, table, columns, incremental_column, last_value, filters, limit
+        )
+        yield from self.iter_query_batches(query, params, batch_size)
+
+    def iter_query_batches(
+        self,
+        query: str,
+        params: dict,
+        batch_size: int,
+        setup: Sequence[str] = (),
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream an already-built query through the native or generic path."""
+        if self.native_export:
+            yield from self._iter_native_with_fallback(query, params, batch_size, setup)
+        else:
+            yield from self.iter_generic_batches(query, params, batch_size, setup)
+
+    def _iter_native_with_fallback(
+        self, query: str, params: dict, batch_size: int, setup: Sequence[str]
+    ) -> Iterator[pa.RecordBatch]:
+        """Use the native path, falling back to the generic one if it fails up front.
+
+        Once a batch has been handed to the consumer a failure is re-raised,
+        since switching paths mid-stream would duplicate rows.
+        """
+        started = False
+        try:
+            for batch in self.iter_native_batches(query, params, batch_size, setup):
+                started = True
+                yield batch
+        except Exception as e:
+            if started:
+                raise
+            logger.warning(
+                "[%s] Native export failed, falling back to generic fetch: %s",
+                type(self).__name__, e,
+            )
+            yield from self.iter_generic_batches(query, params, batch_size, setup)
+            return
+
+        if not started:
+            # Native drivers may yield nothing for an empty result; the generic
+            # path still reports the column names.
+            yield from self.iter_generic_batches(query, params, batch_size, setup)
+
+    def iter_generic_batches(
+        self,
+        query: str,
+        params: dict,
+        batch_size: int,
+        setup: Sequence[str] = (),
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream ``query`` through SQLAlchemy with a server-side cursor."""
+        engine = self.get_engine()
+
+        with span("source.connect"):
+            conn = engine.connect()
+        with conn:
+            with span("source.query"):
+                for statement in setup:
+                    conn.exec_driver_sql(statement)
+                result = conn.execution_options(
+                    stream_results=True, yield_per=batch_size
+                ).execute(text(query), params)
             result_columns = list(result.keys())
-            rows = result.fetchall()
+            description = result.cursor.description
 
-        if not rows:
-            # Return empty table with column names
-            arrays = [pa.array([], type=pa.string()) for _ in result_columns]
-            return pa.table(dict(zip(result_columns, arrays)))
+            arrow_schema: pa.Schema | None = None
+            for rows in timed_batches("source.fetch", result.partitions(batch_size)):
+                with span("arrow.build") as stage:
+                    batch = rows_to_record_batch(
+                        rows, result_columns, arrow_schema, description
+                    )
+                    stage.add(batch.num_rows, batch.nbytes)
+                arrow_schema = batch.schema
+                yield batch
 
-        # Convert to PyArrow Table
-        col_data = {col: [row[i] for row in rows] for i, col in enumerate(result_columns)}
-        return pa.table(col_data)
+        if arrow_schema is None:
+            yield empty_record_batch(result_columns)
+
+    def extract_table(
+        self,
+        schema: str,
+        table: str,
+        columns: list[str] | None = None,
+        incremental_column: str | None = None,
+        last_value: str | None = None,
+        filters: dict[str, str] | None = None,
+        limit: int | None = None,
+    ) -> pa.Table:
+        """Extract a table from the source database into a PyArrow Table.
+
+        Prefer :meth:`iter_batches` for large tables; this collects the whole
+        stream into memory.
+
+        Args:
+            schema: Source schema name.
+            table: Source table name.
+            columns: Specific columns to select (None = all).
+            incremental_column: Column to use for incremental loading.
+            last_value: Last known value for incremental loading.
+            filters: Key-value pairs for WHERE clause filtering (e.g. {"project_id": "..."}).
+            limit: Optional row limit (for testing).
+
+        Returns:
+            PyArrow Table with the extracted data.
+        """
+        batches = list(
+            self.iter_batches(
+                schema=schema,
+                table=table,
+                columns=columns,
+                incremental_column=incremental_column,
+                last_value=last_value,
+                filters=filters,
+                limit=limit,
+            )
+        )
+        return pa.Table.from_batches(batches)
 
     def test_connection(self) -> bool:
         """Test if the database connection is working."""
@@ -1,4 +1,13 @@
+from collections.abc import Iterator, Sequence
+
+import pyarrow as pa
+
+from mozart_etl.lib.extract.arrow import conform_batch
 from mozart_etl.lib.extract.connectors.base import BaseConnector
+from mozart_etl.lib.telemetry import span, timed_batches
+
+# Rows per network round trip; the driver default (100) is tuned for OLTP
+DEFAULT_ARRAYSIZE = 10_000
 
 
 class OracleConnector(BaseConnector):
@@ -23,3 +32,56 @@ class OracleConnector(BaseConnector):
             dsn = f"{host}:{port}"
 
         return f"oracle+oracledb://{username}:{password}@{dsn}"
+
+    def get_engine_options(self) -> dict:
+        return {"arraysize": int(self.config.get("arraysize", DEFAULT_ARRAYSIZE))}
+
+    def supports_native_export(self) -> bool:
+        try:
+            import oracledb
+        except ImportError:
+            return False
+        # Direct DataFrame fetch was added in python-oracledb 3.0
+        return hasattr(oracledb.Connection, "fetch_df_batches")
+
+    def hash_bucket_expression(self, column: str, buckets: int) -> str:
+        return f"MOD(ORA_HASH({column}), {buckets})"
+
+    def iter_native_batches(
+        self,
+        query: str,
+        params: dict,
+        batch_size: int,
+        setup: Sequence[str] = (),
+    ) -> Iterator[pa.RecordBatch]:
+        """Fetch straight into Arrow columns with oracledb's DataFrame API.
+
+        The driver fills Arrow buffers itself, so no Python object is created
+        per value. Every batch is cast to the first batch's schema, like the
+        generic path. Oracle accepts SQLAlchemy's ``:name`` binds natively.
+        """
+        with span("source.connect"):
+            raw = self.get_engine().raw_connection()
+        try:
+            conn = raw.driver_connection
+            if setup:
+                with span("source.query"):
+                    cursor = conn.cursor()
+                    for statement in setup:
+                        cursor.execute(statement)
+            # The driver executes and fills Arrow buffers per batch, so fetch covers both
+            odf_batches = conn.fetch_df_batches(
+                statement=query, parameters=params or None, size=batch_size
+            )
+            arrow_schema: pa.Schema | None = None
+            for odf in timed_batches("source.fetch", odf_batches):
+                with span("arrow.build") as stage:
+                    # OracleDataFrame exports itself through the Arrow PyCapsule interface
+                    table = pa.table(odf)
+                    stage.add(table.num_rows, table.nbytes)
+                if arrow_schema is None:
+                    arrow_schema = table.schema
+                for batch in table.to_batches():
+                    yield conform_batch(batch, arrow_schema)
+        finally:
+            raw.close()
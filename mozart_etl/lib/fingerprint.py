@@ -0,0 +1,64 @@
+"""Change detection for extract assets: a cheap source probe taken before extraction.
+
+A table's ``fingerprint`` methods (``count``, ``max`` of a column, or the
+source's ``n_mod`` modification counter) are combined into one string that is
+stored on the extract asset's materializations, like the watermark
+(:mod:`mozart_etl.lib.watermark`), and used as the materialization's data
+version. When the probe matches the last materialization, the extract records
+a ``skipped`` materialization with the same data version, which the dbt
+automation conditions do not treat as an update (they key on data version
+changes, see :mod:`mozart_etl.lib.dbt.translator`).
+"""
+
+from __future__ import annotations
+
+import dagster as dg
+
+FINGERPRINT_METHODS = ("count", "max", "n_mod")
+FINGERPRINT_METADATA_KEY = "source_fingerprint"
+
+
+def resolve_fingerprint_config(table: dict) -> tuple[list[str], str | None]:
+    """Validate a table's ``fingerprint`` / ``fingerprint_column`` settings.
+
+    ``max`` uses ``fingerprint_column``, defaulting to ``incremental_column``.
+
+    Returns:
+        (methods, column); no methods means change detection is off.
+    """
+    methods = table.get("fingerprint") or []
+    if isinstance(methods, str):
+        methods = [methods]
+    unknown = [m for m in methods if m not in FINGERPRINT_METHODS]
+    if unknown:
+        raise ValueError(
+            f"{table['name']}: unsupported fingerprint {unknown} "
+            f"({' | '.join(FINGERPRINT_METHODS)})"
+        )
+    column = table.get("fingerprint_column") or table.get("incremental_column")
+    if "max" in methods and not column:
+        raise ValueError(
+            f"{table['name']}: fingerprint 'max' requires fingerprint_column or incremental_column"
+        )
+    return list(methods), column
+
+
+def format_fingerprint(values: dict[str, str]) -> str:
+    """``{"count": "10", "max": "2024-01-01"}`` → ``"count=10,max=2024-01-01"``."""
+    return ",".join(f"{method}={values[method]}" for method in sorted(values))
+
+
+def last_fingerprint(instance: dg.DagsterInstance, asset_key: dg.AssetKey) -> str | None:
+    """The fingerprint recorded on the asset's last materialization, if any."""
+    event = instance.get_latest_materialization_event(asset_key)
+    if event is None or event.asset_materialization is None:
+        return None
+    value = event.asset_materialization.metadata.get(FINGERPRINT_METADATA_KEY)
+    return value.value if value is not None else None
+
+
+def fingerprint_metadata(fingerprint: str | None) -> dict:
+    """Metadata entries that persist ``fingerprint`` for the next run."""
+    if fingerprint is None:
+        return {}
+    return {FINGERPRINT_METADATA_KEY: dg.MetadataValue.text(fingerprint)}
@@ -0,0 +1,184 @@
+"""Cross-process concurrency governor: named slot pools in a shared SQLite lock table.
+
+Every tenant runs on the same cron, so at the top of the hour all extract and
+dbt runs hit Trino and the source databases together. Assets take a slot in
+the pool of the system they query (``trino:{host}:{port}``,
+``source:{host}:{port}``) before issuing queries; when the pool is full they
+wait. Slots live in one SQLite file shared by every code-location and run
+process on the host, and a slot whose holder process died or whose lease
+expired is reclaimed by the next acquirer.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+from collections.abc import Iterator
+
+import dagster as dg
+
+from mozart_etl.lib.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_LIMIT = 4
+DEFAULT_POLL_SECONDS = 1.0
+# Slots held longer than this are treated as leaked (holder hung or on another host)
+DEFAULT_LEASE_SECONDS = 6 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pool TEXT NOT NULL,
+    weight INTEGER NOT NULL,
+    holder TEXT NOT NULL,
+    hostname TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    acquired_at REAL NOT NULL
+)
+"""
+
+
+def trino_pool(host: str, port: int | str) -> str:
+    return f"trino:{host}:{port}"
+
+
+def source_pool(source_config: dict) -> str:
+    return f"source:{source_config['host']}:{source_config['port']}"
+
+
+def parse_pool_limits(value: str) -> dict[str, int]:
+    """``"trino:trino:8080=6,source:db:5432=2"`` → {pool: limit}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        pool, sep, limit = item.rpartition("=")
+        if not sep or not pool:
+            raise ValueError(f"Invalid pool limit: {item!r} (expected pool=limit)")
+        limits[pool] = int(limit)
+    return limits
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ConcurrencyGovernorResource(dg.ConfigurableResource):
+    """Limits concurrent runs per Trino cluster / source host across processes.
+
+    Pool limits come from ``pool_limits``, falling back to ``trino_limit`` or
+    ``source_limit`` by pool prefix. ``enabled=False`` makes :meth:`slot` a
+    no-op that reports zero wait.
+    """
+
+    enabled: bool = True
+    db_path: str = ""
+    trino_limit: int = DEFAULT_POOL_LIMIT
+    source_limit: int = DEFAULT_POOL_LIMIT
+    pool_limits: dict[str, int] = {}
+    poll_seconds: float = DEFAULT_POLL_SECONDS
+    lease_seconds: int = DEFAULT_LEASE_SECONDS
+
+    def limit(self, pool: str) -> int:
+        if pool in self.pool_limits:
+            return self.pool_limits[pool]
+        return self.trino_limit if pool.startswith("trino:") else self.source_limit
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path or os.path.join(
+            os.getenv("DAGSTER_HOME") or tempfile.gettempdir(), "mozart_governor.sqlite"
+        )
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _reclaim(self, conn: sqlite3.Connection, pool: str, now: float):
+        """Delete slots of dead local processes and slots past their lease."""
+        hostname = socket.gethostname()
+        stale = [
+            slot_id
+            for slot_id, slot_host, pid, acquired_at in conn.execute(
+                "SELECT id, hostname, pid, acquired_at FROM slots WHERE pool = ?", (pool,)
+            )
+            if now - acquired_at > self.lease_seconds
+            or (slot_host == hostname and not _pid_alive(pid))
+        ]
+        if stale:
+            logger.warning("[governor] %s: reclaiming %d stale slot(s)", pool, len(stale))
+            conn.executemany("DELETE FROM slots WHERE id = ?", [(i,) for i in stale])
+
+    def _try_acquire(
+        self, conn: sqlite3.Connection, pool: str, weight: int, holder: str
+    ) -> int | None:
+        """Insert a slot row if the pool has room; returns its id."""
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim(conn, pool, now)
+            (used,) = conn.execute(
+                "SELECT coalesce(sum(weight), 0) FROM slots WHERE pool = ?", (pool,)
+            ).fetchone()
+            if used + weight > self.limit(pool):
+                conn.execute("COMMIT")
+                return None
+            slot_id = conn.execute(
+                "INSERT INTO slots (pool, weight, holder, hostname, pid, acquired_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (pool, weight, holder, socket.gethostname(), os.getpid(), now),
+            ).lastrowid
+            conn.execute("COMMIT")
+            return slot_id
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @contextlib.contextmanager
+    def slot(self, pool: str, holder: str, weight: int = 1) -> Iterator[float]:
+        """Hold ``weight`` slots of ``pool`` for the block, waiting until they are free.
+
+        Yields the seconds spent waiting in the queue. ``weight`` is capped at
+        the pool limit so a large request cannot wait forever.
+        """
+        if not self.enabled:
+            yield 0.0
+            return
+        weight = max(1, min(weight, self.limit(pool)))
+        conn = self._connect()
+        try:
+            start = time.monotonic()
+            with span(f"governor.wait.{pool.partition(':')[0]}", pool=pool):
+                slot_id = self._try_acquire(conn, pool, weight, holder)
+                if slot_id is None:
+                    logger.info(
+                        "[governor] %s full (limit %d), %s waiting", pool, self.limit(pool), holder
+                    )
+                while slot_id is None:
+                    time.sleep(self.poll_seconds)
+                    slot_id = self._try_acquire(conn, pool, weight, holder)
+            waited = round(time.monotonic() - start, 3)
+            logger.info("[governor] %s acquired %s after %.1fs", holder, pool, waited)
+            try:
+                yield waited
+            finally:
+                conn.execute("DELETE FROM slots WHERE id = ?", (slot_id,))
+        finally:
+            conn.close()
+
+    def usage(self) -> dict[str, int]:
+        """Slots currently held per pool."""
+        conn = self._connect()
+        try:
+            return dict(conn.execute("SELECT pool, sum(weight) FROM slots GROUP BY pool"))
+        finally:
+            conn.close()
@@ -0,0 +1,114 @@
+"""Iceberg table maintenance through Trino: compaction, snapshot expiry, orphan cleanup."""
+
+import logging
+
+from mozart_etl.lib.trino import TrinoResource
+from mozart_etl.utils.units import parse_duration, parse_size
+
+logger = logging.getLogger(__name__)
+
+# tenant.yaml ``maintenance:`` defaults
+DEFAULT_MAINTENANCE = {
+    "enabled": True,
+    "schedule": "0 3 * * *",  # off-peak
+    "file_size_threshold": "128MB",  # files below this size are compaction candidates
+    "min_small_files": 10,  # optimize only when at least this many small files exist
+    "snapshot_retention": "7d",  # expire snapshots older than this
+    "orphan_retention": "7d",  # remove unreferenced files older than this
+}
+
+def resolve_maintenance_config(config: dict | None) -> dict:
+    """Merge a tenant's ``maintenance:`` block over the defaults and validate it."""
+    resolved = {**DEFAULT_MAINTENANCE, **(config or {})}
+    parse_size(resolved["file_size_threshold"])
+    parse_duration(resolved["snapshot_retention"])
+    parse_duration(resolved["orphan_retention"])
+    resolved["min_small_files"] = int(resolved["min_small_files"])
+    return resolved
+
+
+def _metadata_table(table: str, suffix: str) -> str:
+    """``iceberg.schema.t`` → ``iceberg.schema."t$files"``."""
+    prefix, name = table.rsplit(".", 1)
+    return f'{prefix}."{name.strip(chr(34))}${suffix}"'
+
+
+def _file_stats(trino: TrinoResource, table: str, threshold: int) -> tuple[int, int, int, int]:
+    """(data files, total bytes, files below ``threshold``, their bytes)."""
+    rows = trino.execute(
+        f"SELECT count(*), coalesce(sum(file_size_in_bytes), 0), "
+        f"count_if(file_size_in_bytes < {threshold}), "
+        f"coalesce(sum(file_size_in_bytes) FILTER (WHERE file_size_in_bytes < {threshold}), 0) "
+        f"FROM {_metadata_table(table, 'files')}"
+    )
+    return tuple(int(v) for v in rows[0])
+
+
+def _snapshot_stats(trino: TrinoResource, table: str, retention_seconds: int) -> tuple[int, int]:
+    """(snapshots, snapshots older than the retention)."""
+    rows = trino.execute(
+        f"SELECT count(*), count_if(committed_at < current_timestamp - "
+        f"INTERVAL '{retention_seconds}' SECOND) FROM {_metadata_table(table, 'snapshots')}"
+    )
+    total, expired = rows[0]
+    return int(total), int(expired)
+
+
+def maintain_table(trino: TrinoResource, table: str, config: dict) -> dict:
+    """Run the maintenance procedures a table's thresholds call for.
+
+    ``optimize`` runs when at least ``min_small_files`` data files are below
+    ``file_size_threshold``; ``expire_snapshots`` and ``remove_orphan_files``
+    run when any snapshot is older than ``snapshot_retention``. Sizes and
+    durations are passed to Trino normalized to bytes (``B``) and seconds (``s``).
+
+    Returns:
+        Dict of actions taken and files/bytes/snapshots before and after.
+    """
+    threshold = parse_size(config["file_size_threshold"])
+    retention = parse_duration(config["snapshot_retention"])
+    orphan_retention = parse_duration(config["orphan_retention"])
+
+    files_before, bytes_before, small_files, small_bytes = _file_stats(trino, table, threshold)
+    snapshots_before, old_snapshots = _snapshot_stats(trino, table, retention)
+    actions = []
+
+    if small_files >= config["min_small_files"]:
+        trino.execute(
+            f"ALTER TABLE {table} EXECUTE optimize"
+            f"(file_size_threshold => '{threshold}B')"
+        )
+        actions.append("optimize")
+    if old_snapshots:
+        trino.execute(
+            f"ALTER TABLE {table} EXECUTE expire_snapshots"
+            f"(retention_threshold => '{retention}s')"
+        )
+        trino.execute(
+            f"ALTER TABLE {table} EXECUTE remove_orphan_files"
+            f"(retention_threshold => '{orphan_retention}s')"
+        )
+        actions.extend(["expire_snapshots", "remove_orphan_files"])
+
+    if actions:
+        files_after, bytes_after, _, _ = _file_stats(trino, table, threshold)
+        snapshots_after, _ = _snapshot_stats(trino, table, retention)
+    else:
+        files_after, bytes_after, snapshots_after = files_before, bytes_before, snapshots_before
+
+    result = {
+        "table": table,
+        "actions": actions,
+        "small_files": small_files,
+        "files_before": files_before,
+        "files_after": files_after,
+        # optimize rewrites every file below the threshold
+        "files_rewritten": small_files if "optimize" in actions else 0,
+        "bytes_rewritten": small_bytes if "optimize" in actions else 0,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "snapshots_before": snapshots_before,
+        "snapshots_after": snapshots_after,
+    }
+    logger.info("[maintenance] %s: %s", table, result)
+    return result
@@ -0,0 +1,213 @@
+"""Per-extract memory budget: buffer sizing from the first batch plus a memory sampler.
+
+Extracts stream, so their memory is the buffers between stages: source
+batches in flight, the pending Parquet row group (and its sorted copy) with
+the multipart parts being uploaded, or the pyiceberg commit chunk. :func:`plan_memory`
+projects that from the first batch's bytes per row. Over ``memory_budget``
+the extract runs in ``chunked`` mode: write buffers shrink to fit and Parquet
+parts are spilled to local disk before upload. :class:`MemoryMonitor`
+samples RSS, Arrow and (with a budget) tracemalloc memory while the extract
+runs; streaming writers check :func:`under_pressure` to flush early.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import sys
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import dagster as dg
+
+from mozart_etl.lib.telemetry import current_rss_mb
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+DEFAULT_SAMPLE_SECONDS = 0.05
+# Live memory above this share of the budget counts as pressure
+PRESSURE_RATIO = 0.8
+MIN_CHUNK_ROWS = 10_000
+# Python row tuples cost several times their Arrow size before conversion
+GENERIC_ROW_OVERHEAD = 4
+# Batches each parallel slice holds: one being built plus its queue share
+PARALLEL_BATCHES_PER_SLICE = 3
+
+_current: contextvars.ContextVar[MemoryMonitor | None] = contextvars.ContextVar(
+    "mozart_memory_monitor", default=None
+)
+
+
+@dataclass
+class MemoryPlan:
+    """Buffer sizes chosen for one extract."""
+
+    budget: int | None
+    bytes_per_row: float
+    projected: int
+    mode: str
+    row_group_size: int
+    commit_rows: int
+    spill: bool
+
+    def metadata(self) -> dict[str, dg.MetadataValue]:
+        metadata = {
+            "memory_mode": dg.MetadataValue.text(self.mode),
+            "projected_memory_mb": dg.MetadataValue.float(round(self.projected / MB, 1)),
+        }
+        if self.budget is not None:
+            metadata["memory_budget_mb"] = dg.MetadataValue.float(round(self.budget / MB, 1))
+        return metadata
+
+
+def plan_memory(
+    *,
+    budget: int | None,
+    bytes_per_row: float,
+    batch_size: int,
+    parallelism: int,
+    native: bool,
+    load_engine: str,
+    row_group_size: int,
+    sorted_row_groups: bool,
+    commit_rows: int,
+    upload_buffer: int = 0,
+) -> MemoryPlan:
+    """Project the extract's buffered bytes and shrink the write buffers to fit ``budget``.
+
+    The fetch side (``batch_size`` rows per batch) is fixed once the query
+    runs, so only the Parquet row group / pyiceberg commit chunk is resized,
+    down to :data:`MIN_CHUNK_ROWS`. ``upload_buffer`` is the multipart parts
+    the Parquet stream writer holds (``S3Resource.upload_buffer_bytes()``).
+    """
+    in_flight = parallelism * PARALLEL_BATCHES_PER_SLICE if parallelism > 1 else 1
+    fetch = bytes_per_row * batch_size * in_flight * (1 if native else GENERIC_ROW_OVERHEAD)
+    if load_engine == "pyiceberg":
+        # The commit chunk plus the filtered / upsert copy of it
+        write_rows, write_factor, fixed = commit_rows, 2, 0
+    else:
+        # The pending row group (plus its sorted copy) and the S3 upload buffer
+        write_rows = row_group_size
+        write_factor = 2 if sorted_row_groups else 1
+        fixed = upload_buffer
+    projected = int(fetch + write_rows * bytes_per_row * write_factor + fixed)
+
+    if budget is None or projected <= budget:
+        return MemoryPlan(
+            budget, bytes_per_row, projected, "stream", row_group_size, commit_rows, False
+        )
+
+    available = budget - fetch - fixed
+    rows = int(available / (bytes_per_row * write_factor)) if bytes_per_row else write_rows
+    rows = min(write_rows, max(MIN_CHUNK_ROWS, rows))
+    projected = int(fetch + rows * bytes_per_row * write_factor + fixed)
+    if fetch + fixed > budget:
+        logger.warning(
+            "[memory] Fetch and upload buffers alone (%.0f MB) exceed the budget (%.0f MB); "
+            "lower batch_size, parallelism or the S3 multipart settings",
+            (fetch + fixed) / MB, budget / MB,
+        )
+    if load_engine == "pyiceberg":
+        return MemoryPlan(
+            budget, bytes_per_row, projected, "chunked", row_group_size, rows, False
+        )
+    return MemoryPlan(budget, bytes_per_row, projected, "chunked", rows, commit_rows, True)
+
+
+def _arrow_allocated() -> int:
+    # Only once the data plane has imported pyarrow
+    pa = sys.modules.get("pyarrow")
+    return pa.total_allocated_bytes() if pa is not None else 0
+
+
+class MemoryMonitor:
+    """Samples memory in a background thread while :meth:`watch` is active.
+
+    Tracks the peak RSS growth, live Arrow allocations and, when a budget is
+    set (or ``trace_python``), the tracemalloc peak of Python allocations.
+    Pressure is live Arrow + Python bytes above :data:`PRESSURE_RATIO` of the
+    budget; RSS is not used for it since freed memory stays resident.
+    """
+
+    def __init__(
+        self,
+        budget: int | None = None,
+        interval: float = DEFAULT_SAMPLE_SECONDS,
+        trace_python: bool | None = None,
+    ):
+        self.budget = budget
+        self.interval = interval
+        self.trace_python = budget is not None if trace_python is None else trace_python
+        self.pressure = False
+        self.rss_peak_mb = 0.0
+        self.arrow_peak = 0
+        self.python_peak: int | None = None
+        self._rss_start: float | None = None
+        self._warned = False
+        self._stop = threading.Event()
+
+    def _sample(self):
+        rss = current_rss_mb()
+        if rss is not None and self._rss_start is not None:
+            self.rss_peak_mb = max(self.rss_peak_mb, rss - self._rss_start)
+        arrow = _arrow_allocated()
+        self.arrow_peak = max(self.arrow_peak, arrow)
+        python = 0
+        if tracemalloc.is_tracing():
+            python, peak = tracemalloc.get_traced_memory()
+            self.python_peak = max(self.python_peak or 0, peak)
+        if self.budget is not None:
+            self.pressure = arrow + python >= self.budget * PRESSURE_RATIO
+            if self.pressure and not self._warned:
+                self._warned = True
+                logger.warning(
+                    "[memory] Live memory %.0f MB is near the budget (%.0f MB), "
+                    "flushing buffers early",
+                    (arrow + python) / MB, self.budget / MB,
+                )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    @contextlib.contextmanager
+    def watch(self) -> Iterator[MemoryMonitor]:
+        """Sample in the background and make this the monitor :func:`under_pressure` reads."""
+        started_tracing = self.trace_python and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        self._rss_start = current_rss_mb()
+        thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        thread.start()
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+            self._stop.set()
+            thread.join()
+            self._sample()
+            if started_tracing:
+                tracemalloc.stop()
+
+    def metadata(self) -> dict[str, dg.MetadataValue]:
+        """Peak memory of the watched block (RSS growth, Arrow, Python)."""
+        metadata = {
+            "memory_peak_mb": dg.MetadataValue.float(round(self.rss_peak_mb, 1)),
+            "arrow_peak_mb": dg.MetadataValue.float(round(self.arrow_peak / MB, 1)),
+        }
+        if self.python_peak is not None:
+            metadata["python_peak_mb"] = dg.MetadataValue.float(round(self.python_peak / MB, 1))
+        if self.budget is not None:
+            metadata["memory_pressure"] = dg.MetadataValue.bool(self._warned)
+        return metadata
+
+
+def under_pressure() -> bool:
+    """Whether the active :class:`MemoryMonitor` reports memory pressure."""
+    monitor = _current.get()
+    return monitor is not None and monitor.pressure
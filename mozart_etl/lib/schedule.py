@@ -1,23 +1,346 @@
+"""Schedule component and the load-aware tenant schedule planner.
+
+Tenants default to the same cron, so every pipeline starts at the same minute
+and hits Trino and the source databases together. For tenants that opt in
+(``schedule_plan: {stagger: true}``), the planner shifts the minute field of
+the cron within a window:
+
+- tenants sharing a cron (apart from the minute) are packed together so the
+  number of concurrent runs per pool (Trino cluster, source host) stays low,
+  using each tenant's duration from past materializations;
+- a tenant with an SLA (``sla: ":45"``, data fresh by minute 45) only gets
+  start offsets that finish by the SLA;
+- ties, and the fallback used without a generated plan, are decided by a
+  deterministic offset derived from the tenant id hash.
+
+``scripts/plan_schedules.py`` writes the plan to ``config/schedule_plan.yaml``,
+which code locations read when building their schedules.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import statistics
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from functools import cache
+from pathlib import Path
 from typing import Any
 
 import dagster as dg
+import yaml
 from dagster.components import Component, Model, Resolvable
 
+from mozart_etl.lib.governor import source_pool, trino_pool
+from mozart_etl.utils.cron import latest_cron_tick
+from mozart_etl.utils.units import parse_duration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CRON = "0 */2 * * *"
+# tenant.yaml ``schedule_plan:`` defaults
+DEFAULT_SCHEDULE_PLAN = {
+    "stagger": False,  # opt-in: shift the start minute within ``window`` / before ``sla``
+    "window": "30m",  # start offsets spread over this many minutes after the cron minute
+    "sla": None,  # ":45" → data fresh by minute 45 (replaces window)
+    "duration": "10m",  # estimate used until the tenant has run history
+}
+
+SCHEDULE_PLAN_PATH = Path(__file__).resolve().parent.parent / "config" / "schedule_plan.yaml"
+
 
 class ScheduleComponent(Component, Resolvable, Model):
+    """Schedule for a target; ``stagger_window`` / ``sla`` shift its start like tenant schedules."""
+
     name: str
     target: str
     tags: dict[str, Any]
     cron: str
+    stagger_window: str | None = None
+    sla: str | None = None
+    duration: str = DEFAULT_SCHEDULE_PLAN["duration"]
 
     def build_defs(self, context):
+        cron = self.cron
+        if self.stagger_window or self.sla:
+            request = ScheduleRequest(
+                key=self.name,
+                cron=self.cron,
+                pools=(),
+                duration_minutes=_minutes(self.duration),
+                window_minutes=_minutes(self.stagger_window or DEFAULT_SCHEDULE_PLAN["window"]),
+                sla_minute=parse_sla(self.sla),
+                stagger=True,
+            )
+            cron = fallback_cron(request)
         return dg.Definitions(
             schedules=[
                 dg.ScheduleDefinition(
                     name=self.name,
                     target=self.target,
                     tags=self.tags,
-                    cron_schedule=self.cron,
+                    cron_schedule=cron,
                 )
             ]
         )
+
+
+def _minutes(duration: str) -> int:
+    return math.ceil(parse_duration(duration) / 60)
+
+
+def parse_sla(value: str | int | None) -> int | None:
+    """``":45"`` / ``"45"`` / ``45`` → minute of the hour the data must be fresh by."""
+    if value is None:
+        return None
+    minute = int(str(value).strip().lstrip(":"))
+    if not 0 <= minute < 60:
+        raise ValueError(f"Invalid sla: {value!r} (minute of the hour, e.g. ':45')")
+    return minute
+
+
+def split_cron(cron: str) -> tuple[int | None, str]:
+    """(minute, remaining fields); minute is None unless it is a single number."""
+    minute, rest = cron.split(None, 1)
+    return (int(minute) if minute.isdigit() else None), rest
+
+
+def stagger_offset(key: str, slots: int) -> int:
+    """Deterministic offset in ``range(slots)`` from the hash of ``key``."""
+    digest = hashlib.sha256(key.encode()).digest()
+    return int.from_bytes(digest[:4], "big") % max(slots, 1)
+
+
+@dataclass(frozen=True)
+class ScheduleRequest:
+    """What the planner needs to place one tenant."""
+
+    key: str
+    cron: str
+    pools: tuple[str, ...]
+    duration_minutes: int
+    window_minutes: int
+    sla_minute: int | None = None
+    stagger: bool = False
+
+    def deadline(self) -> int | None:
+        """SLA as minutes after the top of the tick's hour (next hour if before the cron minute)."""
+        if self.sla_minute is None:
+            return None
+        minute = split_cron(self.cron)[0] or 0
+        return self.sla_minute if self.sla_minute > minute else self.sla_minute + 60
+
+    def offsets(self) -> list[int]:
+        """Start offsets (minutes after the cron minute) the tenant may use."""
+        minute, _ = split_cron(self.cron)
+        if minute is None or not self.stagger:
+            return [0]
+        if self.sla_minute is not None:
+            latest = self.deadline() - minute - self.duration_minutes
+        else:
+            latest = self.window_minutes - 1
+        # Stay within the hour so only the minute field changes
+        return list(range(0, max(0, min(latest, 59 - minute)) + 1))
+
+
+@dataclass(frozen=True)
+class PlannedSchedule:
+    """One row of the generated schedule table."""
+
+    tenant: str
+    base_cron: str
+    cron: str
+    offset_minutes: int
+    duration_minutes: int
+    finish_minute: int
+    sla_minute: int | None
+    sla_met: bool | None
+    peak_concurrency: int
+    pools: list[str]
+
+
+def _shift(cron: str, offset: int) -> str:
+    minute, rest = split_cron(cron)
+    return cron if minute is None or not offset else f"{minute + offset} {rest}"
+
+
+def fallback_cron(request: ScheduleRequest) -> str:
+    """Hash-offset cron for a tenant that is not in the generated plan."""
+    offsets = request.offsets()
+    return _shift(request.cron, offsets[stagger_offset(request.key, len(offsets))])
+
+
+def _busy_minutes(request: ScheduleRequest, offset: int) -> range:
+    start = (split_cron(request.cron)[0] or 0) + offset
+    return range(start, start + request.duration_minutes)
+
+
+def plan_schedules(requests: list[ScheduleRequest]) -> list[PlannedSchedule]:
+    """Pack tenants sharing a cron into start offsets that flatten per-pool load.
+
+    Tenants with the fewest allowed offsets (tight SLAs) are placed first,
+    then the longest running. Each takes the offset with the lowest peak of
+    concurrent runs on its pools, preferring its hash offset on ties.
+    """
+    groups: dict[str, list[ScheduleRequest]] = defaultdict(list)
+    for request in requests:
+        groups[split_cron(request.cron)[1]].append(request)
+
+    planned = []
+    for group in groups.values():
+        # (pool, minute after the top of the tick's hour) → concurrent runs
+        load: dict[tuple[str, int], int] = defaultdict(int)
+
+        def peak(request: ScheduleRequest, offset: int) -> int:
+            return max(
+                (load[(pool, m)] for pool in request.pools for m in _busy_minutes(request, offset)),
+                default=0,
+            )
+
+        placed: list[tuple[ScheduleRequest, int]] = []
+        group.sort(key=lambda r: (len(r.offsets()), -r.duration_minutes, r.key))
+        for request in group:
+            offsets = request.offsets()
+            preferred = offsets[stagger_offset(request.key, len(offsets))]
+            offset = min(offsets, key=lambda o: (peak(request, o), abs(o - preferred), o))
+            for pool in request.pools:
+                for m in _busy_minutes(request, offset):
+                    load[(pool, m)] += 1
+            placed.append((request, offset))
+
+        for request, offset in placed:
+            finish = _busy_minutes(request, offset).stop
+            planned.append(
+                PlannedSchedule(
+                    tenant=request.key,
+                    base_cron=request.cron,
+                    cron=_shift(request.cron, offset),
+                    offset_minutes=offset,
+                    duration_minutes=request.duration_minutes,
+                    finish_minute=finish,
+                    sla_minute=request.sla_minute,
+                    sla_met=None if request.sla_minute is None else finish <= request.deadline(),
+                    peak_concurrency=peak(request, offset),
+                    pools=list(request.pools),
+                )
+            )
+    return sorted(planned, key=lambda p: (p.base_cron, p.offset_minutes, p.tenant))
+
+
+def resolve_schedule_plan(config: dict | None) -> dict:
+    """Merge a tenant's ``schedule_plan:`` block over the defaults and validate it."""
+    resolved = {**DEFAULT_SCHEDULE_PLAN, **(config or {})}
+    parse_duration(resolved["window"])
+    parse_duration(resolved["duration"])
+    parse_sla(resolved["sla"])
+    return resolved
+
+
+def schedule_request(tenant: dict, duration_minutes: int | None = None) -> ScheduleRequest:
+    """Planner input for a tenant; ``duration_minutes`` overrides the configured estimate."""
+    config = resolve_schedule_plan(tenant.get("schedule_plan"))
+    return ScheduleRequest(
+        key=tenant["id"],
+        cron=tenant.get("schedule", DEFAULT_CRON),
+        pools=(
+            trino_pool(os.getenv("TRINO_HOST", "localhost"), os.getenv("TRINO_PORT", "8080")),
+            source_pool(tenant["source"]),
+        ),
+        duration_minutes=duration_minutes or _minutes(config["duration"]),
+        window_minutes=_minutes(config["window"]),
+        sla_minute=parse_sla(config["sla"]),
+        stagger=bool(config["stagger"]),
+    )
+
+
+@cache
+def load_schedule_plan(path: Path = SCHEDULE_PLAN_PATH) -> dict[str, dict]:
+    """Generated plan rows keyed by tenant, or empty when no plan was generated."""
+    if not path.exists():
+        return {}
+    rows = (yaml.safe_load(path.read_text(encoding="utf-8")) or {}).get("schedules") or []
+    return {row["tenant"]: row for row in rows}
+
+
+def resolve_tenant_cron(tenant: dict, path: Path = SCHEDULE_PLAN_PATH) -> str:
+    """The cron a tenant's schedules run on: its plan row, else its hash offset.
+
+    A plan row is ignored when the tenant's cron or window changed since the
+    plan was generated.
+    """
+    request = schedule_request(tenant)
+    row = load_schedule_plan(path).get(request.key)
+    if (
+        row is not None
+        and row["base_cron"] == request.cron
+        and row["offset_minutes"] in request.offsets()
+    ):
+        return row["cron"]
+    if row is not None:
+        logger.warning(
+            "[schedule] %s: plan in %s is stale, run `make plan-schedules`", request.key, path.name
+        )
+    return fallback_cron(request)
+
+
+def historical_duration_minutes(
+    instance: dg.DagsterInstance, tenant_id: str, cron: str, limit: int = 50
+) -> int | None:
+    """Median minutes from the first run start to the last materialization per cron tick.
+
+    Covers the tenant's input/staging/output assets over their last ``limit``
+    materializations; None without history.
+    """
+    keys = [
+        key
+        for key in instance.get_asset_keys(prefix=[tenant_id])
+        if len(key.path) > 1 and key.path[1] in ("input", "staging", "output")
+    ]
+    finished: dict[str, float] = {}
+    for key in keys:
+        result = instance.fetch_materializations(dg.AssetRecordsFilter(asset_key=key), limit=limit)
+        for record in result.records:
+            finished[record.run_id] = max(finished.get(record.run_id, 0.0), record.timestamp)
+    if not finished:
+        return None
+
+    spans: dict[float, tuple[float, float]] = {}
+    for run in instance.get_run_records(dg.RunsFilter(run_ids=list(finished))):
+        if run.start_time is None:
+            continue
+        tick = latest_cron_tick(cron, run.start_time + 1).timestamp()
+        start, end = spans.get(tick, (run.start_time, finished[run.dagster_run.run_id]))
+        spans[tick] = (
+            min(start, run.start_time),
+            max(end, finished[run.dagster_run.run_id]),
+        )
+    if not spans:
+        return None
+    return math.ceil(statistics.median(end - start for start, end in spans.values()) / 60)
+
+
+def schedule_table(planned: list[PlannedSchedule]) -> str:
+    """Markdown table of a plan."""
+    lines = [
+        "| tenant | base cron | cron | offset | duration | finish | sla | peak |",
+        "| --- | --- | --- | --- | --- | --- | --- | --- |",
+    ]
+    for p in planned:
+        sla = "-" if p.sla_minute is None else f":{p.sla_minute:02d} {'ok' if p.sla_met else 'MISS'}"
+        lines.append(
+            f"| {p.tenant} | `{p.base_cron}` | `{p.cron}` | +{p.offset_minutes}m "
+            f"| {p.duration_minutes}m | :{p.finish_minute % 60:02d} | {sla} | {p.peak_concurrency} |"
+        )
+    return "\n".join(lines)
+
+
+def dump_schedule_plan(planned: list[PlannedSchedule]) -> str:
+    """YAML content of ``config/schedule_plan.yaml``."""
+    header = "# AUTO-GENERATED by scripts/plan_schedules.py - DO NOT EDIT\n"
+    return header + yaml.dump(
+        {"schedules": [asdict(p) for p in planned]},
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+    )
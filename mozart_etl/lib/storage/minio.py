@@ -0,0 +1,440 @@
+"""MinIO / S3 object storage resource."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+import dagster as dg
+
+from mozart_etl.lib.memory import under_pressure
+from mozart_etl.lib.storage.parquet import resolve_parquet_layout, sort_row_group, writer_options
+from mozart_etl.lib.telemetry import run_in_context, span
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+MB = 1 << 20
+# S3 rejects multipart parts below 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * MB
+
+
+class S3Resource(dg.ConfigurableResource):
+    """S3-compatible storage resource for reading and writing Parquet files."""
+
+    endpoint_url: str = ""
+    access_key: str = ""
+    secret_key: str = ""
+    region: str = "us-east-1"
+    bucket: str = "warehouse"
+    verify_ssl: bool = True
+    # Local directory for spilled Parquet parts (default: the system temp dir)
+    spill_dir: str = ""
+    # Streamed Parquet files are uploaded as multipart parts of this size, N at a time
+    multipart_part_size_mb: int = 16
+    upload_concurrency: int = 4
+
+    def get_filesystem(self):
+        import s3fs
+
+        client_kwargs: dict = {"region_name": self.region, "verify": self.verify_ssl}
+        if self.endpoint_url:
+            client_kwargs["endpoint_url"] = self.endpoint_url
+        return s3fs.S3FileSystem(
+            key=self.access_key or None,
+            secret=self.secret_key or None,
+            client_kwargs=client_kwargs,
+        )
+
+    def _table_dir(self, prefix: str, table_name: str) -> str:
+        return f"{self.bucket}/{prefix.strip('/')}/{table_name}"
+
+    def _clear_dir(self, fs, table_dir: str):
+        """Remove files from a previous run so the directory holds one snapshot."""
+        if fs.exists(table_dir):
+            stale = fs.find(table_dir)
+            if stale:
+                logger.info("[S3] Removing %d stale file(s) under %s", len(stale), table_dir)
+                fs.rm(stale)
+
+    def write_parquet(
+        self, table: pa.Table, prefix: str, table_name: str, layout: dict | None = None
+    ) -> str:
+        """Write a PyArrow Table as Parquet and return its s3:// path."""
+        result = self.write_parquet_batches(
+            batches=table.to_batches(),
+            schema=table.schema,
+            prefix=prefix,
+            table_name=table_name,
+            layout=layout,
+        )
+        return result["s3_path"]
+
+    def upload_buffer_bytes(self) -> int:
+        """Bytes a stream writer buffers for uploads: the part being filled plus those in flight."""
+        part_size = max(self.multipart_part_size_mb * MB, MIN_PART_SIZE)
+        return part_size * (self.upload_concurrency + 1)
+
+    def open_parquet_stream(
+        self,
+        schema: pa.Schema,
+        prefix: str,
+        table_name: str,
+        layout: dict | None = None,
+        spill: bool = False,
+    ) -> ParquetStreamWriter:
+        """Start a :class:`ParquetStreamWriter` for the table's directory.
+
+        Any files from a previous run are removed first, since the directory
+        is used as an external location.
+
+        Args:
+            layout: Resolved options from :func:`resolve_parquet_layout`.
+            spill: Write each part to a local file under ``spill_dir`` and
+                upload it once complete, instead of uploading while encoding.
+        """
+        fs = self.get_filesystem()
+        table_dir = self._table_dir(prefix, table_name)
+        self._clear_dir(fs, table_dir)
+        spill_dir = None
+        if spill:
+            spill_dir = tempfile.mkdtemp(prefix="mozart_spill_", dir=self.spill_dir or None)
+        return ParquetStreamWriter(
+            fs, table_dir, schema, layout,
+            part_size=self.multipart_part_size_mb * MB,
+            upload_concurrency=self.upload_concurrency,
+            spill_dir=spill_dir,
+        )
+
+    def write_parquet_batches(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        schema: pa.Schema,
+        prefix: str,
+        table_name: str,
+        layout: dict | None = None,
+        spill: bool = False,
+    ) -> dict:
+        """Stream RecordBatches into Parquet files under the table's directory.
+
+        See :class:`ParquetStreamWriter` and :meth:`open_parquet_stream`.
+
+        Returns:
+            The writer's result (:meth:`ParquetStreamWriter.close`).
+        """
+        with self.open_parquet_stream(schema, prefix, table_name, layout, spill) as writer:
+            for batch in batches:
+                writer.write(batch)
+        return writer.result
+
+    def read_parquet(self, s3_path: str) -> pa.Table:
+        """Read a Parquet file or directory into a PyArrow Table."""
+        import pyarrow.parquet as pq
+
+        fs = self.get_filesystem()
+        return pq.read_table(s3_path.removeprefix("s3://"), filesystem=fs)
+
+
+class _MultipartUpload:
+    """Write-only file object that uploads what it receives as S3 multipart parts.
+
+    Every ``part_size`` bytes are submitted to ``pool`` as one part; ``slots``
+    bounds the parts in flight, so a writer waits (``s3.upload.wait``) once the
+    uploads fall behind. :meth:`close` submits the rest without waiting and
+    :meth:`complete` finishes the upload. An object smaller than one part is
+    uploaded with a single PUT.
+    """
+
+    def __init__(
+        self, fs, key: str, part_size: int, pool: ThreadPoolExecutor,
+        slots: threading.Semaphore,
+    ):
+        self.fs = fs
+        self.bucket, _, self.key = key.partition("/")
+        self.part_size = part_size
+        self.pool = pool
+        self.slots = slots
+        self.closed = False
+        self.aborted = False
+        self.size = 0
+        self.upload_id: str | None = None
+        self.parts: list[Future] = []
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self):
+        pass
+
+    def write(self, data) -> int:
+        if self.aborted:
+            # Late writes (e.g. a Parquet footer) after abort() are dropped
+            return len(data)
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit(self._upload_part, part)
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        data, self._buffer = bytes(self._buffer), bytearray()
+        if self.upload_id is None:
+            self._submit(self._put_object, data)
+        elif data:
+            self._submit(self._upload_part, data)
+
+    def _submit(self, upload, data: bytes):
+        # Fail fast instead of encoding the rest of the file after a part failed
+        for part in self.parts:
+            if part.done() and part.exception() is not None:
+                raise part.exception()
+        if upload == self._upload_part and self.upload_id is None:
+            self.upload_id = self.fs.call_s3(
+                "create_multipart_upload", Bucket=self.bucket, Key=self.key
+            )["UploadId"]
+        with span("s3.upload.wait"):
+            self.slots.acquire()
+        if self.started is None:
+            self.started = time.perf_counter()
+        future = self.pool.submit(run_in_context(upload), len(self.parts) + 1, data)
+        future.add_done_callback(lambda _: self.slots.release())
+        self.parts.append(future)
+
+    def _upload_part(self, number: int, data: bytes) -> dict:
+        with span("s3.upload") as stage:
+            response = self.fs.call_s3(
+                "upload_part", Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                PartNumber=number, Body=data,
+            )
+            stage.add(bytes=len(data))
+        self.finished = time.perf_counter()
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def _put_object(self, number: int, data: bytes) -> None:
+        with span("s3.upload") as stage:
+            self.fs.call_s3("put_object", Bucket=self.bucket, Key=self.key, Body=data)
+            stage.add(bytes=len(data))
+        self.finished = time.perf_counter()
+
+    def complete(self):
+        """Wait for the submitted parts and complete the multipart upload."""
+        parts = [part.result() for part in self.parts]
+        if self.upload_id is not None:
+            self.fs.call_s3(
+                "complete_multipart_upload", Bucket=self.bucket, Key=self.key,
+                UploadId=self.upload_id, MultipartUpload={"Parts": parts},
+            )
+
+    def abort(self):
+        """Drop queued parts and abort the multipart upload (best effort)."""
+        self.closed = self.aborted = True
+        self._buffer = bytearray()
+        for part in self.parts:
+            part.cancel()
+        wait(self.parts)
+        if self.upload_id is not None:
+            try:
+                self.fs.call_s3(
+                    "abort_multipart_upload", Bucket=self.bucket, Key=self.key,
+                    UploadId=self.upload_id,
+                )
+            except Exception as e:
+                logger.warning(
+                    "[S3] Could not abort upload of s3://%s/%s: %s", self.bucket, self.key, e
+                )
+
+
+class ParquetStreamWriter:
+    """Encodes a RecordBatch stream into Parquet files uploaded to S3 while it is written.
+
+    Batches are buffered one row group at a time (sorted by the layout's
+    ``sort_by`` columns within each row group), so memory use is bounded by
+    ``row_group_size``; a row group is also cut early while the memory monitor
+    reports pressure. Encoded bytes go out as S3 multipart parts on a pool of
+    ``upload_concurrency`` threads, so fetching, encoding and uploading
+    overlap. A new ``part-NNNNN.parquet`` file is started once the current one
+    reaches ``target_file_size``. With ``spill_dir`` each file is written to
+    local disk first and uploaded once complete.
+
+    Use as a context manager (uploads are aborted on error), or call
+    :meth:`close` / :meth:`abort`.
+    """
+
+    def __init__(
+        self,
+        fs,
+        table_dir: str,
+        schema: pa.Schema,
+        layout: dict | None = None,
+        part_size: int = 16 * MB,
+        upload_concurrency: int = 4,
+        spill_dir: str | None = None,
+    ):
+        self.fs = fs
+        self.table_dir = table_dir
+        self.schema = schema
+        self.layout = layout or resolve_parquet_layout(None)
+        self.options = writer_options(self.layout, schema)
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.spill_dir = spill_dir
+        self.files: list[str] = []
+        self.num_rows = self.arrow_bytes = self.bytes_written = 0
+        self.result: dict | None = None
+        self._pending: list[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._sink = self._writer = None
+        self._uploads: list[_MultipartUpload] = []
+        self._pool = ThreadPoolExecutor(upload_concurrency, thread_name_prefix="s3-upload")
+        self._slots = threading.BoundedSemaphore(upload_concurrency)
+
+    def __enter__(self) -> ParquetStreamWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _upload(self, key: str) -> _MultipartUpload:
+        upload = _MultipartUpload(self.fs, key, self.part_size, self._pool, self._slots)
+        self._uploads.append(upload)
+        return upload
+
+    def _open_file(self):
+        import pyarrow.parquet as pq
+
+        key = f"{self.table_dir}/part-{len(self.files):05d}.parquet"
+        self.files.append(key)
+        if self.spill_dir:
+            self._sink = open(os.path.join(self.spill_dir, key.rsplit("/", 1)[-1]), "wb")
+        else:
+            self._sink = self._upload(key)
+        self._writer = pq.ParquetWriter(self._sink, self.schema, **self.options)
+
+    def _close_file(self):
+        sink = self._sink
+        self._writer.close()
+        self.bytes_written += sink.tell()
+        sink.close()
+        self._sink = self._writer = None
+        if self.spill_dir:
+            upload = self._upload(self.files[-1])
+            with open(sink.name, "rb") as f:
+                while chunk := f.read(self.part_size):
+                    upload.write(chunk)
+            upload.close()
+            os.remove(sink.name)
+
+    def _flush(self):
+        import pyarrow as pa
+
+        # Includes waiting for upload slots when the uploads fall behind
+        with span("parquet.write") as stage:
+            if self._writer is None:
+                self._open_file()
+            written_before = self.bytes_written + self._sink.tell()
+            row_group = sort_row_group(
+                pa.Table.from_batches(self._pending, schema=self.schema), self.layout
+            )
+            self._writer.write_table(row_group, row_group_size=self.layout["row_group_size"])
+            stage.add(row_group.num_rows, self.bytes_written + self._sink.tell() - written_before)
+            self._pending, self._pending_rows = [], 0
+            target_file_size = self.layout["target_file_size"]
+            if target_file_size and self._sink.tell() >= target_file_size:
+                self._close_file()
+
+    def write(self, batch: pa.RecordBatch):
+        self.num_rows += batch.num_rows
+        self.arrow_bytes += batch.nbytes
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.layout["row_group_size"] or under_pressure():
+            self._flush()
+
+    def close(self) -> dict:
+        """Flush the last row group, wait for the uploads and return the write summary.
+
+        Returns:
+            Dict with ``s3_path`` (first file), ``files``, ``num_rows``,
+            ``bytes_written``, ``compression_ratio`` (Arrow bytes / Parquet
+            bytes), ``parts``, ``upload_seconds`` (first part submitted to
+            last part stored) and ``upload_bytes_per_second``.
+        """
+        try:
+            if self._pending or not self.files:
+                self._flush()
+            if self._writer is not None:
+                with span("parquet.write"):
+                    self._close_file()
+            with span("s3.upload.wait"):
+                for upload in self._uploads:
+                    upload.complete()
+        except BaseException:
+            self.abort()
+            raise
+        self._cleanup()
+        self.fs.invalidate_cache(self.table_dir)
+
+        started = [u.started for u in self._uploads if u.started is not None]
+        finished = [u.finished for u in self._uploads if u.finished is not None]
+        upload_seconds = max(finished) - min(started) if started and finished else 0.0
+        self.result = {
+            "s3_path": f"s3://{self.files[0]}",
+            "files": len(self.files),
+            "num_rows": self.num_rows,
+            "bytes_written": self.bytes_written,
+            "compression_ratio": (
+                round(self.arrow_bytes / self.bytes_written, 2) if self.bytes_written else 0.0
+            ),
+            "parts": sum(len(u.parts) for u in self._uploads),
+            "upload_seconds": round(upload_seconds, 3),
+            "upload_bytes_per_second": (
+                round(self.bytes_written / upload_seconds, 1) if upload_seconds else 0.0
+            ),
+        }
+        logger.info(
+            "[S3] Wrote %d rows to %d file(s) under s3://%s (%d bytes, ratio %.2f, %s, "
+            "%d part(s), %.1f MB/s upload)",
+            self.num_rows, len(self.files), self.table_dir, self.bytes_written,
+            self.result["compression_ratio"], self.layout["compression"],
+            self.result["parts"], self.result["upload_bytes_per_second"] / MB,
+        )
+        return self.result
+
+    def abort(self):
+        """Abort the uploads in progress and drop local spill files."""
+        for upload in self._uploads:
+            upload.abort()
+        if self._writer is not None:
+            with contextlib.suppress(Exception):
+                self._writer.close()
+            self._sink.close()
+            self._sink = self._writer = None
+        self._cleanup()
+
+    def _cleanup(self):
+        self._pool.shutdown(wait=True)
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
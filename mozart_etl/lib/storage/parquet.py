@@ -0,0 +1,103 @@
+"""Per-table Parquet layout options (tenant.yaml ``parquet:`` block)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+PARQUET_CODECS = ("snappy", "zstd", "gzip", "lz4", "brotli", "none")
+
+DEFAULT_LAYOUT = {
+    "compression": "snappy",
+    "compression_level": None,
+    "row_group_size": 128_000,
+    "use_dictionary": True,
+    "sort_by": [],
+    "target_file_size": None,
+}
+
+
+def resolve_parquet_layout(
+    options: dict | None,
+    primary_key: list[str] | None = None,
+    tenant_filter: str | None = None,
+) -> dict:
+    """Normalize a table's ``parquet:`` options into writer settings.
+
+    ``sort_by`` accepts ``primary_key``, ``tenant_filter`` or an explicit
+    column list; ``target_file_size_mb`` becomes ``target_file_size`` in bytes.
+    """
+    options = options or {}
+    layout = dict(DEFAULT_LAYOUT)
+
+    compression = str(options.get("compression", layout["compression"])).lower()
+    if compression not in PARQUET_CODECS:
+        raise ValueError(
+            f"Unsupported parquet compression: {compression}. Supported: {list(PARQUET_CODECS)}"
+        )
+    layout["compression"] = compression
+    layout["compression_level"] = options.get("compression_level")
+    layout["row_group_size"] = int(options.get("row_group_size", layout["row_group_size"]))
+
+    dictionary = options.get("dictionary_columns", True)
+    layout["use_dictionary"] = list(dictionary) if isinstance(dictionary, list) else bool(dictionary)
+
+    sort_by = options.get("sort_by") or []
+    if sort_by == "primary_key":
+        sort_by = list(primary_key or [])
+    elif sort_by == "tenant_filter":
+        sort_by = [tenant_filter] if tenant_filter else []
+    elif isinstance(sort_by, str):
+        sort_by = [sort_by]
+    layout["sort_by"] = list(sort_by)
+
+    if options.get("target_file_size_mb"):
+        layout["target_file_size"] = int(float(options["target_file_size_mb"]) * (1 << 20))
+    return layout
+
+
+def writer_options(layout: dict, schema: pa.Schema) -> dict:
+    """Keyword arguments for ``pq.ParquetWriter`` from a resolved layout."""
+    import pyarrow.parquet as pq
+
+    options: dict = {
+        "compression": None if layout["compression"] == "none" else layout["compression"],
+        "use_dictionary": layout["use_dictionary"],
+    }
+    if layout["compression_level"] is not None:
+        options["compression_level"] = int(layout["compression_level"])
+    sort_keys = _sort_keys(layout, schema)
+    if sort_keys:
+        options["sorting_columns"] = pq.SortingColumn.from_ordering(schema, sort_keys)
+    return options
+
+
+def _sort_keys(layout: dict, schema: pa.Schema) -> list[tuple[str, str]]:
+    return [(col, "ascending") for col in layout["sort_by"] if col in schema.names]
+
+
+def sort_row_group(table: pa.Table, layout: dict) -> pa.Table:
+    """Sort one row group's rows by the layout's sort columns."""
+    import pyarrow.compute as pc
+
+    sort_keys = _sort_keys(layout, table.schema)
+    if not sort_keys or table.num_rows < 2:
+        return table
+    return table.take(pc.sort_indices(table, sort_keys=sort_keys))
+
+
+def iceberg_table_properties(layout: dict) -> dict[str, str]:
+    """Equivalent Iceberg write properties, for tables written by PyIceberg."""
+    properties = {
+        "write.parquet.compression-codec": (
+            "uncompressed" if layout["compression"] == "none" else layout["compression"]
+        ),
+        "write.parquet.row-group-limit": str(layout["row_group_size"]),
+    }
+    if layout["compression_level"] is not None:
+        properties["write.parquet.compression-level"] = str(layout["compression_level"])
+    if layout["target_file_size"]:
+        properties["write.target-file-size-bytes"] = str(layout["target_file_size"])
+    return properties
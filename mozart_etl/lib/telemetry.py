@@ -0,0 +1,280 @@
+"""Lightweight stage timers for asset runs, with an optional OTLP/JSON file exporter.
+
+An asset activates a :class:`StageTracer`; library code then wraps its work in
+:func:`span` (a block) or :func:`timed_batches` (time spent producing each
+item of a stream). Both are no-ops when no tracer is active. A stage entered
+more than once accumulates, so interleaved streaming work (fetch a batch,
+convert it, write it, fetch the next) is reported per stage.
+
+Set ``MOZART_TRACE_FILE`` to also append each run's spans to a file in the
+OTLP/JSON format (one ``resourceSpans`` document per line), which the
+OpenTelemetry collector's ``otlpjsonfile`` receiver can ingest.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import dagster as dg
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[StageTracer | None] = contextvars.ContextVar(
+    "mozart_stage_tracer", default=None
+)
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def current_rss_mb() -> float | None:
+    """Current resident set size of this process in MB (Linux only, else None)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1 << 20), 1)
+
+
+@dataclass
+class Stage:
+    """Accumulated timing of one named stage."""
+
+    name: str
+    start_ns: int = 0
+    end_ns: int = 0
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+    bytes: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def add(self, rows: int = 0, bytes: int = 0):
+        self.rows += rows
+        self.bytes += bytes
+
+    def summary(self) -> dict:
+        per_second = self.seconds or None
+        return {
+            "stage": self.name,
+            "seconds": round(self.seconds, 3),
+            "calls": self.calls,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_second": round(self.rows / per_second) if per_second else None,
+            "bytes_per_second": round(self.bytes / per_second) if per_second else None,
+        }
+
+
+class StageTracer:
+    """Collects stage timings of one asset execution."""
+
+    def __init__(self, name: str, attributes: dict[str, Any] | None = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.stages: dict[str, Stage] = {}
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[StageTracer]:
+        """Make this the tracer :func:`span` and :func:`timed_batches` report to.
+
+        On exit the spans are exported (see :meth:`export`), also when the block failed.
+        """
+        token = _current.set(self)
+        try:
+            yield self
+        except BaseException as e:
+            self.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            _current.reset(token)
+            self.end_ns = time.time_ns()
+            self.export()
+
+    def _record(
+        self, name: str, start_ns: int, seconds: float,
+        rows: int = 0, bytes: int = 0, attributes: dict | None = None,
+    ):
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = Stage(name, start_ns=start_ns)
+            stage.end_ns = time.time_ns()
+            stage.seconds += seconds
+            stage.calls += 1
+            stage.add(rows, bytes)
+            stage.attributes.update(attributes or {})
+
+    @property
+    def wall_seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def metadata(self, rows: int = 0, bytes: int = 0) -> dict[str, dg.MetadataValue]:
+        """Asset metadata: wall time, throughput of ``rows`` / ``bytes``, peak RSS, stages."""
+        wall = self.wall_seconds
+        metadata = {
+            "wall_seconds": dg.MetadataValue.float(round(wall, 3)),
+            "rows_per_second": dg.MetadataValue.float(round(rows / wall, 1) if wall else 0.0),
+            "bytes_per_second": dg.MetadataValue.float(round(bytes / wall, 1) if wall else 0.0),
+            "stage_timings": dg.MetadataValue.json(
+                [stage.summary() for stage in self.stages.values()]
+            ),
+        }
+        rss = peak_rss_mb()
+        if rss is not None:
+            metadata["peak_rss_mb"] = dg.MetadataValue.float(rss)
+        return metadata
+
+    def export(self, path: str | None = None):
+        """Append the spans to ``path`` (default ``MOZART_TRACE_FILE``) as OTLP/JSON."""
+        path = path or os.getenv("MOZART_TRACE_FILE")
+        if not path:
+            return
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_otlp(), separators=(",", ":")) + "\n")
+        except OSError as e:
+            logger.warning("[telemetry] Could not write trace file %s: %s", path, e)
+
+    def to_otlp(self) -> dict:
+        """The tracer as one OTLP/JSON ``resourceSpans`` document (root span + one per stage)."""
+        trace_id = secrets.token_hex(16)
+        root_id = secrets.token_hex(8)
+        end_ns = self.end_ns or time.time_ns()
+        rss = peak_rss_mb()
+        spans = [
+            _otlp_span(
+                trace_id, root_id, None, self.name, self.start_ns, end_ns,
+                {**self.attributes, **({"process.peak_rss_mb": rss} if rss is not None else {})},
+            )
+        ]
+        for stage in self.stages.values():
+            spans.append(
+                _otlp_span(
+                    trace_id, secrets.token_hex(8), root_id, stage.name,
+                    stage.start_ns, stage.end_ns,
+                    {
+                        **stage.attributes,
+                        "busy_seconds": round(stage.seconds, 6),
+                        "calls": stage.calls,
+                        "rows": stage.rows,
+                        "bytes": stage.bytes,
+                    },
+                )
+            )
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": "mozart-etl"})},
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+                }
+            ]
+        }
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    def _value(value) -> dict:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    return [{"key": k, "value": _value(v)} for k, v in attributes.items() if v is not None]
+
+
+def _otlp_span(
+    trace_id: str, span_id: str, parent_id: str | None, name: str,
+    start_ns: int, end_ns: int, attributes: dict[str, Any],
+) -> dict:
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": _otlp_attributes(attributes),
+    }
+    if parent_id:
+        span["parentSpanId"] = parent_id
+    return span
+
+
+class _NoopStage:
+    def add(self, rows: int = 0, bytes: int = 0):
+        pass
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes) -> Iterator[Stage | _NoopStage]:
+    """Time a block as stage ``name`` of the active tracer; yields it for :meth:`Stage.add`."""
+    tracer = _current.get()
+    if tracer is None:
+        yield _NoopStage()
+        return
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+    stage = Stage(name)
+    try:
+        yield stage
+    finally:
+        tracer._record(
+            name, start_ns, time.perf_counter() - start, stage.rows, stage.bytes, attributes
+        )
+
+
+def timed_batches(name: str, batches: Iterable) -> Iterator:
+    """Yield from ``batches``, timing each ``next()`` as stage ``name``.
+
+    Items with ``num_rows`` / ``nbytes`` (Arrow batches) count towards the
+    stage's rows and bytes.
+    """
+    tracer = _current.get()
+    if tracer is None:
+        yield from batches
+        return
+    iterator = iter(batches)
+    while True:
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        tracer._record(
+            name, start_ns, time.perf_counter() - start,
+            getattr(item, "num_rows", 0), getattr(item, "nbytes", 0),
+        )
+        yield item
+
+
+def run_in_context(fn):
+    """Wrap ``fn`` to run in a copy of the caller's context (keeps the tracer in worker threads)."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
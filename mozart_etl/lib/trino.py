@@ -1,14 +1,197 @@
 """Trino query engine resource."""
 
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import tempfile
+import threading
+from collections.abc import Iterator, Sequence
 
 import dagster as dg
+from pydantic import PrivateAttr
+
+from mozart_etl.lib.telemetry import span
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 4
+DEFAULT_MAX_CONCURRENT_QUERIES = 4
+DEFAULT_SLOW_QUERY_SECONDS = 60.0
+# Rolling slow-query log: rotated at this size, keeping SLOW_QUERY_LOG_BACKUPS old files
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 3
+
+# cursor.stats (Trino StatementStats) fields kept per query
+_STAT_FIELDS = {
+    "elapsed_ms": "elapsedTimeMillis",
+    "queued_ms": "queuedTimeMillis",
+    "cpu_ms": "cpuTimeMillis",
+    "wall_ms": "wallTimeMillis",
+    "processed_rows": "processedRows",
+    "processed_bytes": "processedBytes",
+    "physical_input_bytes": "physicalInputBytes",
+    "peak_memory_bytes": "peakMemoryBytes",
+    "spilled_bytes": "spilledBytes",
+}
+# Summed per stage, except these which keep the maximum
+_MAX_FIELDS = ("peak_memory_bytes",)
+
+_CREATE_SCHEMA = re.compile(r"^\s*CREATE\s+SCHEMA\s+IF\s+NOT\s+EXISTS\s+([\w.\"]+)\s*$", re.I)
+
+# Schemas known to exist, keyed by cluster and user. Process-wide so every
+# resource copy (Dagster copies resources per step) shares it; a
+# SCHEMA_NOT_FOUND error clears the cluster's entries (dropped outside this process).
+_known_schemas: set[tuple[str, int, str, str]] = set()
+_known_schemas_lock = threading.Lock()
+_query_slots_lock = threading.Lock()
+
+_query_stats: contextvars.ContextVar["QueryStatsCollector | None"] = contextvars.ContextVar(
+    "mozart_trino_query_stats", default=None
+)
+_slow_query_loggers: dict[str, logging.Logger] = {}
+_slow_query_loggers_lock = threading.Lock()
+
+
+def _sql_preview(sql: str) -> str:
+    return sql.strip().replace("\n", " ")[:120]
+
+
+def _statement_stage(sql: str) -> str:
+    """Stage of a statement: ``bridge_create``, ``ctas``, ``merge``, ``optimize``, ..."""
+    text = " ".join(sql.split()).upper()
+    if text.startswith("CREATE TABLE"):
+        if " AS SELECT " in text:
+            return "ctas"
+        return "bridge_create" if "EXTERNAL_LOCATION" in text else "create_table"
+    if text.startswith("ALTER TABLE") and " EXECUTE " in text:
+        # Table procedures: optimize, expire_snapshots, remove_orphan_files
+        return text.split(" EXECUTE ", 1)[1].split("(", 1)[0].strip().lower()
+    words = text.split(None, 2)[:2]
+    if len(words) == 2 and words[0] in ("CREATE", "DROP", "ALTER"):
+        return f"{words[0].lower()}_{words[1].lower()}"
+    return words[0].lower() if words else "statement"
+
+
+def query_stats(cursor, stage: str, sql: str) -> dict:
+    """Stats of the cursor's finished query (query id, times in ms, rows, bytes, memory)."""
+    stats = cursor.stats or {}
+    return {
+        "query_id": stats.get("queryId") or cursor.query_id,
+        "stage": stage,
+        "state": stats.get("state"),
+        **{name: int(stats.get(field) or 0) for name, field in _STAT_FIELDS.items()},
+        "sql": _sql_preview(sql),
+    }
+
+
+class QueryStatsCollector:
+    """Aggregates the Trino query stats of one asset execution per stage.
+
+    Activated with :func:`collect_query_stats`; ``labels`` (tenant, asset)
+    are also written to the slow-query log.
+    """
+
+    def __init__(self, labels: dict[str, str] | None = None):
+        self.labels = labels or {}
+        self.stages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stats: dict):
+        with self._lock:
+            stage = self.stages.setdefault(
+                stats["stage"], {"queries": 0, **dict.fromkeys(_STAT_FIELDS, 0), "query_ids": []}
+            )
+            stage["queries"] += 1
+            for name in _STAT_FIELDS:
+                if name in _MAX_FIELDS:
+                    stage[name] = max(stage[name], stats[name])
+                else:
+                    stage[name] += stats[name]
+            if stats["query_id"]:
+                stage["query_ids"].append(stats["query_id"])
+
+    def metadata(self) -> dict[str, dg.MetadataValue]:
+        """``trino_query_stats`` keyed by stage, plus total elapsed / CPU seconds."""
+        if not self.stages:
+            return {}
+        return {
+            "trino_query_stats": dg.MetadataValue.json(self.stages),
+            "trino_elapsed_seconds": dg.MetadataValue.float(
+                sum(s["elapsed_ms"] for s in self.stages.values()) / 1000
+            ),
+            "trino_cpu_seconds": dg.MetadataValue.float(
+                sum(s["cpu_ms"] for s in self.stages.values()) / 1000
+            ),
+        }
+
+
+@contextlib.contextmanager
+def collect_query_stats(**labels: str) -> Iterator[QueryStatsCollector]:
+    """Collect the stats of every query this context (and threads it starts) runs."""
+    collector = QueryStatsCollector(labels)
+    token = _query_stats.set(collector)
+    try:
+        yield collector
+    finally:
+        _query_stats.reset(token)
+
+
+def _slow_query_logger(path: str) -> logging.Logger:
+    with _slow_query_loggers_lock:
+        slow_logger = _slow_query_loggers.get(path)
+        if slow_logger is None:
+            slow_logger = logging.getLogger(f"{__name__}.slow_queries.{len(_slow_query_loggers)}")
+            slow_logger.propagate = False
+            slow_logger.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                path,
+                maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=SLOW_QUERY_LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            slow_logger.addHandler(handler)
+            _slow_query_loggers[path] = slow_logger
+    return slow_logger
+
+
+class TrinoQuery:
+    """Handle for statements submitted with :meth:`TrinoResource.submit`.
+
+    ``state`` moves QUEUED → RUNNING → FINISHED/FAILED/CANCELLED. Awaiting
+    ``task`` yields the (column_names, rows) of the last statement; ``stats``
+    holds the :func:`query_stats` of each finished statement.
+    """
+
+    def __init__(self, statements: list[str], stage: str | None = None):
+        self.statements = statements
+        self.stage = stage
+        self.state = "QUEUED"
+        self.cursor = None
+        self.task: asyncio.Task | None = None
+        self.stats: list[dict] = []
+
+    @property
+    def query_id(self) -> str | None:
+        return self.cursor.query_id if self.cursor is not None else None
+
+    def done(self) -> bool:
+        return self.task is not None and self.task.done()
+
 
 class TrinoResource(dg.ConfigurableResource):
-    """Trino query engine resource for executing SQL queries."""
+    """Trino query engine resource for executing SQL queries.
+
+    Connections are pooled per resource instance: each keeps its HTTP session
+    (keep-alive) and Trino client session across statements, and is closed in
+    ``teardown_after_execution``.
+    """
 
     host: str = "localhost"
     port: int = 8080
@@ -16,6 +199,14 @@ class TrinoResource(dg.ConfigurableResource):
     schema_name: str = "default"
     user: str = "trino"
     http_scheme: str = "http"
+    pool_size: int = DEFAULT_POOL_SIZE
+    max_concurrent_queries: int = DEFAULT_MAX_CONCURRENT_QUERIES
+    # Queries at least this slow (elapsed) go to the slow-query log; 0 disables it
+    slow_query_seconds: float = DEFAULT_SLOW_QUERY_SECONDS
+    slow_query_log: str = ""
+
+    _idle: queue.LifoQueue = PrivateAttr(default_factory=queue.LifoQueue)
+    _query_slots: threading.BoundedSemaphore | None = PrivateAttr(default=None)
 
     def get_connection(self):
         from trino.dbapi import connect
@@ -29,28 +220,152 @@ class TrinoResource(dg.ConfigurableResource):
             http_scheme=self.http_scheme,
         )
 
-    def execute(self, sql: str, params=None) -> list:
-        sql_preview = sql.strip().replace("\n", " ")[:120]
-        logger.info("[Trino] execute: %s", sql_preview)
-        conn = self.get_connection()
+    @contextlib.contextmanager
+    def connection(self) -> Iterator:
+        """Borrow a pooled connection, opening one if none is idle.
+
+        A connection whose statement failed is discarded instead of reused.
+        """
         try:
-            cursor = conn.cursor()
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            logger.info("[Trino] execute: returned %d rows", len(rows))
-            return rows
-        finally:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self.get_connection()
+        try:
+            yield conn
+        except BaseException:
             conn.close()
+            raise
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def close_pool(self):
+        """Close every idle pooled connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def teardown_after_execution(self, context: dg.InitResourceContext) -> None:
+        self.close_pool()
+
+    def slow_query_log_path(self) -> str:
+        return self.slow_query_log or os.path.join(
+            os.getenv("DAGSTER_HOME") or tempfile.gettempdir(), "mozart_trino_slow_queries.jsonl"
+        )
+
+    def _record_stats(self, cursor, stage: str, sql: str) -> dict:
+        """Add the finished query's stats to the active collector and the slow-query log."""
+        stats = query_stats(cursor, stage, sql)
+        collector = _query_stats.get()
+        if collector is not None:
+            collector.add(stats)
+        elapsed = stats["elapsed_ms"] / 1000
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            logger.warning(
+                "[Trino] slow query %s (%s, %.1fs): %s",
+                stats["query_id"], stage, elapsed, stats["sql"],
+            )
+            entry = {
+                "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                **(collector.labels if collector is not None else {}),
+                **stats,
+            }
+            try:
+                _slow_query_logger(self.slow_query_log_path()).info(json.dumps(entry))
+            except OSError as e:
+                logger.warning("[Trino] Could not write slow-query log: %s", e)
+        return stats
+
+    def execute(self, sql: str, params=None) -> list:
+        logger.info("[Trino] execute: %s", _sql_preview(sql))
+        stage = _statement_stage(sql)
+        with self.connection() as conn, span(f"trino.{stage}", sql=_sql_preview(sql)):
+            cursor = conn.cursor()
+            with self._forget_schemas_on_missing():
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+        self._record_stats(cursor, stage, sql)
+        logger.info("[Trino] execute: returned %d rows", len(rows))
+        return rows
 
     def execute_ddl(self, sql: str):
-        sql_preview = sql.strip().replace("\n", " ")[:120]
-        logger.info("[Trino] DDL: %s", sql_preview)
-        conn = self.get_connection()
+        self.execute_script([sql])
+
+    def execute_script(self, statements: Sequence[str]):
+        """Run statements in order on one pooled session, stopping at the first error.
+
+        ``CREATE SCHEMA IF NOT EXISTS`` statements for schemas already created
+        by this process are skipped, until a statement fails with
+        ``SCHEMA_NOT_FOUND``.
+        """
+        with self.connection() as conn:
+            self._run_statements(conn.cursor(), statements)
+
+    def _run_statements(
+        self,
+        cursor,
+        statements: Sequence[str],
+        stage: str | None = None,
+        stats: list[dict] | None = None,
+    ) -> tuple[list[str], list]:
+        """Execute statements on ``cursor``, returning the last one's columns and rows.
+
+        ``stage`` overrides the stage derived from each statement; each
+        statement's stats are appended to ``stats`` if given.
+        """
+        columns, rows = [], []
+        for sql in statements:
+            schema_key = self._schema_key(sql)
+            if schema_key is not None and schema_key in _known_schemas:
+                logger.debug("[Trino] DDL skipped, schema exists: %s", schema_key[-1])
+                continue
+            logger.info("[Trino] SQL: %s", _sql_preview(sql))
+            statement_stage = stage or _statement_stage(sql)
+            with (
+                span(f"trino.{statement_stage}", sql=_sql_preview(sql)),
+                self._forget_schemas_on_missing(),
+            ):
+                cursor.execute(sql)
+                # Drain the result so the query completes before the next one
+                rows = cursor.fetchall()
+            statement_stats = self._record_stats(cursor, statement_stage, sql)
+            if stats is not None:
+                stats.append(statement_stats)
+            columns = [desc[0] for desc in cursor.description or []]
+            if schema_key is not None:
+                with _known_schemas_lock:
+                    _known_schemas.add(schema_key)
+        return columns, rows
+
+    def _schema_key(self, sql: str) -> tuple[str, int, str, str] | None:
+        match = _CREATE_SCHEMA.match(sql)
+        if match is None:
+            return None
+        return (self.host, self.port, self.user, match.group(1).lower())
+
+    @contextlib.contextmanager
+    def _forget_schemas_on_missing(self) -> Iterator[None]:
+        """Drop this cluster's known schemas when a statement hits a missing schema.
+
+        The next ``CREATE SCHEMA IF NOT EXISTS`` then runs again instead of
+        being skipped for the life of the process.
+        """
         try:
-            cursor = conn.cursor()
-            cursor.execute(sql)
-        finally:
-            conn.close()
+            yield
+        except Exception as e:
+            if getattr(e, "error_name", None) == "SCHEMA_NOT_FOUND":
+                cluster = (self.host, self.port, self.user)
+                with _known_schemas_lock:
+                    stale = {key for key in _known_schemas if key[:3] == cluster}
+                    _known_schemas.difference_update(stale)
+                if stale:
+                    logger.warning(
+                        "[Trino] Schema not found, forgetting %d cached schemas", len(stale)
+                    )
+            raise
 
     def query_preview(self, table_name: str, limit: int = 5) -> tuple[list[str], list[tuple]]:
         """Query sample rows with column names for UI preview.
@@ -59,13 +374,107 @@ class TrinoResource(dg.ConfigurableResource):
             (column_names, rows) tuple.
         """
         logger.info("[Trino] preview: SELECT * FROM %s LIMIT %d", table_name, limit)
-        conn = self.get_connection()
+        with self.connection() as conn:
+            columns, rows = self._run_statements(
+                conn.cursor(), [f"SELECT * FROM {table_name} LIMIT {limit}"], stage="preview"
+            )
+        logger.info("[Trino] preview: %d columns, %d rows", len(columns), len(rows))
+        return columns, rows
+
+    # -- asyncio surface -------------------------------------------------
+    # The trino client is blocking, so each submitted query runs on a worker
+    # thread with its own pooled session. At most ``max_concurrent_queries``
+    # run at once per resource; the rest wait in QUEUED state.
+
+    def _slots(self) -> threading.BoundedSemaphore:
+        with _query_slots_lock:
+            if self._query_slots is None:
+                self._query_slots = threading.BoundedSemaphore(self.max_concurrent_queries)
+        return self._query_slots
+
+    def _run_query(self, query: TrinoQuery) -> tuple[list[str], list]:
+        with self._slots():
+            if query.state == "CANCELLED":
+                raise asyncio.CancelledError()
+            query.state = "RUNNING"
+            try:
+                with self.connection() as conn:
+                    query.cursor = conn.cursor()
+                    result = self._run_statements(
+                        query.cursor, query.statements, query.stage, query.stats
+                    )
+            except BaseException:
+                if query.state != "CANCELLED":
+                    query.state = "FAILED"
+                raise
+            query.state = "FINISHED"
+            return result
+
+    def submit(self, sql: str | Sequence[str], stage: str | None = None) -> TrinoQuery:
+        """Start a statement (or a script run in order on one session) in the background.
+
+        Must be called from a running event loop.
+        """
+        query = TrinoQuery([sql] if isinstance(sql, str) else list(sql), stage)
+        query.task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(self._run_query, query)
+        )
+        return query
+
+    def poll(self, query: TrinoQuery) -> dict:
+        """Current state of a submitted query, with Trino progress once it is running."""
+        stats = (query.cursor.stats if query.cursor is not None else None) or {}
+        return {
+            "state": query.state,
+            "query_id": query.query_id,
+            "trino_state": stats.get("state"),
+            "progress": stats.get("progressPercentage"),
+        }
+
+    async def cancel(self, query: TrinoQuery):
+        """Cancel a submitted query on the coordinator and wait for its worker to stop."""
+        if query.done():
+            return
+        query.state = "CANCELLED"
+        if query.cursor is not None:
+            await asyncio.to_thread(query.cursor.cancel)
+        with contextlib.suppress(BaseException):
+            await query.task
+
+    async def gather(
+        self, statements: Sequence[str | Sequence[str]], return_exceptions: bool = False
+    ) -> list:
+        """Run independent statements (or scripts) concurrently, returning results in order.
+
+        Without ``return_exceptions`` the first failure cancels the rest.
+        """
+        return await self._gather([self.submit(sql) for sql in statements], return_exceptions)
+
+    async def _gather(self, queries: list[TrinoQuery], return_exceptions: bool) -> list:
         try:
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT * FROM {table_name} LIMIT {limit}")
-            columns = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            logger.info("[Trino] preview: %d columns, %d rows", len(columns), len(rows))
-            return columns, rows
-        finally:
-            conn.close()
+            return await asyncio.gather(
+                *(q.task for q in queries), return_exceptions=return_exceptions
+            )
+        except BaseException:
+            for query in queries:
+                await self.cancel(query)
+            raise
+
+    async def query_previews(
+        self,
+        table_names: Sequence[str],
+        limit: int = 5,
+        stats: dict[str, list[dict]] | None = None,
+    ) -> dict[str, tuple[list[str], list[tuple]] | BaseException]:
+        """Concurrent :meth:`query_preview` for several relations; failures are returned.
+
+        Each relation's query stats are stored in ``stats`` if given.
+        """
+        queries = [
+            self.submit(f"SELECT * FROM {name} LIMIT {limit}", stage="preview")
+            for name in table_names
+        ]
+        results = await self._gather(queries, return_exceptions=True)
+        if stats is not None:
+            stats.update((name, query.stats) for name, query in zip(table_names, queries))
+        return dict(zip(table_names, results))
@@ -0,0 +1,138 @@
+"""High-water-mark tracking for incremental extraction.
+
+Watermarks are stored on the extract asset's own materializations, so they
+live in the Dagster instance's event log and are shared by every code-location
+process. The asset key ``[tenant_id, "input", table]`` is the (tenant, table) key.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+
+import dagster as dg
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_METADATA_KEY = "incremental_watermark"
+PREVIOUS_WATERMARK_METADATA_KEY = "incremental_watermark_previous"
+# Raw-table watermarks a dbt model materialization has consumed ({table: watermark})
+CONSUMED_WATERMARKS_METADATA_KEY = "raw_watermarks"
+# Env var carrying those watermarks into dbt (JSON), read by the raw_incremental_filter macro
+RAW_WATERMARKS_ENV = "MOZART_RAW_WATERMARKS"
+
+# Run tag that ignores stored watermarks and reloads everything
+FULL_REFRESH_TAG = "mozart/full_refresh"
+
+
+def is_full_refresh(context: dg.AssetExecutionContext) -> bool:
+    return context.run.tags.get(FULL_REFRESH_TAG, "").lower() == "true"
+
+
+def _min_watermark(a: str, b: str) -> str:
+    """The older of two serialized watermarks (numeric or ISO timestamp)."""
+    try:
+        return a if float(a) <= float(b) else b
+    except ValueError:
+        return min(a, b)
+
+
+def _serialize(value) -> str:
+    """Render a column value as a bind-friendly string."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class WatermarkStore:
+    """Reads watermarks recorded on extract asset materializations."""
+
+    def __init__(self, instance: dg.DagsterInstance):
+        self._instance = instance
+
+    @staticmethod
+    def asset_key(tenant_id: str, table_name: str) -> dg.AssetKey:
+        return dg.AssetKey([tenant_id, "input", table_name])
+
+    def get(self, tenant_id: str, table_name: str) -> str | None:
+        """Return the last recorded watermark for a tenant table, if any."""
+        event = self._instance.get_latest_materialization_event(
+            self.asset_key(tenant_id, table_name)
+        )
+        if event is None or event.asset_materialization is None:
+            return None
+        value = event.asset_materialization.metadata.get(WATERMARK_METADATA_KEY)
+        return value.value if value is not None else None
+
+    def get_consumed(self, asset_keys) -> dict[str, str]:
+        """Oldest raw-table watermarks consumed by the last materializations of ``asset_keys``.
+
+        A table missing from any asset's record is left out, so the models
+        reading it reprocess every row (the merge makes that idempotent).
+        """
+        consumed: dict[str, str] | None = None
+        for key in asset_keys:
+            event = self._instance.get_latest_materialization_event(key)
+            value = None
+            if event is not None and event.asset_materialization is not None:
+                value = event.asset_materialization.metadata.get(CONSUMED_WATERMARKS_METADATA_KEY)
+            recorded = value.value if value is not None else {}
+            if consumed is None:
+                consumed = dict(recorded)
+            else:
+                consumed = {
+                    table: _min_watermark(watermark, recorded[table])
+                    for table, watermark in consumed.items()
+                    if table in recorded
+                }
+        return consumed or {}
+
+    @staticmethod
+    def to_metadata(watermark: str | None, previous: str | None) -> dict:
+        """Metadata entries that persist ``watermark`` for the next run."""
+        metadata = {}
+        if watermark is not None:
+            metadata[WATERMARK_METADATA_KEY] = dg.MetadataValue.text(watermark)
+        if previous is not None:
+            metadata[PREVIOUS_WATERMARK_METADATA_KEY] = dg.MetadataValue.text(previous)
+        return metadata
+
+    @staticmethod
+    def to_data_version(watermark: str | None) -> dg.DataVersion | None:
+        """Data version for a load that reached ``watermark``.
+
+        An empty delta keeps the watermark and so the data version, which the
+        dbt automation conditions do not treat as an update.
+        """
+        return dg.DataVersion(f"wm:{watermark}") if watermark is not None else None
+
+
+class WatermarkTracker:
+    """Keeps the running maximum of the incremental column over a batch stream."""
+
+    def __init__(self, column: str, start: str | None = None):
+        self.column = column
+        self.start = start
+        self._max = None
+
+    def observe(self, batch: pa.RecordBatch):
+        import pyarrow.compute as pc
+
+        if batch.num_rows == 0 or self.column not in batch.schema.names:
+            return
+        batch_max = pc.max(batch.column(self.column)).as_py()
+        if batch_max is not None and (self._max is None or batch_max > self._max):
+            self._max = batch_max
+
+    @property
+    def watermark(self) -> str | None:
+        """The new watermark, or the starting one if no newer rows were seen."""
+        if self._max is None:
+            return self.start
+        return _serialize(self._max)
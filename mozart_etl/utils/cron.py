@@ -0,0 +1,14 @@
+"""Cron tick helpers built on ``croniter``."""
+
+import datetime
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+
+
+def latest_cron_tick(cron: str, timestamp: float, timezone: str = "UTC") -> datetime.datetime:
+    """Latest tick of ``cron`` at or before ``timestamp``, in ``timezone``."""
+    moment = datetime.datetime.fromtimestamp(timestamp, tz=ZoneInfo(timezone))
+    if moment.second == 0 and moment.microsecond == 0 and croniter.match(cron, moment):
+        return moment
+    return croniter(cron, moment).get_prev(datetime.datetime)
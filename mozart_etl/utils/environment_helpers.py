@@ -21,3 +21,32 @@ def get_dbt_target() -> str:
     if env == "PROD":
         return "prod"
     return os.getenv("DBT_TARGET", "dev")
+
+
+# shared: one dbt project/manifest for all tenants (default)
+# per_tenant: generated project per tenant (mozart_etl_dbt_transform/tenants/{tid}),
+#             each with its own target/ (manifest.json, partial_parse.msgpack)
+DBT_PROJECT_MODES = ("shared", "per_tenant")
+
+
+def get_dbt_project_mode() -> str:
+    mode = os.getenv("DBT_PROJECT_MODE", "shared")
+    if mode not in DBT_PROJECT_MODES:
+        raise ValueError(
+            f"Unsupported DBT_PROJECT_MODE: {mode}. Supported: {list(DBT_PROJECT_MODES)}"
+        )
+    return mode
+
+
+# per_tenant: one code location (process) per tenant (default)
+# consolidated: every tenant in one code location (mozart_etl.code_locations.multi_tenant)
+CODE_LOCATION_MODES = ("per_tenant", "consolidated")
+
+
+def get_code_location_mode() -> str:
+    mode = os.getenv("CODE_LOCATION_MODE", "per_tenant")
+    if mode not in CODE_LOCATION_MODES:
+        raise ValueError(
+            f"Unsupported CODE_LOCATION_MODE: {mode}. Supported: {list(CODE_LOCATION_MODES)}"
+        )
+    return mode
@@ -0,0 +1,26 @@
+"""Size and duration strings used across tenant.yaml blocks (``"128MB"``, ``"7d"``)."""
+
+import re
+
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(B|KB|MB|GB|TB)?\s*$", re.I)
+_SIZE_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30, "TB": 1 << 40}
+_DURATION = re.compile(r"^\s*(\d+)\s*(s|m|h|d)\s*$", re.I)
+_DURATION_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_size(value: str | int) -> int:
+    """``"128MB"`` → bytes."""
+    if isinstance(value, int):
+        return value
+    match = _SIZE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[(match.group(2) or "B").upper()])
+
+
+def parse_duration(value: str) -> int:
+    """``"7d"`` → seconds."""
+    match = _DURATION.match(value)
+    if match is None:
+        raise ValueError(f"Invalid duration: {value!r} (e.g. 12h, 7d)")
+    return int(match.group(1)) * _DURATION_SECONDS[match.group(2).lower()]
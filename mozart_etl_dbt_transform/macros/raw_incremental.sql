@@ -0,0 +1,52 @@
+{#
+    tenant.yaml 의 primary_key / incremental_column 기반 incremental(merge) 설정.
+    Dagster(tenant_dbt_transform)가 --vars 로 전달:
+      raw_tables:     {<table>: {primary_key: [...], incremental_column: <col>}}  (mode: incremental 테이블만)
+    실행마다 바뀌는 watermark 는 partial parse 가 유지되도록 --vars 대신 환경변수(JSON)로 전달:
+      MOZART_RAW_WATERMARKS: {<table>: '<직전 dbt 실행이 반영한 추출 watermark>'}
+    raw_tables 에 없는 테이블(full 적재)이나 vars 없이 parse 할 때는 table 로 materialize.
+    run tag mozart/full_refresh=true 이면 --full-refresh 로 전체 재빌드 (삭제 반영 포함).
+
+    사용 예:
+      {{ config(schema=var('tenant_id'), **raw_incremental_config('cfg_item_master')) }}
+      ... FROM {{ source(...) }} WHERE 1 = 1 {{ raw_incremental_filter('cfg_item_master') }}
+#}
+{% macro raw_incremental_config(table_name, unique_key=none) -%}
+    {%- set table = var('raw_tables', {}).get(table_name) -%}
+    {%- if not table or not table.get('incremental_column') -%}
+        {{ return({'materialized': 'table'}) }}
+    {%- endif -%}
+    {{ return({
+        'materialized': 'incremental',
+        'incremental_strategy': 'merge',
+        'unique_key': unique_key if unique_key is not none else table['primary_key'],
+        'on_schema_change': 'append_new_columns',
+    }) }}
+{%- endmacro %}
+
+
+{# source 기반 모델: 직전 dbt 실행 이후 raw 에 적재된 행만 선택 #}
+{% macro raw_incremental_filter(table_name) -%}
+    {%- set table = var('raw_tables', {}).get(table_name, {}) -%}
+    {#- execute 단계에서만 읽어 parse 시 env_var 의존성으로 기록되지 않게 함 -#}
+    {%- set watermarks = fromjson(env_var('MOZART_RAW_WATERMARKS', '{}')) if execute else {} -%}
+    {%- set watermark = watermarks.get(table_name) -%}
+    {%- if is_incremental() and table.get('incremental_column') and watermark is not none -%}
+        {%- if (watermark | string).replace('.', '', 1).isdigit() -%}
+            AND {{ table['incremental_column'] }} > {{ watermark }}
+        {%- else -%}
+            AND {{ table['incremental_column'] }} > TIMESTAMP '{{ watermark }}'
+        {%- endif -%}
+    {%- endif -%}
+{%- endmacro %}
+
+
+{# ref 기반 모델(mart): 대상 테이블의 최대값 이후 갱신된 행만 선택 #}
+{% macro this_incremental_filter(column, this_column=none) -%}
+    {%- if is_incremental() -%}
+        AND (
+            {{ column }} > (SELECT max({{ this_column or column }}) FROM {{ this }})
+            OR NOT EXISTS (SELECT 1 FROM {{ this }})
+        )
+    {%- endif -%}
+{%- endmacro %}
@@ -0,0 +1,17 @@
+{#
+    tenant.yaml 의 raw 테이블 partitioning / sorted_by 를 dbt-trino properties 로 변환.
+    Dagster가 --vars 의 table_layouts 로 전달하며, 레이아웃이 없으면 none (WITH 절 생략).
+
+    사용 예: {{ config(properties=raw_table_properties('cfg_demand')) }}
+#}
+{% macro raw_table_properties(table_name) -%}
+    {%- set layout = var('table_layouts', {}).get(table_name, {}) -%}
+    {%- set properties = {} -%}
+    {%- if layout.get('partitioning') -%}
+        {%- do properties.update({'partitioning': "ARRAY['" ~ layout['partitioning'] | join("', '") ~ "']"}) -%}
+    {%- endif -%}
+    {%- if layout.get('sorted_by') -%}
+        {%- do properties.update({'sorted_by': "ARRAY['" ~ layout['sorted_by'] | join("', '") ~ "']"}) -%}
+    {%- endif -%}
+    {{ return(properties if properties else none) }}
+{%- endmacro %}
@@ -1,7 +1,8 @@
 {{ config(
     materialized='table',
     schema=var('tenant_id', 'project_01'),
-    alias='mart_odv_demand'
+    alias='mart_odv_demand',
+    properties=raw_table_properties('cfg_demand')
 ) }}
 
 /*
@@ -1,6 +1,6 @@
 {{ config(
-    materialized='table',
-    schema=var('tenant_id', 'project_01')
+    schema=var('tenant_id', 'project_01'),
+    **raw_incremental_config('cfg_item_master')
 ) }}
 
 /*
@@ -16,9 +16,11 @@
 
 WITH source AS (
     SELECT * FROM {{ source('project_01_raw', 'cfg_item_master') }}
+    WHERE 1 = 1
     {% if var('project_id', none) is not none %}
-    WHERE project_id = '{{ var("project_id") }}'
+        AND project_id = '{{ var("project_id") }}'
     {% endif %}
+        {{ raw_incremental_filter('cfg_item_master') }}
 ),
 
 transformed AS (
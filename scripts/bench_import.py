@@ -0,0 +1,106 @@
+"""Code location 콜드 import 벤치마크: 로케이션별 import + Definitions 로딩 시간과 RSS 측정.
+
+각 로케이션을 새 Python 프로세스에서 --repeat 회 import 하고 중앙값을 출력합니다.
+무거운 data-plane 모듈(pyarrow, pandas, DB 드라이버)이 로딩 시점에 import 되면 함께 표시합니다.
+
+Usage:
+    python scripts/bench_import.py                          # workspace.yaml 의 전체 로케이션
+    python scripts/bench_import.py -m mozart_etl.code_locations.project_01
+    python scripts/bench_import.py --json bench.json        # 결과 저장
+    python scripts/bench_import.py --max-seconds 5 --max-rss-mb 400   # CI: 초과 시 exit 1
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+WORKSPACE_PATH = PROJECT_ROOT / "workspace.yaml"
+
+# 정의 로딩에 필요 없는 모듈 (로딩 시 import 되면 회귀)
+DATA_PLANE_MODULES = ("pyarrow", "pandas", "tabulate", "sqlalchemy", "psycopg2", "oracledb", "s3fs")
+
+PROBE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+module.defs.get_repository_def()
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "data_plane": [m for m in sys.argv[2].split(",") if m in sys.modules],
+}))
+"""
+
+
+def workspace_modules() -> list[str]:
+    workspace = yaml.safe_load(WORKSPACE_PATH.read_text(encoding="utf-8"))
+    return [entry["python_module"]["module_name"] for entry in workspace.get("load_from", [])]
+
+
+def measure(module_name: str) -> dict:
+    """Import one code location in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, module_name, ",".join(DATA_PLANE_MODULES)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench(module_name: str, repeat: int) -> dict:
+    runs = [measure(module_name) for _ in range(repeat)]
+    return {
+        "module": module_name,
+        "seconds": round(statistics.median(r["seconds"] for r in runs), 3),
+        "rss_mb": round(statistics.median(r["rss_mb"] for r in runs), 1),
+        "data_plane": runs[-1]["data_plane"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark code location cold import")
+    parser.add_argument("-m", "--module", action="append", help="Module(s) to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module (median)")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--max-seconds", type=float, help="Fail if any location is slower")
+    parser.add_argument("--max-rss-mb", type=float, help="Fail if any location uses more RSS")
+    args = parser.parse_args()
+
+    results = [bench(name, args.repeat) for name in args.module or workspace_modules()]
+
+    print(f"{'code location':<50} {'import (s)':>10} {'RSS (MB)':>9}  data-plane imports")
+    for r in results:
+        print(
+            f"{r['module']:<50} {r['seconds']:>10.3f} {r['rss_mb']:>9.1f}  "
+            f"{', '.join(r['data_plane']) or '-'}"
+        )
+    print(
+        f"{'total':<50} {sum(r['seconds'] for r in results):>10.3f} "
+        f"{sum(r['rss_mb'] for r in results):>9.1f}"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    failed = [
+        r["module"]
+        for r in results
+        if (args.max_seconds and r["seconds"] > args.max_seconds)
+        or (args.max_rss_mb and r["rss_mb"] > args.max_rss_mb)
+    ]
+    if failed:
+        print(f"Over budget: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,567 @@
+"""추출/적재 오프라인 벤치마크: 합성 테넌트 데이터로 추출, Parquet 쓰기, 타입 매핑 처리량 측정.
+
+- 데이터: cfg_item_master / cfg_demand / cfg_bom_master 합성 행 (--rows 행, --width 개 추가 VARCHAR 컬럼)
+- 소스: SQLite 파일(기본, .benchmarks/data 에 캐시) 또는 docker-compose 의 postgres-sample
+  (--source postgres, 접속 정보는 BENCH_PG_HOST/PORT/DATABASE/USER/PASSWORD, mozart_bench 스키마 사용)
+- S3: 로컬 moto 서버(기본, `pip install -e .[bench]`) 또는 S3_ENDPOINT_URL 의 MinIO (--s3 endpoint)
+- 측정: BaseConnector.extract_table, S3Resource.write_parquet, _build_column_defs
+- 케이스마다 새 Python 프로세스에서 --repeat 회 실행해 중앙값 기록. 메모리는 측정 구간의 RSS 증가분 최대값
+
+결과는 .benchmarks/{commit}.json (또는 --json) 에 저장되며, compare 는 두 결과를 비교해
+처리량 감소 / 메모리 / 출력 크기 증가가 --threshold 를 넘으면 exit 1 합니다.
+
+Usage:
+    python scripts/benchmark.py run                                 # 기본 100,000 행
+    python scripts/benchmark.py run --rows 1000000 --width 20
+    python scripts/benchmark.py run --source postgres --s3 endpoint  # docker compose up 필요
+    python scripts/benchmark.py compare 1a2b3c4 5d6e7f8   # .benchmarks/{commit}.json 또는 파일 경로
+    python scripts/benchmark.py compare base.json new.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+BENCH_DIR = PROJECT_ROOT / ".benchmarks"
+
+PROJECT_ID = "EED70012-E49D-4BA5-AD05-870C338DF39A"
+BASE_TIME = datetime.datetime(2024, 1, 1)
+
+CASES = ("extract", "write_parquet", "column_defs")
+# _build_column_defs 는 마이크로초 단위라 반복 실행해 측정
+COLUMN_DEFS_ITERATIONS = 2_000
+INSERT_CHUNK_ROWS = 50_000
+# RSS 샘플링 지터보다 작은 메모리 증가는 회귀로 보지 않음
+MEMORY_NOISE_MB = 8.0
+
+# 테이블별 (컬럼, SQL 타입, 값 생성 함수)
+TABLES = {
+    "cfg_item_master": [
+        ("project_id", "VARCHAR(40)", lambda i: PROJECT_ID),
+        ("item_id", "VARCHAR(40)", lambda i: f"ITEM{i:09d}"),
+        ("item_type", "VARCHAR(20)", lambda i: ("FG", "SFG", "RM")[i % 3]),
+        ("item_name", "VARCHAR(100)", lambda i: f"item name {i}"),
+        ("item_group_id", "VARCHAR(40)", lambda i: f"GRP{i % 100:04d}"),
+        ("item_priority", "INTEGER", lambda i: i % 10),
+        ("item_spec", "VARCHAR(200)", lambda i: f"spec-{i}" if i % 7 == 0 else None),
+        ("update_datetime", "TIMESTAMP", lambda i: BASE_TIME + datetime.timedelta(minutes=i)),
+    ],
+    "cfg_demand": [
+        ("project_id", "VARCHAR(40)", lambda i: PROJECT_ID),
+        ("demand_ver", "VARCHAR(20)", lambda i: f"V{i % 4}"),
+        ("demand_id", "VARCHAR(40)", lambda i: f"DMD{i:09d}"),
+        ("item_id", "VARCHAR(40)", lambda i: f"ITEM{i % 10_000:09d}"),
+        ("site_id", "VARCHAR(20)", lambda i: f"SITE{i % 8}"),
+        ("due_date", "DATE", lambda i: BASE_TIME.date() + datetime.timedelta(days=i % 365)),
+        ("demand_qty", "NUMERIC(18, 4)", lambda i: Decimal(i % 100_000) / 4),
+        ("demand_priority", "INTEGER", lambda i: i % 5),
+        ("cust_id", "VARCHAR(40)", lambda i: f"CUST{i % 500:05d}"),
+    ],
+    "cfg_bom_master": [
+        ("project_id", "VARCHAR(40)", lambda i: PROJECT_ID),
+        ("bom_id", "VARCHAR(40)", lambda i: f"BOM{i:09d}"),
+        ("bom_type", "VARCHAR(20)", lambda i: ("STD", "ALT")[i % 2]),
+        ("bom_priority", "INTEGER", lambda i: i % 3),
+        ("eff_start_datetime", "TIMESTAMP", lambda i: BASE_TIME),
+        ("eff_end_datetime", "TIMESTAMP", lambda i: BASE_TIME + datetime.timedelta(days=3650)),
+        ("demand_item_id", "VARCHAR(40)", lambda i: f"ITEM{i % 10_000:09d}"),
+        ("deleted_yn", "VARCHAR(1)", lambda i: "Y" if i % 50 == 0 else "N"),
+    ],
+}
+
+
+# ---------------------------------------------------------------------------
+# 합성 소스 데이터
+# ---------------------------------------------------------------------------
+
+
+def table_columns(table: str, width: int) -> list[tuple]:
+    extra = [
+        (f"attr_{j:02d}", "VARCHAR(32)", lambda i, j=j: f"attr{j}-{i % 1000}")
+        for j in range(1, width + 1)
+    ]
+    return TABLES[table] + extra
+
+
+def _sqlite_value(value):
+    # sqlite3 의 datetime / Decimal 기본 adapter 는 없거나 deprecated
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _insert_rows(raw, dialect: str, qualified: str, columns: list[tuple], rows: int):
+    cursor = raw.cursor()
+    for start in range(0, rows, INSERT_CHUNK_ROWS):
+        chunk = [
+            tuple(fn(i) for _, _, fn in columns)
+            for i in range(start, min(start + INSERT_CHUNK_ROWS, rows))
+        ]
+        if dialect == "postgresql":
+            from psycopg2.extras import execute_values
+
+            execute_values(cursor, f"INSERT INTO {qualified} VALUES %s", chunk, page_size=5_000)
+        else:
+            placeholders = ", ".join("?" * len(columns))
+            cursor.executemany(
+                f"INSERT INTO {qualified} VALUES ({placeholders})",
+                [tuple(_sqlite_value(v) for v in row) for row in chunk],
+            )
+    raw.commit()
+
+
+def postgres_config() -> dict:
+    """docker-compose postgres-sample 기본값 (BENCH_PG_* 로 override)."""
+    return {
+        "type": "postgresql",
+        "host": os.getenv("BENCH_PG_HOST", "localhost"),
+        "port": int(os.getenv("BENCH_PG_PORT", "5433")),
+        "database": os.getenv("BENCH_PG_DATABASE", "sample_tenant"),
+        "username": os.getenv("BENCH_PG_USER", "dev"),
+        "password": os.getenv("BENCH_PG_PASSWORD", "dev"),
+    }
+
+
+def prepare_source(source: str, rows: int, width: int) -> dict:
+    """Create the synthetic tables and return the source spec for the measure processes."""
+    if source == "sqlite":
+        path = BENCH_DIR / "data" / f"source_{rows}x{width}.sqlite"
+        spec = {"type": "sqlite", "path": str(path), "schema": "main"}
+        if path.exists():
+            print(f"[bench] Reusing {path.relative_to(PROJECT_ROOT)}")
+            return spec
+        path.parent.mkdir(parents=True, exist_ok=True)
+        import sqlite3
+
+        raw = sqlite3.connect(path.with_suffix(".tmp"))
+        dialect = "sqlite"
+    else:
+        spec = {**postgres_config(), "schema": "mozart_bench"}
+        raw = create_source_connector(spec).get_engine().raw_connection()
+        dialect = "postgresql"
+
+    try:
+        cursor = raw.cursor()
+        if dialect == "postgresql":
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {spec['schema']}")
+        for table in TABLES:
+            columns = table_columns(table, width)
+            qualified = f"{spec['schema']}.{table}"
+            print(f"[bench] Generating {rows:,} rows x {len(columns)} columns into {qualified}")
+            cursor.execute(f"DROP TABLE IF EXISTS {qualified}")
+            cursor.execute(
+                f"CREATE TABLE {qualified} ("
+                + ", ".join(f"{name} {sql_type}" for name, sql_type, _ in columns)
+                + ")"
+            )
+            _insert_rows(raw, dialect, qualified, columns, rows)
+    finally:
+        raw.close()
+    if dialect == "sqlite":
+        path.with_suffix(".tmp").rename(path)
+    return spec
+
+
+def create_source_connector(spec: dict):
+    from mozart_etl.lib.extract.connectors import create_connector
+    from mozart_etl.lib.extract.connectors.base import BaseConnector
+
+    class SQLiteConnector(BaseConnector):
+        """Benchmark-only source; SQLite has no native export path."""
+
+        def get_connection_url(self) -> str:
+            return f"sqlite:///{self.config['path']}"
+
+    if spec["type"] == "sqlite":
+        return SQLiteConnector(spec)
+    return create_connector({k: v for k, v in spec.items() if k != "schema"})
+
+
+# ---------------------------------------------------------------------------
+# S3 stand-in
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def s3_target(mode: str):
+    """Yield S3Resource kwargs: a local moto server, or the S3_ENDPOINT_URL (MinIO) config."""
+    if mode == "endpoint":
+        yield {
+            "endpoint_url": os.getenv("S3_ENDPOINT_URL", "http://localhost:9000"),
+            "access_key": os.getenv("AWS_ACCESS_KEY_ID", ""),
+            "secret_key": os.getenv("AWS_SECRET_ACCESS_KEY", ""),
+            "region": os.getenv("AWS_REGION", "us-east-1"),
+            "bucket": os.getenv("S3_BUCKET_NAME", "warehouse"),
+        }
+        return
+
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        sys.exit("moto is not installed: pip install -e .[bench] (or use --s3 endpoint)")
+    import boto3
+
+    # moto 서버의 요청별 access log 끄기
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    port = _free_port()
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    config = {
+        "endpoint_url": f"http://127.0.0.1:{port}",
+        "access_key": "bench",
+        "secret_key": "bench",
+        "region": "us-east-1",
+        "bucket": "warehouse",
+    }
+    boto3.client(
+        "s3",
+        endpoint_url=config["endpoint_url"],
+        aws_access_key_id="bench",
+        aws_secret_access_key="bench",
+        region_name="us-east-1",
+    ).create_bucket(Bucket=config["bucket"])
+    try:
+        yield config
+    finally:
+        server.stop()
+
+
+# ---------------------------------------------------------------------------
+# 측정 (케이스별 별도 프로세스)
+# ---------------------------------------------------------------------------
+
+
+class PeakMemory:
+    """Samples RSS in a background thread; ``peak_mb`` is the growth over the starting RSS.
+
+    Falls back to the growth of the process peak RSS where the current RSS is unavailable.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        from mozart_etl.lib.telemetry import current_rss_mb
+
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb() - self._start)
+
+    def __enter__(self):
+        from mozart_etl.lib.telemetry import current_rss_mb, peak_rss_mb
+
+        self._sampled = current_rss_mb() is not None
+        self._start = current_rss_mb() if self._sampled else peak_rss_mb() or 0.0
+        if self._sampled:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        from mozart_etl.lib.telemetry import current_rss_mb, peak_rss_mb
+
+        if self._sampled:
+            self._stop.set()
+            self._thread.join()
+            self.peak_mb = max(self.peak_mb, current_rss_mb() - self._start)
+        else:
+            self.peak_mb = (peak_rss_mb() or 0.0) - self._start
+        self.peak_mb = round(max(self.peak_mb, 0.0), 1)
+
+
+def measure(spec: dict) -> dict:
+    """Run one case once in this process."""
+    import pyarrow.parquet as pq
+
+    case, table = spec["case"], spec["table"]
+
+    if case == "extract":
+        connector = create_source_connector(spec["source"])
+        connector.test_connection()  # 엔진 생성 / 드라이버 import 는 측정 제외
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            result = connector.extract_table(spec["source"]["schema"], table)
+            seconds = time.perf_counter() - start
+        connector.close()
+        return {
+            "seconds": seconds,
+            "rows": result.num_rows,
+            "columns": result.num_columns,
+            "arrow_bytes": result.nbytes,
+            "peak_memory_mb": memory.peak_mb,
+        }
+
+    if case == "write_parquet":
+        from mozart_etl.lib.storage.minio import S3Resource
+
+        data = pq.read_table(spec["input"])
+        s3 = S3Resource(**spec["s3"])
+        prefix = f"benchmark/{os.getpid()}"
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            s3.write_parquet(data, prefix, table)
+            seconds = time.perf_counter() - start
+        fs = s3.get_filesystem()
+        table_dir = f"{s3.bucket}/{prefix}/{table}"
+        bytes_written = fs.du(table_dir)
+        fs.rm(table_dir, recursive=True)
+        return {
+            "seconds": seconds,
+            "rows": data.num_rows,
+            "columns": data.num_columns,
+            "arrow_bytes": data.nbytes,
+            "bytes_written": bytes_written,
+            "peak_memory_mb": memory.peak_mb,
+        }
+
+    if case == "column_defs":
+        from mozart_etl.code_locations._tenant_factory import _build_column_defs
+
+        schema = pq.read_schema(spec["input"])
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            for _ in range(COLUMN_DEFS_ITERATIONS):
+                _build_column_defs(schema)
+            seconds = time.perf_counter() - start
+        return {
+            "seconds": seconds,
+            "columns": len(schema) * COLUMN_DEFS_ITERATIONS,
+            "peak_memory_mb": memory.peak_mb,
+        }
+
+    raise ValueError(f"Unknown case: {case}")
+
+
+def run_case(spec: dict) -> dict:
+    """Run ``measure`` in a fresh interpreter so imports and peak memory do not carry over."""
+    result = subprocess.run(
+        [sys.executable, __file__, "_measure", json.dumps(spec)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"{spec['case']} {spec['table']} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(case: str, table: str, runs: list[dict]) -> dict:
+    seconds = statistics.median(r["seconds"] for r in runs)
+    last = runs[-1]
+    if case == "column_defs":
+        unit, amount = "columns/s", last["columns"]
+    else:
+        unit, amount = "rows/s", last["rows"]
+    summary = {
+        "case": case,
+        "table": table,
+        "seconds": round(seconds, 4),
+        "throughput": round(amount / seconds, 1) if seconds else 0.0,
+        "unit": unit,
+        "peak_memory_mb": statistics.median(r["peak_memory_mb"] for r in runs),
+    }
+    for key in ("rows", "columns", "arrow_bytes", "bytes_written"):
+        if key in last:
+            summary[key] = last[key]
+    return summary
+
+
+def git_commit() -> str:
+    def _git(*args) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = _git("status", "--porcelain", "--untracked-files=no")
+    return f"{commit}-dirty" if dirty else commit
+
+
+def run(args) -> dict:
+    import pyarrow.parquet as pq
+
+    source = prepare_source(args.source, args.rows, args.width)
+    tables = args.table or list(TABLES)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, s3_target(args.s3) as s3:
+        for table in tables:
+            # write_parquet / column_defs 입력: 측정 외 1회 추출한 로컬 Parquet
+            connector = create_source_connector(source)
+            data_path = str(Path(tmp) / f"{table}.parquet")
+            pq.write_table(connector.extract_table(source["schema"], table), data_path)
+            connector.close()
+
+            for case in args.case or CASES:
+                spec = {
+                    "case": case, "table": table, "source": source, "input": data_path, "s3": s3
+                }
+                runs = [run_case(spec) for _ in range(args.repeat)]
+                results.append(summarize(case, table, runs))
+                print_result(results[-1])
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "rows": args.rows,
+            "width": args.width,
+            "source": args.source,
+            "s3": args.s3,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def print_result(r: dict):
+    written = f"{r['bytes_written'] / (1 << 20):>9.1f}" if "bytes_written" in r else f"{'-':>9}"
+    print(
+        f"{r['case']:<14} {r['table']:<16} {r['seconds']:>9.3f} "
+        f"{r['throughput']:>14,.0f} {r['unit']:<9} {r['peak_memory_mb']:>8.1f} {written}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# 비교
+# ---------------------------------------------------------------------------
+
+
+def load_results(ref: str) -> dict:
+    """``ref`` is a results file path or a commit with a .benchmarks/{commit}.json file."""
+    path = Path(ref)
+    if not path.exists():
+        path = BENCH_DIR / f"{ref}.json"
+    if not path.exists():
+        sys.exit(f"No benchmark results for {ref!r} (run: python scripts/benchmark.py run)")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(base: dict, new: dict, threshold: float) -> list[str]:
+    """Print the per-case change and return the regressions."""
+    if base["params"] != new["params"]:
+        print(f"[bench] Warning: params differ ({base['params']} vs {new['params']})")
+
+    base_results = {(r["case"], r["table"]): r for r in base["results"]}
+    regressions = []
+    print(f"{base['commit']} → {new['commit']} (threshold {threshold:.0%})")
+    print(
+        f"{'case':<14} {'table':<16} {'throughput':>10} {'memory':>10} {'written':>10}  regression"
+    )
+    for r in new["results"]:
+        b = base_results.get((r["case"], r["table"]))
+        if b is None:
+            print(f"{r['case']:<14} {r['table']:<16} {'(new)':>10}")
+            continue
+
+        def _change(key: str) -> float | None:
+            if not b.get(key) or key not in r:
+                return None
+            return r[key] / b[key] - 1
+
+        throughput = _change("throughput")
+        memory = _change("peak_memory_mb")
+        written = _change("bytes_written")
+        flags = []
+        if throughput is not None and throughput < -threshold:
+            flags.append("slower")
+        if (
+            memory is not None
+            and memory > threshold
+            and r["peak_memory_mb"] - b["peak_memory_mb"] > MEMORY_NOISE_MB
+        ):
+            flags.append("more memory")
+        if written is not None and written > threshold:
+            flags.append("larger output")
+
+        def _fmt(change: float | None) -> str:
+            return f"{change:+.1%}" if change is not None else "-"
+
+        print(
+            f"{r['case']:<14} {r['table']:<16} {_fmt(throughput):>10} {_fmt(memory):>10} "
+            f"{_fmt(written):>10}  {', '.join(flags) or '-'}"
+        )
+        regressions.extend(f"{r['case']} {r['table']}: {flag}" for flag in flags)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline extract/load benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Generate data, measure and save results")
+    run_parser.add_argument("--rows", type=int, default=100_000, help="Rows per table")
+    run_parser.add_argument("--width", type=int, default=0, help="Extra VARCHAR columns per table")
+    run_parser.add_argument("--source", choices=("sqlite", "postgres"), default="sqlite")
+    run_parser.add_argument("--s3", choices=("moto", "endpoint"), default="moto")
+    run_parser.add_argument("--table", action="append", choices=list(TABLES))
+    run_parser.add_argument("--case", action="append", choices=CASES)
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs per case (median)")
+    run_parser.add_argument(
+        "--json", type=Path, help="Results file (default .benchmarks/{commit}.json)"
+    )
+
+    compare_parser = sub.add_parser("compare", help="Flag regressions between two results")
+    compare_parser.add_argument("base", help="Baseline results file or commit")
+    compare_parser.add_argument("new", help="New results file or commit")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.15, help="Allowed relative change (default 0.15)"
+    )
+
+    measure_parser = sub.add_parser("_measure", help=argparse.SUPPRESS)
+    measure_parser.add_argument("spec")
+
+    args = parser.parse_args()
+
+    if args.command == "_measure":
+        print(json.dumps(measure(json.loads(args.spec))))
+        return
+
+    if args.command == "run":
+        print(
+            f"{'case':<14} {'table':<16} {'seconds':>9} {'throughput':>14} {'':<9} "
+            f"{'mem (MB)':>8} {'out (MB)':>9}"
+        )
+        results = run(args)
+        path = args.json or BENCH_DIR / f"{results['commit']}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"[bench] Saved {path}")
+        return
+
+    regressions = compare(load_results(args.base), load_results(args.new), args.threshold)
+    if regressions:
+        print(f"Regressions: {'; '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
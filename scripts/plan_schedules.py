@@ -0,0 +1,87 @@
+"""테넌트 스케줄 플래너: cron 이 같은 테넌트의 시작 분을 분산해 config/schedule_plan.yaml 생성.
+
+- 테넌트별 실행 시간: --instance 이면 DAGSTER_HOME 인스턴스의 과거 materialization 기준 (tick별 중앙값),
+  없으면 기존 plan 의 값, 그것도 없으면 tenant.yaml schedule_plan.duration
+- 같은 cron(분 제외) 테넌트끼리 Trino 클러스터 / 소스 호스트 풀의 동시 실행 수가 최소가 되도록 배치
+- schedule_plan.sla (예: ":45") 가 있으면 그 시각까지 끝나는 시작 분만 사용
+- 동률이면 tenant id hash 기반 offset 우선 (plan 이 없을 때 code location 의 fallback 과 동일)
+
+Usage:
+    python scripts/plan_schedules.py               # plan 생성 + 표 출력
+    python scripts/plan_schedules.py --instance    # 과거 실행 시간 반영 (DAGSTER_HOME 필요)
+    python scripts/plan_schedules.py --check       # CI: plan 갱신 필요 시 exit 1
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mozart_etl.code_locations._shared import load_tenant_config  # noqa: E402
+from mozart_etl.lib.schedule import (  # noqa: E402
+    SCHEDULE_PLAN_PATH,
+    dump_schedule_plan,
+    historical_duration_minutes,
+    load_schedule_plan,
+    plan_schedules,
+    resolve_tenant_cron,
+    schedule_request,
+    schedule_table,
+)
+
+CODE_LOCATIONS_DIR = PROJECT_ROOT / "mozart_etl" / "code_locations"
+
+
+def load_tenants() -> list[dict]:
+    return [
+        load_tenant_config(path)[0]
+        for path in sorted(CODE_LOCATIONS_DIR.glob("*/tenant.yaml"))
+        if not path.parent.name.startswith(("_", "."))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan staggered tenant schedules")
+    parser.add_argument(
+        "--instance", action="store_true", help="Use run history of the DAGSTER_HOME instance"
+    )
+    parser.add_argument("--check", action="store_true", help="CI: exit 1 if the plan is stale")
+    args = parser.parse_args()
+
+    instance = None
+    if args.instance:
+        import dagster as dg
+
+        instance = dg.DagsterInstance.get()
+
+    previous = load_schedule_plan(SCHEDULE_PLAN_PATH)
+    requests = []
+    for tenant in load_tenants():
+        duration = None
+        if instance is not None:
+            duration = historical_duration_minutes(
+                instance, tenant["id"], resolve_tenant_cron(tenant)
+            )
+        if duration is None and tenant["id"] in previous:
+            duration = previous[tenant["id"]]["duration_minutes"]
+        requests.append(schedule_request(tenant, duration))
+
+    planned = plan_schedules(requests)
+    print(schedule_table(planned))
+
+    content = dump_schedule_plan(planned)
+    current = SCHEDULE_PLAN_PATH.read_text(encoding="utf-8") if SCHEDULE_PLAN_PATH.exists() else ""
+    if content == current:
+        print(f"\n{SCHEDULE_PLAN_PATH.name} up to date ({len(planned)} tenants)")
+        return
+    if args.check:
+        print(f"\n{SCHEDULE_PLAN_PATH.name} is out of date, run `make plan-schedules`")
+        sys.exit(1)
+    SCHEDULE_PLAN_PATH.write_text(content, encoding="utf-8")
+    print(f"\n→ {SCHEDULE_PLAN_PATH.relative_to(PROJECT_ROOT)} ({len(planned)} tenants)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Trino slow-query log 요약: 테넌트 / 테이블(asset) / 단계별로 클러스터 시간을 많이 쓰는 쿼리 집계.
+
+TrinoResource 는 elapsed 가 TRINO_SLOW_QUERY_SECONDS (기본 60초) 이상인 쿼리를
+TRINO_SLOW_QUERY_LOG (기본 $DAGSTER_HOME/mozart_trino_slow_queries.jsonl, 크기 기준 rotate) 에
+JSON 한 줄씩 기록합니다. rotate 된 파일(.1, .2, ...)도 함께 읽습니다.
+
+Usage:
+    python scripts/slow_queries.py                    # asset 별 (tenant.table)
+    python scripts/slow_queries.py --by tenant
+    python scripts/slow_queries.py --by stage --top 5
+    python scripts/slow_queries.py --log /path/to/slow_queries.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mozart_etl.lib.trino import SLOW_QUERY_LOG_BACKUPS, TrinoResource  # noqa: E402
+
+
+def read_entries(path: Path) -> list[dict]:
+    entries = []
+    for candidate in [path, *(Path(f"{path}.{i}") for i in range(1, SLOW_QUERY_LOG_BACKUPS + 1))]:
+        if not candidate.exists():
+            continue
+        for line in candidate.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                entries.append(json.loads(line))
+    return entries
+
+
+def summarize(entries: list[dict], by: str) -> list[dict]:
+    groups: dict[str, dict] = defaultdict(
+        lambda: {
+            "queries": 0, "elapsed_ms": 0, "cpu_ms": 0, "peak_memory_bytes": 0, "slowest": None
+        }
+    )
+    for entry in entries:
+        group = groups[entry.get(by) or "-"]
+        group["queries"] += 1
+        group["elapsed_ms"] += entry["elapsed_ms"]
+        group["cpu_ms"] += entry["cpu_ms"]
+        group["peak_memory_bytes"] = max(group["peak_memory_bytes"], entry["peak_memory_bytes"])
+        if group["slowest"] is None or entry["elapsed_ms"] > group["slowest"]["elapsed_ms"]:
+            group["slowest"] = entry
+    return sorted(
+        ({"key": key, **group} for key, group in groups.items()),
+        key=lambda g: g["elapsed_ms"],
+        reverse=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the Trino slow-query log")
+    parser.add_argument("--log", type=Path, help="Slow-query log (default: TRINO_SLOW_QUERY_LOG)")
+    parser.add_argument("--by", choices=("asset", "tenant", "stage"), default="asset")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    path = args.log or Path(
+        TrinoResource(slow_query_log=os.getenv("TRINO_SLOW_QUERY_LOG", "")).slow_query_log_path()
+    )
+    entries = read_entries(path)
+    if not entries:
+        print(f"No slow queries logged in {path}")
+        return
+
+    groups = summarize(entries, args.by)
+    total_ms = sum(g["elapsed_ms"] for g in groups) or 1
+    print(
+        f"{args.by:<40} {'queries':>7} {'elapsed (s)':>11} {'share':>6} {'cpu (s)':>9} "
+        f"{'peak mem (MB)':>13}  slowest"
+    )
+    for g in groups[: args.top]:
+        slowest = g["slowest"]
+        print(
+            f"{g['key']:<40} {g['queries']:>7} {g['elapsed_ms'] / 1000:>11.1f} "
+            f"{g['elapsed_ms'] / total_ms:>6.0%} {g['cpu_ms'] / 1000:>9.1f} "
+            f"{g['peak_memory_bytes'] / (1 << 20):>13.1f}  "
+            f"{slowest['query_id']} {slowest['stage']} ({slowest['elapsed_ms'] / 1000:.1f}s)"
+        )
+    print(f"{len(entries)} slow queries, {total_ms / 1000:.1f}s elapsed in total ({path})")
+
+
+if __name__ == "__main__":
+    main()
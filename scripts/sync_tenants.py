@@ -2,22 +2,52 @@
   1. workspace.yaml          — Dagster code location 등록
   2. __init__.py per tenant   — 보일러플레이트
   3. dbt_project.yml          — model-paths에 테넌트 모델 경로 추가
+  4. target/registry/{tid}.json — 컴파일된 테넌트 registry (--registry, dbt parse 후)
+     tenant.yaml + dbt select + 해당 테넌트 manifest slice. code location 로딩 시 사용,
+     tenant.yaml / manifest.json 내용 hash가 다르면 원본 파일로 fallback.
+  5. tenants/{tid}/dbt_project.yml — 테넌트별 dbt 프로젝트 (DBT_PROJECT_MODE=per_tenant)
+     테넌트마다 target/ (manifest.json, partial_parse.msgpack) 분리. --parse 는 모델/매크로가
+     바뀐 테넌트만 dbt parse 실행.
+  6. code_locations/multi_tenant.py — 전체 테넌트 단일 code location (CODE_LOCATION_MODE=consolidated)
+     workspace.yaml 에 이 모듈 하나만 등록. 대상 테넌트는 config/tenants.yaml (tenants: [...])
+     이 있으면 그 목록, 없으면 발견된 전체 테넌트.
 
 Usage:
-    python scripts/sync_tenants.py          # 동기화
-    python scripts/sync_tenants.py --check  # CI: 동기화 필요 시 exit 1
+    python scripts/sync_tenants.py             # 동기화
+    python scripts/sync_tenants.py --check     # CI: 동기화 필요 시 exit 1
+    python scripts/sync_tenants.py --registry  # dbt parse 후 registry 컴파일
+    DBT_PROJECT_MODE=per_tenant python scripts/sync_tenants.py --parse --registry
+    CODE_LOCATION_MODE=consolidated python scripts/sync_tenants.py
 """
 
 import argparse
+import json
+import shutil
+import subprocess
 import sys
 from pathlib import Path
 
 import yaml
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mozart_etl.code_locations._registry import compile_tenant_registry  # noqa: E402
+from mozart_etl.code_locations._shared import load_tenant_config, tenant_dbt_vars  # noqa: E402
+from mozart_etl.utils.environment_helpers import (  # noqa: E402
+    get_code_location_mode,
+    get_dbt_project_mode,
+)
+
 CODE_LOCATIONS_DIR = PROJECT_ROOT / "mozart_etl" / "code_locations"
 WORKSPACE_PATH = PROJECT_ROOT / "workspace.yaml"
-DBT_PROJECT_PATH = PROJECT_ROOT / "mozart_etl_dbt_transform" / "dbt_project.yml"
+DBT_TRANSFORM_DIR = PROJECT_ROOT / "mozart_etl_dbt_transform"
+DBT_PROJECT_PATH = DBT_TRANSFORM_DIR / "dbt_project.yml"
+MANIFEST_PATH = DBT_TRANSFORM_DIR / "target" / "manifest.json"
+TENANT_DBT_PROJECTS_DIR = DBT_TRANSFORM_DIR / "tenants"
+CONSOLIDATED_MODULE = "multi_tenant"
+CONSOLIDATED_PATH = CODE_LOCATIONS_DIR / f"{CONSOLIDATED_MODULE}.py"
+TENANTS_CONFIG_PATH = PROJECT_ROOT / "config" / "tenants.yaml"
 
 INIT_TEMPLATE = '''"""Code location for {tenant_id} — auto-generated by sync_tenants."""
 
@@ -28,6 +58,21 @@ from mozart_etl.code_locations._tenant_factory import create_tenant_defs
 defs = create_tenant_defs(Path(__file__).parent / "tenant.yaml")
 '''
 
+CONSOLIDATED_TEMPLATE = '''"""Consolidated code location for all tenants — auto-generated by sync_tenants."""
+
+from pathlib import Path
+
+from mozart_etl.code_locations._tenant_factory import create_multi_tenant_defs
+
+TENANT_IDS = [
+{tenant_lines}
+]
+
+defs = create_multi_tenant_defs(
+    [Path(__file__).parent / tid / "tenant.yaml" for tid in TENANT_IDS]
+)
+'''
+
 
 def discover_tenants() -> list[str]:
     """Return sorted list of tenant IDs (directories with tenant.yaml)."""
@@ -49,13 +94,30 @@ def _write_if_changed(path: Path, content: str) -> bool:
     return True
 
 
-def sync_workspace(tenant_ids: list[str]) -> list[str]:
+def consolidated_tenants(tenant_ids: list[str]) -> list[str]:
+    """Tenants of the consolidated location: config/tenants.yaml if present, else all."""
+    if not TENANTS_CONFIG_PATH.exists():
+        return tenant_ids
+    listed = yaml.safe_load(TENANTS_CONFIG_PATH.read_text(encoding="utf-8")).get("tenants") or []
+    unknown = sorted(set(listed) - set(tenant_ids))
+    if unknown:
+        print(f"WARNING: {TENANTS_CONFIG_PATH.name} lists unknown tenants: {', '.join(unknown)}")
+    return [tid for tid in tenant_ids if tid in listed]
+
+
+def sync_workspace(tenant_ids: list[str], location_mode: str = "per_tenant") -> list[str]:
     """Generate workspace.yaml."""
     changes = []
     lines = [
         "# AUTO-GENERATED by scripts/sync_tenants.py - DO NOT EDIT",
         "load_from:",
     ]
+    if location_mode == "consolidated":
+        lines.append("  - python_module:")
+        lines.append(f"      module_name: mozart_etl.code_locations.{CONSOLIDATED_MODULE}")
+        lines.append(f"      location_name: {CONSOLIDATED_MODULE}")
+        lines.append("")
+        tenant_ids = []
     for tid in tenant_ids:
         lines.append(f"  - python_module:")
         lines.append(f"      module_name: mozart_etl.code_locations.{tid}")
@@ -63,10 +125,19 @@ def sync_workspace(tenant_ids: list[str]) -> list[str]:
         lines.append("")
 
     if _write_if_changed(WORKSPACE_PATH, "\n".join(lines) + "\n"):
-        changes.append(f"workspace.yaml ({len(tenant_ids)} tenants)")
+        changes.append(f"workspace.yaml ({location_mode})")
     return changes
 
 
+def sync_consolidated_module(tenant_ids: list[str]) -> list[str]:
+    """Generate code_locations/multi_tenant.py listing the consolidated tenants."""
+    tenant_lines = "\n".join(f'    "{tid}",' for tid in tenant_ids)
+    content = CONSOLIDATED_TEMPLATE.format(tenant_lines=tenant_lines)
+    if _write_if_changed(CONSOLIDATED_PATH, content):
+        return [f"code_locations/{CONSOLIDATED_PATH.name} ({len(tenant_ids)} tenants)"]
+    return []
+
+
 def sync_init_py(tenant_ids: list[str]) -> list[str]:
     """Generate __init__.py for each tenant."""
     changes = []
@@ -116,7 +187,112 @@ def sync_dbt_project(tenant_ids: list[str]) -> list[str]:
     return changes
 
 
-def sync(dry_run: bool = False) -> list[str]:
+def _tenant_dbt_config(tid: str) -> dict:
+    """dbt_project.yml of a tenant's own project (paths relative to tenants/{tid})."""
+    return {
+        "name": "mozart_etl_transform",
+        "version": "1.0.0",
+        "config-version": 2,
+        "profile": "mozart_etl",
+        "model-paths": [f"../../../mozart_etl/code_locations/{tid}/models"],
+        "macro-paths": ["../../macros"],
+        "target-path": "target",
+        "clean-targets": ["target", "dbt_packages"],
+        "models": {
+            "mozart_etl_transform": {
+                "staging": {"+materialized": "table"},
+                "mart": {"+materialized": "table"},
+            }
+        },
+    }
+
+
+def sync_tenant_dbt_projects(tenant_ids: list[str]) -> list[str]:
+    """Generate tenants/{tid}/dbt_project.yml for each tenant with models."""
+    changes = []
+    header = "# AUTO-GENERATED by scripts/sync_tenants.py - DO NOT EDIT\n"
+    for tid in tenant_ids:
+        if not (CODE_LOCATIONS_DIR / tid / "models").exists():
+            continue
+        project_dir = TENANT_DBT_PROJECTS_DIR / tid
+        project_dir.mkdir(parents=True, exist_ok=True)
+        content = header + yaml.dump(
+            _tenant_dbt_config(tid), default_flow_style=False, allow_unicode=True, sort_keys=False,
+        )
+        if _write_if_changed(project_dir / "dbt_project.yml", content):
+            changes.append(f"tenants/{tid}/dbt_project.yml")
+    return changes
+
+
+def _tenant_manifest_path(tid: str, dbt_mode: str) -> Path:
+    if dbt_mode == "per_tenant":
+        return TENANT_DBT_PROJECTS_DIR / tid / "target" / "manifest.json"
+    return MANIFEST_PATH
+
+
+def _latest_mtime(paths: list[Path]) -> float:
+    mtimes = [
+        f.stat().st_mtime
+        for path in paths
+        for f in ([path] if path.is_file() else path.rglob("*"))
+        if f.is_file()
+    ]
+    return max(mtimes, default=0.0)
+
+
+def parse_tenant_dbt_projects(tenant_ids: list[str]) -> list[str]:
+    """Run dbt parse for tenants whose models, macros or project changed since their last parse.
+
+    Each tenant keeps its own partial_parse.msgpack, so a re-parse only
+    covers that tenant's files. It is parsed with the same ``--vars`` its dbt
+    asset builds with, so the builds can reuse that state.
+    """
+    dbt = shutil.which("dbt") or "dbt"
+    parsed = []
+    for tid in tenant_ids:
+        project_dir = TENANT_DBT_PROJECTS_DIR / tid
+        if not (project_dir / "dbt_project.yml").exists():
+            continue
+        manifest = _tenant_manifest_path(tid, "per_tenant")
+        inputs = [
+            CODE_LOCATIONS_DIR / tid / "models",
+            CODE_LOCATIONS_DIR / tid / "tenant.yaml",
+            DBT_TRANSFORM_DIR / "macros",
+            DBT_TRANSFORM_DIR / "profiles.yml",
+            project_dir / "dbt_project.yml",
+        ]
+        if manifest.exists() and manifest.stat().st_mtime >= _latest_mtime(inputs):
+            continue
+        dbt_vars = tenant_dbt_vars(*load_tenant_config(CODE_LOCATIONS_DIR / tid / "tenant.yaml"))
+        subprocess.run(
+            [
+                dbt, "parse",
+                "--project-dir", str(project_dir),
+                "--profiles-dir", str(DBT_TRANSFORM_DIR),
+                "--vars", json.dumps(dbt_vars),
+            ],
+            check=True,
+        )
+        parsed.append(f"tenants/{tid} (dbt parse)")
+    return parsed
+
+
+def sync_registry(tenant_ids: list[str], dbt_mode: str) -> list[str]:
+    """Compile target/registry/{tid}.json for each tenant (requires a parsed manifest)."""
+    changes = []
+    for tid in tenant_ids:
+        manifest_path = _tenant_manifest_path(tid, dbt_mode)
+        if not manifest_path.exists():
+            print(f"WARNING: {manifest_path} not found, run dbt parse first")
+            continue
+        path = compile_tenant_registry(CODE_LOCATIONS_DIR / tid / "tenant.yaml", manifest_path)
+        changes.append(f"{path.relative_to(PROJECT_ROOT)} ({path.stat().st_size} bytes)")
+    return changes
+
+
+def sync(
+    dry_run: bool = False, dbt_mode: str = "shared", location_mode: str = "per_tenant"
+) -> list[str]:
     tenant_ids = discover_tenants()
     if not tenant_ids:
         print("WARNING: No tenants found under code_locations/")
@@ -129,22 +305,64 @@ def sync(dry_run: bool = False) -> list[str]:
         return all_changes
 
     all_changes = []
-    all_changes.extend(sync_workspace(tenant_ids))
+    all_changes.extend(sync_workspace(tenant_ids, location_mode))
     all_changes.extend(sync_init_py(tenant_ids))
+    if location_mode == "consolidated":
+        if dbt_mode != "shared":
+            raise SystemExit("CODE_LOCATION_MODE=consolidated requires DBT_PROJECT_MODE=shared")
+        all_changes.extend(sync_consolidated_module(consolidated_tenants(tenant_ids)))
     all_changes.extend(sync_dbt_project(tenant_ids))
+    if dbt_mode == "per_tenant":
+        all_changes.extend(sync_tenant_dbt_projects(tenant_ids))
     return all_changes
 
 
 def main():
     parser = argparse.ArgumentParser(description="Sync tenant code locations")
     parser.add_argument("--check", action="store_true", help="CI: exit 1 if sync needed")
+    parser.add_argument(
+        "--registry", action="store_true", help="Compile tenant registries (after dbt parse)"
+    )
+    parser.add_argument(
+        "--parse", action="store_true", help="per_tenant mode: dbt parse changed tenants"
+    )
+    parser.add_argument(
+        "--dbt-mode",
+        choices=["shared", "per_tenant"],
+        default=None,
+        help="dbt project layout (default: DBT_PROJECT_MODE env, shared)",
+    )
+    parser.add_argument(
+        "--location-mode",
+        choices=["per_tenant", "consolidated"],
+        default=None,
+        help="Code locations in workspace.yaml (default: CODE_LOCATION_MODE env, per_tenant)",
+    )
     args = parser.parse_args()
 
     tenant_ids = discover_tenants()
+    dbt_mode = args.dbt_mode or get_dbt_project_mode()
+    location_mode = args.location_mode or get_code_location_mode()
+
+    if args.parse or args.registry:
+        changes = []
+        if args.parse:
+            if dbt_mode != "per_tenant":
+                parser.error(
+                    "--parse requires DBT_PROJECT_MODE=per_tenant (or --dbt-mode per_tenant)"
+                )
+            changes.extend(sync_tenant_dbt_projects(tenant_ids))
+            changes.extend(parse_tenant_dbt_projects(tenant_ids))
+        if args.registry:
+            changes.extend(sync_registry(tenant_ids, dbt_mode))
+        print(f"{len(tenant_ids)} tenants ({dbt_mode}):")
+        for c in changes:
+            print(f"  → {c}")
+        return
 
     if args.check:
         # Simple check: run sync and see if files changed
-        changes = sync()
+        changes = sync(dbt_mode=dbt_mode, location_mode=location_mode)
         if changes:
             print("Sync applied changes (workspace was out of date):")
             for c in changes:
@@ -153,7 +371,7 @@ def main():
         print(f"All in sync ({len(tenant_ids)} tenants)")
         sys.exit(0)
 
-    changes = sync()
+    changes = sync(dbt_mode=dbt_mode, location_mode=location_mode)
     if changes:
         print(f"Synced {len(tenant_ids)} tenants:")
         for c in changes: